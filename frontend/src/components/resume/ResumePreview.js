@@ -4,6 +4,16 @@ import Button from "../ui/Button";
 import { resumeAPI } from "../../services/api";
 import toast from "react-hot-toast";
 
+// Message shown once each server-side render stage has completed
+const STAGE_LABELS = {
+  queued: "Loading resume sections...",
+  querying: "Building layout...",
+  template_rendered: "Laying out pages...",
+  layout: "Writing PDF...",
+  written: "Finishing up...",
+  cached: "Downloading...",
+};
+
 const ResumePreview = ({ resume, showHeader = false }) => {
   const handleDownloadPDF = async () => {
     if (!resume?.id) {
@@ -11,7 +21,19 @@ const ResumePreview = ({ resume, showHeader = false }) => {
       return;
     }
 
+    const toastId = toast.loading("Preparing PDF...");
+
     try {
+      // Follow the render instead of waiting blind; the download below is then
+      // served from the server's cache rather than rendered a second time.
+      try {
+        await resumeAPI.streamRenderProgress(resume.id, (stage) => {
+          toast.loading(STAGE_LABELS[stage.stage] || "Rendering...", { id: toastId });
+        });
+      } catch (progressError) {
+        // e.g. an expired token: the axios download below refreshes it and renders
+        console.warn('Render progress unavailable:', progressError);
+      }
       const response = await resumeAPI.downloadPDF(resume.id);
       
       // Create blob URL and trigger download
@@ -31,10 +53,37 @@ const ResumePreview = ({ resume, showHeader = false }) => {
       link.remove();
       window.URL.revokeObjectURL(url);
       
-      toast.success("PDF downloaded successfully!");
+      toast.success("PDF downloaded successfully!", { id: toastId });
     } catch (error) {
       console.error('Error downloading PDF:', error);
-      toast.error("Failed to download PDF. Please try again.");
+      toast.error("Failed to download PDF. Please try again.", { id: toastId });
+    }
+  };
+  const handleDownloadDOCX = async () => {
+    if (!resume?.id) {
+      toast.error("Resume not found");
+      return;
+    }
+
+    try {
+      const response = await resumeAPI.downloadDOCX(resume.id);
+      const blob = new Blob([response.data], {
+        type: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+      });
+      const url = window.URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.href = url;
+      const filename = resume.title
+        ? `resume_${resume.title.replace(/\s+/g, '_')}_${resume.id}.docx`
+        : `resume_${resume.id}.docx`;
+      link.setAttribute('download', filename);
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error('Error downloading DOCX:', error);
+      toast.error("Failed to download Word file. Please try again.");
     }
   };
   // Memoize the preview content to ensure it updates when resume data changes
@@ -53,15 +102,26 @@ const ResumePreview = ({ resume, showHeader = false }) => {
         {showHeader && (
           <div className="flex justify-between items-center p-4 bg-gray-50 border-b border-gray-200">
             <h3 className="text-lg font-semibold text-gray-900">Resume Preview</h3>
-            <Button
-              variant="primary"
-              size="sm"
-              onClick={handleDownloadPDF}
-              className="flex items-center gap-2"
-            >
-              <ArrowDownTrayIcon className="h-4 w-4" />
-              Download PDF
-            </Button>
+            <div className="flex gap-2">
+              <Button
+                variant="secondary"
+                size="sm"
+                onClick={handleDownloadDOCX}
+                className="flex items-center gap-2"
+              >
+                <ArrowDownTrayIcon className="h-4 w-4" />
+                Word
+              </Button>
+              <Button
+                variant="primary"
+                size="sm"
+                onClick={handleDownloadPDF}
+                className="flex items-center gap-2"
+              >
+                <ArrowDownTrayIcon className="h-4 w-4" />
+                Download PDF
+              </Button>
+            </div>
           </div>
         )}
         
@@ -186,9 +246,9 @@ const ResumePreview = ({ resume, showHeader = false }) => {
                 {exp.description && (
                   <div style={{ fontSize: "9pt", marginTop: "2px", lineHeight: "1.2" }}>
                     <ul style={{ margin: 0, paddingLeft: "12px" }}>
-                      {exp.description.split('\n').map((line, lineIndex) => (
+                      {(exp.description_bullets || []).map((line, lineIndex) => (
                         <li key={lineIndex} style={{ marginBottom: "1px" }}>
-                          {line.trim().startsWith('•') ? line.substring(1).trim() : line}
+                          {line}
                         </li>
                       ))}
                     </ul>
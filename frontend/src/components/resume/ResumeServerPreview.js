@@ -0,0 +1,61 @@
+import React, { useEffect, useState } from "react";
+import { resumeAPI } from "../../services/api";
+import LoadingSpinner from "../ui/LoadingSpinner";
+
+// Renders the server's print layout (the same HTML the PDF is built from)
+// in a sandboxed iframe, with the resume's theme stylesheet inlined.
+const ResumeServerPreview = ({ resume }) => {
+  const [srcDoc, setSrcDoc] = useState(null);
+  const [error, setError] = useState(false);
+
+  useEffect(() => {
+    if (!resume?.id) return undefined;
+    let cancelled = false;
+
+    Promise.all([
+      resumeAPI.getPreviewHTML(resume.id),
+      resumeAPI.getThemeStylesheet(resume.theme || "classic"),
+    ])
+      .then(([html, css]) => {
+        if (cancelled) return;
+        // The stylesheet <link> only resolves for WeasyPrint; inline the theme instead
+        setSrcDoc(html.replace("</head>", `<style>${css}</style></head>`));
+        setError(false);
+      })
+      .catch((previewError) => {
+        console.error("Error loading preview:", previewError);
+        if (!cancelled) setError(true);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [resume?.id, resume?.theme, resume?.updated_at]);
+
+  if (error) {
+    return (
+      <div className="text-center py-8 text-gray-500">
+        Print preview is unavailable right now
+      </div>
+    );
+  }
+
+  if (srcDoc === null) {
+    return (
+      <div className="flex justify-center items-center py-16">
+        <LoadingSpinner size="lg" />
+      </div>
+    );
+  }
+
+  return (
+    <iframe
+      title="Resume print preview"
+      sandbox=""
+      srcDoc={srcDoc}
+      className="w-full h-full border-0 bg-white"
+    />
+  );
+};
+
+export default ResumeServerPreview;
@@ -0,0 +1,64 @@
+import { useCallback, useEffect, useRef } from 'react';
+import { deltaAPI } from '../services/api';
+
+const SEND_DELAY = 500; // ms after the last edit before the queued fields are sent
+const IDLE_FLUSH = 2500; // ms without edits before the server is asked to write its buffer
+const RETRY_DELAY = 1000; // ms before resending when the server answers 503 (busy)
+
+// Autosave for one object: queue({ field: value }) as the user types. Deltas go to the
+// server's autosave endpoint, which writes a burst of them as one save; once the user
+// pauses it is told to flush. onSaved receives the object each time it is written.
+export const useAutosave = (endpoint, id, onSaved) => {
+  const queued = useRef({});
+  const sendTimer = useRef(null);
+  const flushTimer = useRef(null);
+  const onSavedRef = useRef(onSaved);
+  onSavedRef.current = onSaved;
+
+  const send = useCallback(async (flush) => {
+    const changes = queued.current;
+    queued.current = {};
+    if (!id || (!flush && Object.keys(changes).length === 0)) return;
+    try {
+      const result = await deltaAPI.autosave(endpoint, id, changes, { flush });
+      if (result.saved && onSavedRef.current) onSavedRef.current(result.data);
+    } catch (err) {
+      // Put the fields back so the next send retries them
+      queued.current = { ...changes, ...queued.current };
+      if (err.response?.status === 503) {
+        // Another save held the server's buffers; try again shortly
+        clearTimeout(sendTimer.current);
+        sendTimer.current = setTimeout(() => send(flush), RETRY_DELAY);
+        return;
+      }
+      console.error('Autosave failed:', err);
+    }
+  }, [endpoint, id]);
+
+  const cancel = useCallback(() => {
+    clearTimeout(sendTimer.current);
+    clearTimeout(flushTimer.current);
+    queued.current = {};
+  }, []);
+
+  const queue = useCallback((changes) => {
+    Object.assign(queued.current, changes);
+    clearTimeout(sendTimer.current);
+    clearTimeout(flushTimer.current);
+    sendTimer.current = setTimeout(() => send(false), SEND_DELAY);
+    flushTimer.current = setTimeout(() => send(true), IDLE_FLUSH);
+  }, [send]);
+
+  const flush = useCallback(() => {
+    clearTimeout(sendTimer.current);
+    clearTimeout(flushTimer.current);
+    return send(true);
+  }, [send]);
+
+  // Write whatever is pending when the editor closes
+  useEffect(() => () => {
+    if (sendTimer.current || flushTimer.current) flush();
+  }, [flush]);
+
+  return { queue, flush, cancel };
+};
@@ -6,15 +6,36 @@ import {
   skillsAPI, 
   projectsAPI, 
   certificationsAPI, 
-  achievementsAPI 
+  achievementsAPI,
+  deltaAPI
 } from '../services/api';
+import { useAutosave } from './useAutosave';
 import toast from 'react-hot-toast';
 
+const HEADER_FIELDS = [
+  'title', 'name', 'email', 'phone', 'location', 'summary',
+  'linkedin_url', 'github_url', 'website_url'
+];
+
+// The fields of current that differ from original
+const changedFields = (original = {}, current) => Object.fromEntries(
+  Object.entries(current).filter(([key, value]) => JSON.stringify(value) !== JSON.stringify(original[key]))
+);
+
+// PATCH only what changed since the item was loaded; unchanged items aren't sent at all
+const saveChangedFields = (endpoint, original, item) => {
+  const changes = changedFields(original, item);
+  return Object.keys(changes).length ? deltaAPI.patch(endpoint, item.id, changes) : item;
+};
+
 export const useResume = (resumeId) => {
   const [resume, setResume] = useState(null);
   const [originalResume, setOriginalResume] = useState(null); // Track original state for deletions
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const headerAutosave = useAutosave('resumes', resumeId, (saved) => {
+    setOriginalResume(prev => ({ ...prev, ...saved }));
+  });
 
   const fetchResume = async () => {
     if (!resumeId) return;
@@ -67,17 +88,13 @@ export const useResume = (resumeId) => {
   // Save basic resume header/metadata
   const saveResumeHeader = async (headerData) => {
     try {
-      const updatedResume = await resumeAPI.updateResume(resumeId, {
-        title: headerData.title,
-        name: headerData.name,
-        email: headerData.email,
-        phone: headerData.phone,
-        location: headerData.location,
-        summary: headerData.summary,
-        linkedin_url: headerData.linkedin_url,
-        github_url: headerData.github_url,
-        website_url: headerData.website_url
-      });
+      // Send only the fields that differ from the last save; flushing also writes
+      // any edits the server is still holding from autosave, all in one save
+      const header = Object.fromEntries(HEADER_FIELDS.map(field => [field, headerData[field]]));
+      headerAutosave.cancel();
+      const { data: updatedResume } = await deltaAPI.autosave(
+        'resumes', resumeId, changedFields(originalResume, header), { flush: true }
+      );
       
       // Update local state with the saved data
       setResume(prev => ({ ...prev, ...updatedResume }));
@@ -111,7 +128,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return educationAPI.updateEducation(item.id, itemData);
+          return saveChangedFields('education', originalEducation.find(origItem => origItem.id === item.id), item);
         } else {
           return educationAPI.createEducation(itemData);
         }
@@ -151,7 +168,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return experienceAPI.updateExperience(item.id, itemData);
+          return saveChangedFields('experience', originalExperience.find(origItem => origItem.id === item.id), item);
         } else {
           return experienceAPI.createExperience(itemData);
         }
@@ -191,7 +208,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return skillsAPI.updateSkill(item.id, itemData);
+          return saveChangedFields('skills', originalSkills.find(origItem => origItem.id === item.id), item);
         } else {
           return skillsAPI.createSkill(itemData);
         }
@@ -231,7 +248,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return projectsAPI.updateProject(item.id, itemData);
+          return saveChangedFields('projects', originalProjects.find(origItem => origItem.id === item.id), item);
         } else {
           return projectsAPI.createProject(itemData);
         }
@@ -271,7 +288,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return certificationsAPI.updateCertification(item.id, itemData);
+          return saveChangedFields('certifications', originalCertifications.find(origItem => origItem.id === item.id), item);
         } else {
           return certificationsAPI.createCertification(itemData);
         }
@@ -311,7 +328,7 @@ export const useResume = (resumeId) => {
         const itemData = { ...item, resume: resumeId };
         
         if (item.id) {
-          return achievementsAPI.updateAchievement(item.id, itemData);
+          return saveChangedFields('achievements', originalAchievements.find(origItem => origItem.id === item.id), item);
         } else {
           return achievementsAPI.createAchievement(itemData);
         }
@@ -333,6 +350,10 @@ export const useResume = (resumeId) => {
 
   const updateResumeData = (newData) => {
     setResume(prev => ({ ...prev, ...newData }));
+    const headerChanges = Object.fromEntries(
+      Object.entries(newData).filter(([field]) => HEADER_FIELDS.includes(field))
+    );
+    if (Object.keys(headerChanges).length) headerAutosave.queue(headerChanges);
   };
 
   const resetChanges = () => {
@@ -1,14 +1,16 @@
-import React from "react";
+import React, { useState } from "react";
 import { useParams, Link } from "react-router-dom";
 import { useResume } from "../hooks/useResume";
 import Layout from "../components/layout/Layout";
 import LoadingSpinner from "../components/ui/LoadingSpinner";
 import ResumePreview from "../components/resume/ResumePreview";
+import ResumeServerPreview from "../components/resume/ResumeServerPreview";
 import { ArrowLeftIcon } from "@heroicons/react/24/outline";
 
 const ResumePreviewPage = () => {
   const { id } = useParams();
   const { resume, loading } = useResume(id);
+  const [printLayout, setPrintLayout] = useState(true);
 
   if (loading) {
     return (
@@ -58,7 +60,13 @@ const ResumePreviewPage = () => {
             <h1 className="text-2xl font-bold text-gray-900">
               {resume.title || "Resume Preview"}
             </h1>
-            <div className="w-24"></div> {/* Spacer for center alignment */}
+            <button
+              type="button"
+              onClick={() => setPrintLayout(!printLayout)}
+              className="w-24 text-sm text-gray-500 hover:text-blue-600 transition-colors"
+            >
+              {printLayout ? "Quick view" : "Print layout"}
+            </button>
           </div>
 
           {/* Preview Container */}
@@ -71,7 +79,11 @@ const ResumePreviewPage = () => {
             }}
           >
             <div className="w-full h-full overflow-hidden">
-              <ResumePreview resume={resume} showHeader={true} />
+              {printLayout ? (
+                <ResumeServerPreview resume={resume} />
+              ) : (
+                <ResumePreview resume={resume} showHeader={true} />
+              )}
             </div>
           </div>
         </div>
@@ -75,6 +75,53 @@ api.interceptors.response.use(
   }
 );
 
+// Field-level deltas; endpoint is the API collection, e.g. 'resumes' or 'experience'.
+// patch() writes the given fields at once. autosave() lets the server buffer them and
+// write a burst of edits as one save; it resolves to {saved, data}, where data is the
+// saved object, or {pending, flush_in} while buffered. flush: true writes immediately.
+export const deltaAPI = {
+  patch: async (endpoint, id, changes) => {
+    const response = await api.patch(`/${endpoint}/${id}/`, changes);
+    return response.data;
+  },
+  autosave: async (endpoint, id, changes, { flush = false } = {}) => {
+    const response = await api.patch(`/${endpoint}/${id}/autosave/${flush ? '?flush=1' : ''}`, changes);
+    return { saved: response.status === 200, data: response.data };
+  },
+};
+
+// Public share link of a resume: get() reads it, enable() creates it, revoke() disables it.
+// Each resolves to {shared, url, pdf_url}.
+export const shareAPI = {
+  get: async (resumeId) => {
+    const response = await api.get(`/resumes/${resumeId}/share/`);
+    return response.data;
+  },
+  enable: async (resumeId) => {
+    const response = await api.post(`/resumes/${resumeId}/share/`);
+    return response.data;
+  },
+  revoke: async (resumeId) => {
+    const response = await api.delete(`/resumes/${resumeId}/share/`);
+    return response.data;
+  },
+};
+
+// Several calls in one round trip; paths are relative to the API root.
+// Resolves to one {id, status, headers, body} per request, in order.
+export const batchAPI = {
+  run: async (requests, { atomic = false } = {}) => {
+    const response = await api.post('/batch/', { requests, atomic });
+    return response.data;
+  },
+};
+
+// Apply a new order to one section of a resume, e.g. reorderSection('experience', 3, [12, 9, 10])
+export const reorderSection = async (section, resumeId, order) => {
+  const response = await api.post(`/${section}/reorder/`, { resume: resumeId, order });
+  return response.data;
+};
+
 // Auth endpoints
 export const authAPI = {
   login: async (credentials) => {
@@ -149,6 +196,68 @@ export const resumeAPI = {
     });
     return response;
   },
+
+  downloadDOCX: async (id) => {
+    const response = await api.get(`/resumes/${id}/download-docx/`, {
+      responseType: 'blob',
+    });
+    return response;
+  },
+
+  // format is 'text' or 'markdown'
+  exportText: async (id, format = 'text') => {
+    const response = await api.get(`/resumes/${id}/export/${format}/`, { responseType: 'text' });
+    return response.data;
+  },
+
+  // Exactly the HTML the PDF is laid out from; pair with getThemeStylesheet
+  getPreviewHTML: async (id) => {
+    const response = await api.get(`/resumes/${id}/preview/`, { responseType: 'text' });
+    return response.data;
+  },
+
+  getThemeStylesheet: async (theme) => {
+    const response = await api.get(`/themes/${theme}/stylesheet/`, { responseType: 'text' });
+    return response.data;
+  },
+
+  // Follow the server-side render as Server-Sent Events. EventSource can't send
+  // the Authorization header, so the stream is read with fetch instead.
+  // Resolves with the final 'done' payload once the PDF is cached.
+  streamRenderProgress: async (id, onStage) => {
+    const response = await fetch(`${API_BASE_URL}/resumes/${id}/render-progress/`, {
+      headers: {
+        Accept: 'text/event-stream',
+        Authorization: `Bearer ${localStorage.getItem('accessToken')}`,
+      },
+    });
+    if (!response.ok) {
+      throw new Error(`Render progress failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const fields = Object.fromEntries(
+          block.split('\n').map((line) => [line.slice(0, line.indexOf(':')), line.slice(line.indexOf(':') + 2)])
+        );
+        const data = JSON.parse(fields.data);
+        if (fields.event === 'stage' && onStage) onStage(data);
+        if (fields.event === 'error') throw new Error(data.detail);
+        if (fields.event === 'done') return data;
+      }
+    }
+    throw new Error('Render progress stream ended early');
+  },
 };
 
 // Education endpoints
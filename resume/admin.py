@@ -1,10 +1,87 @@
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.utils.html import format_html_join
+
+from resume_builder.admin_utils import ScalableModelAdmin
+from .archive import restore_if_archived
 from .models import Resume, Education, Experience, Project, Skill, Certification, Achievement
+from .pdf import SECTION_MODELS, section_versions_queryset
+
+
+class SectionInline(admin.StackedInline):
+    extra = 0
+    show_change_link = True
+
+
+# One inline per section, keyed like SECTION_MODELS
+SECTION_INLINES = {
+    name: type(f'{model.__name__}Inline', (SectionInline,), {'model': model})
+    for name, model in SECTION_MODELS.items()
+}
+
+
+@admin.register(Resume)
+class ResumeAdmin(ScalableModelAdmin):
+    """
+    The change page lists section row counts, from one query, instead of
+    loading every section as inlines. ``?section=<name>`` adds that one
+    section's inline.
+
+    Resumes deleted through the API are listed too, until
+    purge_deleted_resumes removes them, and can be restored from here.
+    """
+    list_display = ('title', 'user', 'theme', 'is_archived', 'deleted_at', 'updated_at')
+    list_select_related = ('user',)
+    list_filter = ('is_archived', 'deleted_at')
+    search_fields = ('id', 'uuid', 'user__username')
+    ordering = ('-id',)
+    raw_id_fields = ('user',)
+    readonly_fields = ('uuid', 'sections', 'created_at', 'updated_at')
+
+    actions = ('restore_deleted',)
+
+    def get_queryset(self, request):
+        # The default manager hides resumes pending deletion
+        queryset = Resume.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    @admin.action(description='Restore selected deleted resumes')
+    def restore_deleted(self, request, queryset):
+        restored = queryset.pending_deletion().update(deleted_at=None)
+        self.message_user(request, f'Restored {restored} resume(s).')
+
+    def get_inlines(self, request, obj):
+        name = request.GET.get('section')
+        if obj is None or name not in SECTION_INLINES:
+            return []
+        return [SECTION_INLINES[name]]
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        if request.GET.get('section') in SECTION_INLINES:
+            resume = self.get_object(request, unquote(object_id))
+            if resume is not None:
+                restore_if_archived(resume)
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    @admin.display(description='Sections')
+    def sections(self, obj):
+        if obj.is_archived:
+            return 'Archived; opening a section restores it'
+        versions = section_versions_queryset(obj.pk).get()
+        return format_html_join(
+            ', ', '<a href="?section={}">{}</a> ({})',
+            ((name, name.title(), versions[f'{name}_count'] or 0) for name in SECTION_MODELS),
+        )
+
+
+class SectionAdmin(ScalableModelAdmin):
+    list_display = ('__str__', 'resume', 'sort_order', 'updated_at')
+    list_select_related = ('resume__user',)
+    search_fields = ('id', 'resume__id', 'resume__uuid', 'resume__user__username')
+    ordering = ('-id',)
+    raw_id_fields = ('resume',)
+
 
-admin.site.register(Resume)
-admin.site.register(Education)
-admin.site.register(Experience)
-admin.site.register(Project)
-admin.site.register(Skill)
-admin.site.register(Certification)
-admin.site.register(Achievement)
\ No newline at end of file
+for model in (Education, Experience, Project, Skill, Certification, Achievement):
+    admin.site.register(model, SectionAdmin)
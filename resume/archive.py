@@ -0,0 +1,183 @@
+"""
+Cold storage for resumes nobody has touched in a long while.
+
+archive_resumes() moves a resume's section rows out of the hot section
+tables into a single ResumeArchive row holding a JSON dump of them (laid
+out like dumpdata's, but with full-precision timestamps). The dump is
+compressed with zstd when the zstandard package is installed and with zlib
+otherwise. The Resume row stays where it is and is flagged is_archived, so
+resume lists and ownership checks don't change.
+
+restore_resume() puts the rows back with their original ids and timestamps
+and drops the archive. The views call it before anything lists or adds to
+an archived resume's sections, so clients never see the difference.
+Because the timestamps are kept, the PDF fingerprint is unchanged and
+cached PDFs stay valid. Archives can sit for years, so fields dropped by
+later migrations are ignored on restore.
+
+Archiving deletes exactly the rows it dumped, locked until it commits. A
+row added meanwhile stays in the section table, and so does one saved
+after the delete (Django inserts it again). Restoring leaves such rows
+alone rather than overwriting them with their older archived copies.
+"""
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; zlib is always available
+    zstandard = None
+
+from .models import Resume, ResumeArchive
+from .pdf import SECTION_MODELS
+
+DEFAULT_ARCHIVE_SETTINGS = {
+    'INACTIVE_DAYS': 365,
+    'CODEC': 'auto',
+    'ZLIB_LEVEL': 9,
+    'ZSTD_LEVEL': 19,
+}
+
+CODECS = ('auto', 'zstd', 'zlib')
+
+
+def get_archive_settings():
+    """Return RESUME_ARCHIVE merged over the defaults."""
+    options = dict(DEFAULT_ARCHIVE_SETTINGS)
+    options.update(getattr(settings, 'RESUME_ARCHIVE', {}))
+    return options
+
+
+def resolve_codec(name):
+    if name == 'auto':
+        return 'zstd' if zstandard is not None else 'zlib'
+    if name == 'zstd' and zstandard is None:
+        raise ImproperlyConfigured('The zstd codec needs the zstandard package.')
+    if name not in CODECS:
+        raise ImproperlyConfigured(f'Unknown archive codec "{name}".')
+    return name
+
+
+def compress(data, codec):
+    options = get_archive_settings()
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=options['ZSTD_LEVEL']).compress(data)
+    return zlib.compress(data, options['ZLIB_LEVEL'])
+
+
+def decompress(data, codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImproperlyConfigured('Restoring a zstd archive needs the zstandard package.')
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def encode_value(value):
+    # Unlike DjangoJSONEncoder, keeps microseconds: the PDF fingerprint includes updated_at
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def dump_rows(objects):
+    return json.dumps(serializers.serialize('python', objects), default=encode_value).encode()
+
+
+def load_rows(dump):
+    return serializers.deserialize('python', json.loads(dump), ignorenonexistent=True)
+
+
+def inactive_resumes(days):
+    """
+    Resumes not updated for ``days``, oldest first. A section edited since
+    then also keeps its resume out, as section writes don't touch the
+    resume's own updated_at.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    queryset = Resume.objects.filter(is_archived=False, updated_at__lt=cutoff)
+    for model in SECTION_MODELS.values():
+        queryset = queryset.exclude(Exists(model.objects.filter(resume=OuterRef('pk'), updated_at__gte=cutoff)))
+    return queryset.order_by('updated_at')
+
+
+def archive_resumes(resume_ids, codec='auto'):
+    """
+    Archive the given resumes in one transaction. Returns (resumes, rows,
+    bytes before compression, bytes after).
+    """
+    codec = resolve_codec(codec)
+    with transaction.atomic():
+        # Re-checked inside the transaction in case one was archived meanwhile
+        resume_ids = list(Resume.objects.filter(pk__in=resume_ids, is_archived=False).values_list('pk', flat=True))
+        rows = {resume_id: [] for resume_id in resume_ids}
+        dumped = {}
+        for model in SECTION_MODELS.values():
+            # Locked, so an edit can't land between the dump and the delete
+            objects = list(model.objects.select_for_update().filter(resume__in=resume_ids).order_by('pk'))
+            for row in objects:
+                rows[row.resume_id].append(row)
+            dumped[model] = [row.pk for row in objects]
+
+        archives = []
+        for resume_id, objects in rows.items():
+            dump = dump_rows(objects)
+            archives.append(ResumeArchive(
+                resume_id=resume_id, codec=codec, data=compress(dump, codec),
+                row_count=len(objects), raw_size=len(dump),
+            ))
+        ResumeArchive.objects.bulk_create(archives)
+        for model, pks in dumped.items():
+            model.objects.filter(pk__in=pks).delete()
+        # update() leaves updated_at alone, so the resume stays judged inactive
+        Resume.objects.filter(pk__in=resume_ids).update(is_archived=True)
+
+    return (
+        len(archives),
+        sum(archive.row_count for archive in archives),
+        sum(archive.raw_size for archive in archives),
+        sum(len(archive.data) for archive in archives),
+    )
+
+
+def restore_resume(resume):
+    """Move an archived resume's sections back into the section tables."""
+    with transaction.atomic():
+        archive = ResumeArchive.objects.filter(pk=resume.pk).first()
+        # Deleting first makes concurrent restores of the same resume wait for
+        # this one, then find nothing left to do
+        if archive is not None and ResumeArchive.objects.filter(pk=resume.pk).delete()[0]:
+            dump = decompress(bytes(archive.data), archive.codec)
+            rows = list(load_rows(dump))
+            hot = {
+                (model, pk)
+                for model in {type(row.object) for row in rows}
+                for pk in model.objects.filter(
+                    pk__in=[row.object.pk for row in rows if type(row.object) is model]
+                ).values_list('pk', flat=True)
+            }
+            for deserialized in rows:
+                # Saved since it was archived; that copy is newer
+                if (type(deserialized.object), deserialized.object.pk) in hot:
+                    continue
+                # A raw insert, like loaddata: ids, timestamps and bullets are kept as archived
+                deserialized.save(force_insert=True)
+        Resume.all_objects.filter(pk=resume.pk).update(is_archived=False)
+    resume.is_archived = False
+
+
+def restore_if_archived(resume):
+    if resume.is_archived:
+        restore_resume(resume)
+
+
+def restore_archived(resumes):
+    """Restore every archived resume in the ``resumes`` queryset."""
+    for resume in resumes.filter(is_archived=True):
+        restore_resume(resume)
@@ -0,0 +1,24 @@
+from django.urls import path
+from . import async_views
+
+# Native async routes for the ASGI entry point. They shadow the router's
+# list/detail URLs in resume_builder.asgi_urls; anything not matched here
+# (other methods are delegated inside the views) falls through to resume.urls.
+urlpatterns = [
+    path('resumes/', async_views.resume_list),
+    path('resumes/<int:pk>/', async_views.resume_detail),
+    path('education/', async_views.education_list),
+    path('education/<int:pk>/', async_views.education_detail),
+    path('experience/', async_views.experience_list),
+    path('experience/<int:pk>/', async_views.experience_detail),
+    path('projects/', async_views.project_list),
+    path('projects/<int:pk>/', async_views.project_detail),
+    path('skills/', async_views.skill_list),
+    path('skills/<int:pk>/', async_views.skill_detail),
+    path('certifications/', async_views.certification_list),
+    path('certifications/<int:pk>/', async_views.certification_detail),
+    path('achievements/', async_views.achievement_list),
+    path('achievements/<int:pk>/', async_views.achievement_detail),
+    path('resumes/<int:resume_id>/download-pdf/', async_views.resume_pdf_download),
+    path('resumes/<int:resume_id>/render-progress/', async_views.resume_render_progress),
+]
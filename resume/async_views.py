@@ -0,0 +1,211 @@
+"""
+Native async views served by the ASGI entry point (resume_builder.asgi_urls).
+
+GET requests for resumes and their sections are answered with the async
+ORM straight from the event loop; every other method is handed to the
+regular DRF viewset. The PDF download and render progress stream render on
+the bounded executor from resume.pdf so WeasyPrint never blocks the loop.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from user.authentication import CachedJWTAuthentication
+from .archive import restore_resume
+from .autosave import flush_pending
+from .models import Resume
+from .pdf import (
+    acoalesced_render, aget_sections, aiter_render_stages, fingerprint_from_versions, get_pdf_cache,
+    pdf_cache_key, pdf_filename, render_resume_pdf, section_versions_queryset,
+)
+from .views import (
+    ResumeViewSet, EducationViewSet, ExperienceViewSet,
+    ProjectViewSet, SkillViewSet, CertificationViewSet, AchievementViewSet,
+    cache_hit_event, event_stream_response, render_done_event, render_error_event, server_sent_event,
+)
+
+READ_METHODS = ('GET', 'HEAD')
+
+authenticator = CachedJWTAuthentication()
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def error_response(exc):
+    """Render an APIException the way DRF's exception handler would."""
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {'detail': exc.detail}
+    response = json_response(data, status=exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    return response
+
+
+async def authenticate(request):
+    """Return the JWT-authenticated user or raise NotAuthenticated."""
+    result = await authenticator.aauthenticate(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+    return result[0]
+
+
+def not_found(model):
+    return exceptions.NotFound(f'No {model._meta.object_name} matches the given query.')
+
+
+def async_read_view(viewset, detail=False, select_related=()):
+    """
+    Build an async view serving GET for ``viewset`` from the event loop.
+
+    The queryset still comes from ``viewset.get_queryset()`` so ownership
+    and filtering rules stay defined in one place; it is only built here,
+    never evaluated synchronously.
+    """
+    if detail:
+        actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+    else:
+        actions = {'get': 'list', 'post': 'create'}
+    sync_view = sync_to_async(viewset.as_view(actions))
+    model = viewset.serializer_class.Meta.model
+
+    async def view(request, pk=None):
+        kwargs = {'pk': pk} if detail else {}
+        if request.method not in READ_METHODS:
+            return await sync_view(request, **kwargs)
+
+        try:
+            user = await authenticate(request)
+            await sync_to_async(flush_pending)(user.pk)
+            drf_request = Request(request)
+            drf_request.user = user
+            handler = viewset(request=drf_request, format_kwarg=None, kwargs=kwargs, action=actions['get'])
+            await sync_to_async(handler.rehydrate)()
+            queryset = handler.get_queryset().select_related(*select_related)
+            serializer_context = handler.get_serializer_context()
+
+            if detail:
+                try:
+                    instance = await queryset.aget(pk=pk)
+                except model.DoesNotExist:
+                    raise not_found(model)
+                data = viewset.serializer_class(instance, context=serializer_context).data
+            elif (values_serializer := handler.get_values_serializer()) is not None:
+                data = values_serializer.serialize([row async for row in values_serializer.values(queryset)])
+            else:
+                items = [item async for item in queryset]
+                data = viewset.serializer_class(items, many=True, context=serializer_context).data
+        except exceptions.APIException as exc:
+            return error_response(exc)
+        return json_response(data)
+
+    view.__name__ = f'async_{model._meta.model_name}_{"detail" if detail else "list"}'
+    # Writes are delegated to DRF, which handles CSRF itself (as its views are exempt).
+    return csrf_exempt(view)
+
+
+resume_list = async_read_view(ResumeViewSet, select_related=('user',))
+resume_detail = async_read_view(ResumeViewSet, detail=True, select_related=('user',))
+education_list = async_read_view(EducationViewSet)
+education_detail = async_read_view(EducationViewSet, detail=True)
+experience_list = async_read_view(ExperienceViewSet)
+experience_detail = async_read_view(ExperienceViewSet, detail=True)
+project_list = async_read_view(ProjectViewSet)
+project_detail = async_read_view(ProjectViewSet, detail=True)
+skill_list = async_read_view(SkillViewSet)
+skill_detail = async_read_view(SkillViewSet, detail=True)
+certification_list = async_read_view(CertificationViewSet)
+certification_detail = async_read_view(CertificationViewSet, detail=True)
+achievement_list = async_read_view(AchievementViewSet)
+achievement_detail = async_read_view(AchievementViewSet, detail=True)
+
+
+async def get_user_resume(request, resume_id):
+    """Async views.get_user_resume() for the authenticated user; raises APIException."""
+    user = await authenticate(request)
+    await sync_to_async(flush_pending)(user.pk)
+    try:
+        resume = await Resume.objects.aget(id=resume_id, user=user)
+    except Resume.DoesNotExist:
+        raise not_found(Resume)
+    if resume.is_archived:
+        await sync_to_async(restore_resume)(resume)
+    return resume
+
+
+@require_GET
+async def resume_pdf_download(request, resume_id):
+    """
+    Async counterpart of ResumePDFDownloadView: the fingerprint and, on a
+    cache miss, the sections are loaded with the async ORM and WeasyPrint
+    runs on the bounded render executor, shared with concurrent requests
+    for the same PDF (see acoalesced_render).
+    """
+    try:
+        resume = await get_user_resume(request, resume_id)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+
+    versions = await section_versions_queryset(resume.pk).aget()
+    fingerprint = fingerprint_from_versions(versions)
+    cache = get_pdf_cache()
+    pdf = await cache.aget(pdf_cache_key(fingerprint))
+    if pdf is None:
+        sections = await aget_sections(resume)
+
+        def render():
+            pdf = render_resume_pdf(resume, sections, versions)
+            # Cached before the flight lands, for waiters in other processes
+            cache.set(pdf_cache_key(fingerprint), pdf, getattr(settings, 'PDF_CACHE_TIMEOUT', 86400))
+            return pdf
+
+        try:
+            pdf = await acoalesced_render(resume, fingerprint, render)
+        except Exception as e:
+            # Log the error in production
+            return HttpResponse(f'Error generating PDF: {str(e)}', status=500)
+
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{pdf_filename(resume)}"'
+    response['ETag'] = f'"{fingerprint}"'
+    return response
+
+
+@require_GET
+async def resume_render_progress(request, resume_id):
+    """
+    Async counterpart of ResumePDFRenderProgressView. Its events come from
+    an async generator, so each one is sent as it happens; Django would
+    collect a sync generator's whole stream before sending any of it.
+    """
+    try:
+        resume = await get_user_resume(request, resume_id)
+    except exceptions.APIException as exc:
+        return error_response(exc)
+    return event_stream_response(stream_render_progress(resume))
+
+
+async def stream_render_progress(resume):
+    started = time.perf_counter()
+    versions = await section_versions_queryset(resume.pk).aget()
+    fingerprint = fingerprint_from_versions(versions)
+    if await get_pdf_cache().aget(pdf_cache_key(fingerprint)) is not None:
+        yield cache_hit_event(started, fingerprint)
+    else:
+        try:
+            async for stage in aiter_render_stages(resume, fingerprint, started, versions):
+                yield server_sent_event('stage', stage)
+        except Exception as e:
+            yield render_error_event(e)
+            return
+    yield render_done_event(resume, fingerprint)
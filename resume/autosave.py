@@ -0,0 +1,180 @@
+"""
+Field-level writes for the editor.
+
+save_changed_fields() writes only the columns whose values actually
+change, using ``save(update_fields=...)``. A save that changes nothing
+doesn't touch the row, so updated_at stays put, and so do the PDF
+fingerprint and the fragment and text caches keyed on it. Every update
+through the API serializers goes this way.
+
+The autosave endpoints (``PATCH /api/<section>/<id>/autosave/``) also
+coalesce. A user's deltas are merged in a buffer in the cache, one per
+object, instead of being written one by one. The buffer is written as a
+single save once an autosave arrives RESUME_AUTOSAVE['WINDOW'] seconds
+after the buffer's first one, or when the client asks with ``?flush=1``.
+Any other request by the user writes all of their buffers first, before
+it reads or writes anything, and so do the preview, the exports and the
+public share views for the owner's buffers. That way reads see the
+user's own edits.
+
+The buffer has to live in a cache that every worker process shares.
+With a local-memory (or dummy) cache, deltas are written at once, as with
+WINDOW 0, since another worker would never see them. Pending edits are
+lost if the cache drops them, so clients flush when the user pauses.
+
+A delta is only ever written under the user's lock, so a direct write
+can't be overtaken by an older buffered one. When the lock can't be had,
+stage_changes() raises AutosaveBusy and the client retries.
+"""
+import logging
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+from resume_builder.cache_utils import is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTOSAVE_SETTINGS = {
+    'WINDOW': 2.0,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    'LOCK_TIMEOUT': 1.0,
+}
+
+LOCK_POLL_INTERVAL = 0.01
+
+
+def get_autosave_settings():
+    """Return RESUME_AUTOSAVE merged over the defaults."""
+    options = dict(DEFAULT_AUTOSAVE_SETTINGS)
+    options.update(getattr(settings, 'RESUME_AUTOSAVE', {}))
+    return options
+
+
+class AutosaveBusy(Exception):
+    """The user's buffers are locked by another request; retry shortly."""
+
+
+def normalize_changes(model, changes):
+    """Key ``changes`` by column (attname), with related objects replaced by their keys."""
+    normalized = {}
+    for name, value in changes.items():
+        field = model._meta.get_field(name)
+        if field.many_to_one or field.one_to_one:
+            value = getattr(value, 'pk', value)
+        normalized[field.attname] = value
+    return normalized
+
+
+def save_changed_fields(instance, changes):
+    """
+    Set ``changes`` (field name to value) on ``instance`` and save only the
+    ones that differ, plus auto_now timestamps. Returns the changed names.
+    """
+    changed = []
+    for attname, value in normalize_changes(type(instance), changes).items():
+        if getattr(instance, attname) != value:
+            setattr(instance, attname, value)
+            changed.append(attname)
+    if changed:
+        timestamps = [field.name for field in instance._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        instance.save(update_fields=[*changed, *timestamps])
+    return changed
+
+
+def buffer_key(user_id):
+    return f'autosave:{user_id}'
+
+
+class UserLock:
+    """A short lock on one user's buffers, held through cache.add(); see acquire()."""
+
+    def __init__(self, cache, user_id, timeout):
+        self.cache = cache
+        self.key = f'autosave-lock:{user_id}'
+        self.token = uuid.uuid4().hex
+        self.timeout = timeout
+
+    def acquire(self):
+        """Wait up to ``timeout`` for the lock; the lock itself expires after that long too."""
+        deadline = time.monotonic() + self.timeout
+        while not self.cache.add(self.key, self.token, self.timeout):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+        return True
+
+    def release(self):
+        if self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+
+
+def stage_changes(user_id, instance, changes, flush=False):
+    """
+    Add an autosave delta to the user's buffer for ``instance``. Writes
+    the buffer when its window is over or ``flush`` is set. Returns
+    (written, pending fields, seconds until the window closes), or raises
+    AutosaveBusy if the user's buffers stay locked.
+    """
+    options = get_autosave_settings()
+    cache = caches[options['CACHE_ALIAS']]
+    if options['WINDOW'] <= 0 or not is_shared_cache(cache):
+        save_changed_fields(instance, changes)
+        return True, [], 0
+    lock = UserLock(cache, user_id, options['LOCK_TIMEOUT'])
+    if not lock.acquire():
+        # Writing without the lock could put this delta under an older buffered one
+        raise AutosaveBusy(user_id)
+    try:
+        buffers = cache.get(buffer_key(user_id)) or {}
+        target = (instance._meta.label, instance.pk)
+        now = time.time()
+        buffer = buffers.setdefault(target, {'opened': now, 'changes': {}})
+        buffer['changes'].update(normalize_changes(type(instance), changes))
+
+        remaining = buffer['opened'] + options['WINDOW'] - now
+        if flush or remaining <= 0:
+            del buffers[target]
+            write_buffers(cache, user_id, buffers, options)
+            save_changed_fields(instance, buffer['changes'])
+            return True, [], 0
+        write_buffers(cache, user_id, buffers, options)
+        pending = sorted(instance._meta.get_field(attname).name for attname in buffer['changes'])
+        return False, pending, remaining
+    finally:
+        lock.release()
+
+
+def write_buffers(cache, user_id, buffers, options):
+    if buffers:
+        cache.set(buffer_key(user_id), buffers, options['TIMEOUT'])
+    else:
+        cache.delete(buffer_key(user_id))
+
+
+def flush_pending(user_id):
+    """Write every autosave buffered for the user. Returns how many objects were written."""
+    options = get_autosave_settings()
+    cache = caches[options['CACHE_ALIAS']]
+    # The common case, nothing buffered, costs one cache read
+    if not cache.get(buffer_key(user_id)):
+        return 0
+    lock = UserLock(cache, user_id, options['LOCK_TIMEOUT'])
+    if not lock.acquire():
+        logger.warning('Could not lock the autosave buffers of user %s; reading without them', user_id)
+        return 0
+    try:
+        buffers = cache.get(buffer_key(user_id)) or {}
+        # Written under the lock, so a newer delta can't be saved before these
+        for (label, pk), buffer in buffers.items():
+            instance = apps.get_model(label)._base_manager.filter(pk=pk).first()
+            if instance is not None:  # deleted since; its edits go with it
+                save_changed_fields(instance, buffer['changes'])
+        cache.delete(buffer_key(user_id))
+    finally:
+        lock.release()
+    return len(buffers)
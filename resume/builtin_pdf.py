@@ -0,0 +1,573 @@
+"""
+Built-in PDF layout for the classic single-column resume.
+
+Lays out the structure of templates/pdf/resume_pdf.html directly, using
+the sizes, colours and spacing of resume_pdf_styles.css: the centred
+header, ruled section titles, item rows with right-aligned dates, bullet
+lists, the two-column skill grid and the achievements list. Sections and
+items avoid page breaks the way the stylesheet asks WeasyPrint to.
+
+Text is set in the standard Helvetica faces that every PDF viewer ships
+with. Their metrics are built in below, so nothing is embedded or loaded
+at runtime. Those faces can only encode Windows-1252, so build_flow()
+raises UnsupportedContent for other text and the caller falls back to
+WeasyPrint.
+"""
+import hashlib
+import unicodedata
+import zlib
+from collections import namedtuple
+from itertools import groupby
+from pathlib import Path
+
+from django.utils.formats import localize
+
+# Part of the PDF fingerprint of builtin themes: any edit to this module
+# invalidates their cached PDFs, while edits to the stylesheet don't
+LAYOUT_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+# A4 with the stylesheet's 1.5cm margins, in points
+PAGE_WIDTH, PAGE_HEIGHT = 595.28, 841.89
+MARGIN = 42.52
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+CONTENT_TOP, CONTENT_BOTTOM = PAGE_HEIGHT - MARGIN, MARGIN
+
+LINE_HEIGHT = 1.2
+# Vertical metrics of the sans-serif face WeasyPrint substitutes for Helvetica
+ASCENT, DESCENT = 0.905, 0.212
+
+# Advance widths (1/1000 em) of ' ' through '~' in Helvetica and Helvetica-Bold
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# Windows-1252 punctuation and symbols, as (regular, bold) widths
+SYMBOL_WIDTHS = {
+    0x80: (556, 556), 0x85: (1000, 1000), 0x91: (222, 278), 0x92: (222, 278),
+    0x93: (333, 500), 0x94: (333, 500), 0x95: (350, 350), 0x96: (556, 556),
+    0x97: (1000, 1000), 0x99: (1000, 1000), 0xA0: (278, 278), 0xA9: (737, 737),
+    0xAE: (737, 737), 0xB0: (400, 400), 0xB7: (278, 278), 0xD7: (584, 584),
+    0xDF: (611, 611),
+}
+
+
+def width_table(ascii_widths, column):
+    table = [556] * 256
+    table[32:127] = ascii_widths
+    for code in range(0xC0, 0x100):
+        # Accented Latin-1 letters are as wide as their base letter
+        base = unicodedata.normalize('NFD', chr(code))[0]
+        if base.isascii() and base.isalpha():
+            table[code] = table[ord(base)]
+    for code, widths in SYMBOL_WIDTHS.items():
+        table[code] = widths[column]
+    return table
+
+
+class UnsupportedContent(Exception):
+    """The resume has text the built-in fonts can't encode."""
+
+
+class Font:
+    def __init__(self, resource, base_font, widths):
+        self.resource = resource
+        self.base_font = base_font
+        self.widths = widths
+
+    def width(self, text, size, tracking=0.0):
+        encoded = encode(text)
+        return sum(self.widths[byte] for byte in encoded) * size / 1000 + tracking * len(encoded)
+
+
+def encode(text):
+    try:
+        return text.encode('cp1252')
+    except UnicodeEncodeError as e:
+        raise UnsupportedContent(str(e)) from e
+
+
+def rgb(hex_color):
+    return tuple(int(hex_color[index:index + 2], 16) / 255 for index in (1, 3, 5))
+
+
+def px(value):
+    """CSS pixels to points."""
+    return value * 0.75
+
+
+REGULAR = Font('F1', 'Helvetica', width_table(HELVETICA_WIDTHS, 0))
+BOLD = Font('F2', 'Helvetica-Bold', width_table(HELVETICA_BOLD_WIDTHS, 1))
+FONTS = (REGULAR, BOLD)
+
+BLACK = rgb('#000000')
+BLUE = rgb('#1e40af')
+ACCENT = rgb('#2563eb')
+RULE = rgb('#3b82f6')
+GREY = rgb('#6b7280')
+
+Style = namedtuple('Style', 'font size color tracking', defaults=(BLACK, 0.0))
+Token = namedtuple('Token', 'text style space_after')
+Flow = namedtuple('Flow', 'title groups')
+
+NAME = Style(BOLD, 18)
+PROFESSIONAL_TITLE = Style(REGULAR, 11, BLUE)
+CONTACT = Style(REGULAR, 9)
+SECTION_TITLE = Style(BOLD, 11, BLUE, px(0.5))
+ITEM_TITLE = Style(BOLD, 10)
+ITEM_SUBTITLE = Style(REGULAR, 9, BLUE)
+ITEM_DATE = Style(REGULAR, 8, GREY)
+BODY = Style(REGULAR, 9)
+BODY_BOLD = Style(BOLD, 9)
+LABEL = Style(BOLD, 9, BLUE)
+
+
+def space(style):
+    return style.font.width(' ', style.size, style.tracking)
+
+
+def words(text, style, trailing=0.0):
+    """Split text into tokens the way HTML collapses whitespace."""
+    parts = str(text).split()
+    gap = space(style)
+    return [Token(part, style, gap if index < len(parts) - 1 else trailing) for index, part in enumerate(parts)]
+
+
+def token_width(token):
+    return token.style.font.width(token.text, token.style.size, token.style.tracking)
+
+
+def split_overlong(token, width):
+    """Break a word wider than the line (a long URL, say) between characters."""
+    if token_width(token) <= width:
+        return [token]
+    pieces, current = [], ''
+    for char in token.text:
+        if current and token.style.font.width(current + char, token.style.size, token.style.tracking) > width:
+            pieces.append(Token(current, token.style, 0.0))
+            current = char
+        else:
+            current += char
+    pieces.append(Token(current, token.style, token.space_after))
+    return pieces
+
+
+def wrap(tokens, width, first_width=None):
+    """Greedy line breaking; the first line may be narrower (beside a float)."""
+    lines, line, used = [], [], 0.0
+    available = first_width if first_width is not None else width
+    for token in tokens:
+        for piece in split_overlong(token, width):
+            piece_width = token_width(piece)
+            if line and used + piece_width > available + 0.01:
+                lines.append(line)
+                line, used, available = [], 0.0, width
+            line.append(piece)
+            used += piece_width + piece.space_after
+    if line:
+        lines.append(line)
+    return lines
+
+
+def escape(text):
+    """Windows-1252 bytes as a PDF literal string (kept in a latin-1 str)."""
+    raw = encode(text).decode('latin-1')
+    return raw.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').replace('\r', '\\r')
+
+
+def color_op(color, operator):
+    return '{:.3f} {:.3f} {:.3f} {}'.format(*color, operator)
+
+
+class TextLine:
+    def __init__(self, tokens, left=MARGIN, width=CONTENT_WIDTH, align='left', marker=None):
+        self.tokens = tokens
+        self.left, self.width, self.align = left, width, align
+        self.marker = marker
+        self.size = max(token.style.size for token in tokens)
+        self.height = LINE_HEIGHT * self.size
+
+    @property
+    def natural_width(self):
+        return sum(token_width(token) + token.space_after for token in self.tokens) - self.tokens[-1].space_after
+
+    def runs(self):
+        """Merge neighbouring tokens of one style into (text, style, width, gap_after) runs."""
+        runs = []
+        for token in self.tokens:
+            if runs and runs[-1][1] == token.style and runs[-1][3] == space(token.style):
+                text, style, _, _ = runs[-1]
+                runs[-1] = (f'{text} {token.text}', style, None, token.space_after)
+            else:
+                runs.append((token.text, token.style, None, token.space_after))
+        return [
+            (text, style, style.font.width(text, style.size, style.tracking), gap)
+            for text, style, _, gap in runs
+        ]
+
+    def draw(self, top):
+        baseline = top - ((LINE_HEIGHT - ASCENT - DESCENT) / 2 + ASCENT) * self.size
+        x = self.left
+        if self.align == 'center':
+            x += (self.width - self.natural_width) / 2
+        elif self.align == 'right':
+            x += self.width - self.natural_width
+        ops = []
+        if self.marker is not None:
+            marker_x = self.left - self.marker.style.font.width(self.marker.text + ' ', self.marker.style.size)
+            ops.append(text_op(self.marker.text, self.marker.style, marker_x, baseline))
+        for text, style, width, gap in self.runs():
+            ops.append(text_op(text, style, x, baseline))
+            x += width + gap
+        return ops
+
+
+def text_op(text, style, x, y):
+    return (
+        f'BT /{style.font.resource} {style.size:g} Tf {color_op(style.color, "rg")} '
+        f'{style.tracking:.3f} Tc {x:.2f} {y:.2f} Td ({escape(text)}) Tj ET'
+    )
+
+
+class Spacer:
+    """Vertical margin; dropped rather than carried over at a page break."""
+
+    def __init__(self, height):
+        self.height = height
+
+    def draw(self, top):
+        return []
+
+
+class Rule:
+    def __init__(self, thickness, color):
+        self.height = thickness
+        self.color = color
+
+    def draw(self, top):
+        y = top - self.height / 2
+        return [
+            f'{color_op(self.color, "RG")} {self.height:.2f} w '
+            f'{MARGIN:.2f} {y:.2f} m {MARGIN + CONTENT_WIDTH:.2f} {y:.2f} l S'
+        ]
+
+
+class Columns:
+    """Stacks of elements drawn side by side from the same top edge."""
+
+    def __init__(self, *stacks):
+        self.stacks = stacks
+        self.height = max(sum(element.height for element in stack) for stack in stacks)
+
+    def draw(self, top):
+        ops = []
+        for stack in self.stacks:
+            y = top
+            for element in stack:
+                ops.extend(element.draw(y))
+                y -= element.height
+        return ops
+
+
+class Group:
+    """Elements (or nested groups) that should stay on one page if they can."""
+
+    def __init__(self, children):
+        self.children = children
+        self.height = sum(child.height for child in children)
+
+
+def paragraph(tokens, left=MARGIN, width=CONTENT_WIDTH, align='left', first_width=None, marker=None):
+    lines = wrap(tokens, width, first_width) if tokens else []
+    return [
+        TextLine(line, left, width, align, marker if index == 0 else None)
+        for index, line in enumerate(lines)
+    ]
+
+
+def date_text(start, end, current=False):
+    # Same rendering as "{{ start }} - {{ end|default:'Present' }}" in the templates
+    return f'{localize(start)} - {"Present" if current or not end else localize(end)}'
+
+
+def item_header(title, subtitle=None, dates=()):
+    right_width = min(
+        max((ITEM_DATE.font.width(text, ITEM_DATE.size) for text in dates), default=0.0),
+        CONTENT_WIDTH / 2,
+    )
+    left_width = CONTENT_WIDTH - right_width
+    left = paragraph(words(title, ITEM_TITLE), width=left_width)
+    if subtitle:
+        left += paragraph(words(subtitle, ITEM_SUBTITLE), width=left_width)
+    right = []
+    for text in dates:
+        right += paragraph(words(text, ITEM_DATE), MARGIN + left_width, right_width, 'right')
+    return [Columns(left, right), Spacer(px(2))]
+
+
+def description(tokens, left=MARGIN):
+    """An .item-description block: 9pt with a 2px top margin."""
+    return [Spacer(px(2))] + paragraph(tokens, left, CONTENT_WIDTH - (left - MARGIN))
+
+
+def bullets(lines):
+    indent = MARGIN + px(12)
+    elements = [Spacer(px(2))]
+    for line in lines:
+        elements += paragraph(words(line, BODY), indent, CONTENT_WIDTH - px(12), marker=Token('•', BODY, 0.0))
+        elements.append(Spacer(px(1)))
+    return elements
+
+
+def labelled(label, value):
+    return words(label, BODY_BOLD, space(BODY)) + words(value, BODY)
+
+
+def section(title, items, item_gap=px(8)):
+    """
+    A section: kept whole when it fits on a page, otherwise broken between
+    items with the title kept beside the first one.
+    """
+    heading = paragraph(words(title.upper(), SECTION_TITLE)) + [
+        Spacer(px(1)), Rule(px(1), RULE), Spacer(px(6)),
+    ]
+    groups = []
+    for index, item in enumerate(items):
+        # The last item's margin collapses into the section's 12px
+        gap = px(12) if index == len(items) - 1 else item_gap
+        groups.append(Group(item + [Spacer(gap)]))
+    groups[0] = Group(heading + [groups[0]])
+    return Group(groups)
+
+
+def header(resume):
+    elements = paragraph(words(resume.name or 'Your Name', NAME), align='center') + [Spacer(px(4))]
+    if resume.professional_title:
+        elements += paragraph(words(resume.professional_title, PROFESSIONAL_TITLE), align='center')
+        elements.append(Spacer(px(6)))
+    contact = [value for value in (resume.email, resume.phone, resume.location) if value]
+    if contact:
+        # Flex items with 10px side margins and an 8px gap
+        elements += paragraph([Token(value, CONTACT, px(28)) for value in contact], align='center')
+    links = [
+        f'{label}: {url}' for label, url in (
+            ('LinkedIn', resume.linkedin_url), ('GitHub', resume.github_url),
+            ('Website', resume.website_url), ('Twitter', resume.twitter_url),
+        ) if url
+    ]
+    elements.append(Spacer(px(4)))
+    tokens = []
+    for link in links:
+        tokens += words(link, CONTACT, px(8) + space(CONTACT))
+    elements += paragraph(tokens, align='center')
+    return Group(elements + [Spacer(px(8)), Rule(px(2), ACCENT), Spacer(px(12))])
+
+
+def education_items(rows):
+    for edu in rows:
+        title = edu.degree + (f' in {edu.field_of_study}' if edu.field_of_study else '')
+        item = item_header(title, edu.school, [date_text(edu.start_date, edu.end_date)])
+        if edu.gpa:
+            item += description(words(f'GPA: {localize(edu.gpa)}', BODY))
+        if edu.description:
+            item += description(words(edu.description, BODY))
+        yield item
+
+
+def experience_items(rows):
+    for exp in rows:
+        dates = [date_text(exp.start_date, exp.end_date, exp.is_current)]
+        if exp.location:
+            dates.append(exp.location)
+        item = item_header(exp.position, exp.company, dates)
+        if exp.description:
+            item += bullets(exp.description_bullets)
+        yield item
+
+
+def project_items(rows):
+    for project in rows:
+        item = item_header(project.name, dates=[date_text(project.start_date, project.end_date)])
+        if project.description:
+            item += description(words(project.description, BODY))
+        if project.technologies:
+            item += description(labelled('Technologies:', project.technologies))
+        tokens = []
+        if project.project_url:
+            tokens += labelled('URL:', project.project_url)
+            tokens[-1] = tokens[-1]._replace(space_after=space(BODY))
+        if project.github_url:
+            tokens += labelled('GitHub:', project.github_url)
+        # The links div is always there, so its margin is too
+        item += description(tokens)
+        yield item
+
+
+def skill_rows(rows):
+    column_width = (CONTENT_WIDTH - px(2)) / 2
+    cells = []
+    for category, skills in groupby(rows, key=lambda skill: skill.category):
+        names = ', '.join(skill.name for skill in skills)
+        tokens = words(f'{category or "General"}:', LABEL, space(BODY)) + words(names, BODY)
+        cells.append(tokens)
+    for index in range(0, len(cells), 2):
+        stacks = [
+            paragraph(tokens, MARGIN + column * (column_width + px(2)), column_width)
+            for column, tokens in enumerate(cells[index:index + 2])
+        ]
+        yield [Columns(*stacks), Spacer(px(2))]
+
+
+def certification_items(rows):
+    for cert in rows:
+        dates = localize(cert.issue_date) + (f' - {localize(cert.expiration_date)}' if cert.expiration_date else '')
+        item = item_header(cert.name, cert.issuing_organization, [dates])
+        if cert.credential_id:
+            item += description(words(f'Credential ID: {cert.credential_id}', BODY))
+        if cert.credential_url:
+            item += description(words(f'URL: {cert.credential_url}', BODY))
+        yield item
+
+
+def achievement_items(rows):
+    for achievement in rows:
+        tokens = words(achievement.title, BODY_BOLD, space(BODY))
+        if achievement.organization:
+            tokens += words(f'- {achievement.organization}', Style(REGULAR, 9, BLUE))
+        date_stack, first_width = [], None
+        if achievement.date_achieved:
+            # float: right beside the first line
+            text = localize(achievement.date_achieved)
+            date_width = ITEM_DATE.font.width(text, ITEM_DATE.size)
+            date_stack = paragraph(words(text, ITEM_DATE), MARGIN + CONTENT_WIDTH - date_width, date_width, 'right')
+            first_width = CONTENT_WIDTH - date_width
+        # The date comes first in the template, so it's drawn (and extracted) first
+        item = [Columns(date_stack, paragraph(tokens, first_width=first_width))]
+        if achievement.description:
+            item.append(Spacer(px(1)))
+            item += paragraph(words(achievement.description, BODY), MARGIN + px(10), CONTENT_WIDTH - px(10))
+        yield item
+
+
+SECTIONS = (
+    ('education', 'Education', education_items, px(8)),
+    ('experience', 'Professional Experience', experience_items, px(8)),
+    ('projects', 'Projects', project_items, px(8)),
+    ('skills', 'Skills', skill_rows, 0.0),
+    ('certifications', 'Certifications', certification_items, px(8)),
+    ('achievements', 'Achievements', achievement_items, px(6)),
+)
+
+
+def build_flow(resume, sections):
+    """
+    The resume as a Flow of groups ready for paginate(). Raises
+    UnsupportedContent when some text can't be set in the built-in fonts.
+    """
+    groups = [header(resume)]
+    for name, title, build_items, item_gap in SECTIONS:
+        items = list(build_items(list(sections[name])))
+        if items:
+            groups.append(section(title, items, item_gap))
+    title = resume.title or 'Resume'
+    encode(title)
+    return Flow(title, groups)
+
+
+class Document:
+    """Laid-out pages; mirrors the parts of WeasyPrint's Document we use."""
+
+    def __init__(self, pages, title):
+        self.pages = pages
+        self.title = title
+
+    def write_pdf(self):
+        objects = [None, None]  # catalog and page tree, filled in last
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        font_refs = ' '.join(
+            f'/{font.resource} {add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{font.base_font} /Encoding /WinAnsiEncoding >>".encode())} 0 R'
+            for font in FONTS
+        )
+        kids = []
+        for ops in self.pages:
+            content = zlib.compress('\n'.join(ops).encode('latin-1'))
+            stream = add(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) + content + b'\nendstream')
+            kids.append(add((
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+                f'/Resources << /Font << {font_refs} >> >> /Contents {stream} 0 R >>'
+            ).encode()))
+        objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+        objects[1] = (
+            f'<< /Type /Pages /Kids [{" ".join(f"{kid} 0 R" for kid in kids)}] /Count {len(kids)} >>'
+        ).encode()
+        info = add(f'<< /Title ({escape(self.title)}) /Producer (BlackAir) >>'.encode('latin-1'))
+
+        output = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(output))
+            output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        xref = len(output)
+        output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            output += b'%010d 00000 n \n' % offset
+        output += b'trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(objects) + 1, info, xref,
+        )
+        return bytes(output)
+
+
+class Paginator:
+    def __init__(self):
+        self.pages = [[]]
+        self.y = CONTENT_TOP
+
+    @property
+    def at_top(self):
+        return self.y == CONTENT_TOP
+
+    def new_page(self):
+        self.pages.append([])
+        self.y = CONTENT_TOP
+
+    def place(self, node):
+        if isinstance(node, Group):
+            fits_here = self.y - node.height >= CONTENT_BOTTOM
+            fits_on_a_page = node.height <= CONTENT_TOP - CONTENT_BOTTOM
+            if not fits_here and fits_on_a_page and not self.at_top:
+                self.new_page()
+            for child in node.children:
+                self.place(child)
+            return
+        if self.y - node.height < CONTENT_BOTTOM:
+            if isinstance(node, Spacer):
+                self.y = CONTENT_BOTTOM  # margins are truncated at a break
+                return
+            if not self.at_top:
+                self.new_page()
+        if isinstance(node, Spacer) and self.at_top:
+            return
+        self.pages[-1].extend(node.draw(self.y))
+        self.y -= node.height
+
+
+def paginate(flow):
+    paginator = Paginator()
+    for group in flow.groups:
+        paginator.place(group)
+    return Document(paginator.pages, flow.title)
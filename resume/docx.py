@@ -0,0 +1,330 @@
+"""
+Word (.docx) export written directly as OOXML.
+
+The document body is generated as a stream of XML chunks and written
+straight into the zip entry, so there is no HTML step, no office suite and
+no intermediate DOM. Sections and their order mirror the PDF template.
+
+Output is cached under the same content fingerprint as the PDF
+(resume.pdf.resume_fingerprint) plus FORMAT_VERSION, so an unchanged
+resume is built once and a deploy that changes this module rebuilds it.
+"""
+import hashlib
+import io
+import re
+import zipfile
+from itertools import groupby
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils.formats import date_format
+
+from .pdf import (
+    fingerprint_from_versions, get_pdf_cache, get_section_querysets, get_section_versions,
+)
+
+# Part of the cache key and ETag: any edit to this module invalidates cached documents
+FORMAT_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+RELATIONSHIPS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# A4 with 2cm margins, in twentieths of a point
+PAGE_WIDTH, PAGE_HEIGHT, PAGE_MARGIN = 11906, 16838, 1134
+TEXT_WIDTH = PAGE_WIDTH - 2 * PAGE_MARGIN
+
+# Characters XML 1.0 can't carry at all, even escaped
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Fixed timestamp so identical content produces identical bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+CONTENT_TYPES_XML = XML_DECLARATION + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/numbering.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS_XML = XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{RELATIONSHIPS}/officeDocument" Target="word/document.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+    'Target="docProps/core.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS_XML = XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{RELATIONSHIPS}/styles" Target="styles.xml"/>'
+    f'<Relationship Id="rId2" Type="{RELATIONSHIPS}/numbering" Target="numbering.xml"/>'
+    '</Relationships>'
+)
+
+STYLES_XML = XML_DECLARATION + (
+    f'<w:styles xmlns:w="{W_NAMESPACE}">'
+    '<w:docDefaults>'
+    '<w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/>'
+    '<w:sz w:val="20"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="40" w:line="252" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:spacing w:after="0"/><w:jc w:val="center"/></w:pPr>'
+    '<w:rPr><w:b/><w:sz w:val="36"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Subtitle"><w:name w:val="Subtitle"/><w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:jc w:val="center"/></w:pPr><w:rPr><w:color w:val="4B5563"/><w:sz w:val="24"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+    '<w:next w:val="Normal"/>'
+    '<w:pPr><w:keepNext/>'
+    '<w:pBdr><w:bottom w:val="single" w:sz="4" w:space="1" w:color="D1D5DB"/></w:pBdr>'
+    '<w:spacing w:before="200" w:after="80"/><w:outlineLvl w:val="0"/></w:pPr>'
+    '<w:rPr><w:b/><w:caps/><w:color w:val="1F2937"/><w:sz w:val="24"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr><w:spacing w:after="0"/></w:pPr>'
+    '</w:style>'
+    '</w:styles>'
+)
+
+NUMBERING_XML = XML_DECLARATION + (
+    f'<w:numbering xmlns:w="{W_NAMESPACE}">'
+    '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/>'
+    '<w:numFmt w:val="bullet"/><w:lvlText w:val="•"/><w:lvlJc w:val="left"/>'
+    '<w:pPr><w:ind w:left="360" w:hanging="240"/></w:pPr></w:lvl></w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '</w:numbering>'
+)
+
+
+def xml_text(value):
+    return escape(INVALID_XML_CHARS.sub('', str(value)))
+
+
+def core_properties_xml(resume):
+    return XML_DECLARATION + (
+        '<cp:coreProperties '
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f'<dc:title>{xml_text(resume.title or "Resume")}</dc:title>'
+        f'<dc:creator>{xml_text(resume.name)}</dc:creator>'
+        '</cp:coreProperties>'
+    )
+
+
+def run(text, bold=False, italic=False, color=None):
+    properties = ''
+    if bold:
+        properties += '<w:b/>'
+    if italic:
+        properties += '<w:i/>'
+    if color:
+        properties += f'<w:color w:val="{color}"/>'
+    if properties:
+        properties = f'<w:rPr>{properties}</w:rPr>'
+    return f'<w:r>{properties}<w:t xml:space="preserve">{xml_text(text)}</w:t></w:r>'
+
+
+def paragraph(*runs, style=None, aside=None, keep_next=False):
+    """
+    A paragraph of pre-built runs. ``aside`` (usually a date) is pushed to
+    the right margin with a right-aligned tab stop.
+    """
+    properties = ''
+    if style:
+        properties += f'<w:pStyle w:val="{style}"/>'
+    if keep_next:
+        properties += '<w:keepNext/>'
+    if aside:
+        properties += f'<w:tabs><w:tab w:val="right" w:pos="{TEXT_WIDTH}"/></w:tabs>'
+    body = ''.join(runs)
+    if aside:
+        body += '<w:r><w:tab/></w:r>' + run(aside, color='6B7280')
+    return f'<w:p><w:pPr>{properties}</w:pPr>{body}</w:p>'
+
+
+def format_date(value):
+    # Same rendering as {{ value }} in the PDF template
+    return date_format(value) if value else ''
+
+
+def date_range(start, end, current=False):
+    return f'{format_date(start)} - {"Present" if current or not end else format_date(end)}'
+
+
+def iter_header(resume):
+    yield paragraph(run(resume.name or 'Your Name'), style='Title')
+    if resume.professional_title:
+        yield paragraph(run(resume.professional_title), style='Subtitle')
+    contact = [value for value in (resume.email, resume.phone, resume.location) if value]
+    if contact:
+        yield paragraph(run(' | '.join(contact)), style='Subtitle')
+    links = [
+        f'{label}: {url}' for label, url in (
+            ('LinkedIn', resume.linkedin_url), ('GitHub', resume.github_url),
+            ('Website', resume.website_url), ('Twitter', resume.twitter_url),
+        ) if url
+    ]
+    if links:
+        yield paragraph(run('  '.join(links), color='4B5563'), style='Subtitle')
+
+
+def iter_item(title, subtitle=None, aside=None, lines=(), bullets=()):
+    yield paragraph(run(title, bold=True), aside=aside, keep_next=bool(subtitle or lines or bullets))
+    if subtitle:
+        yield paragraph(run(subtitle, italic=True, color='4B5563'))
+    for line in lines:
+        yield paragraph(*line) if isinstance(line, tuple) else paragraph(run(line))
+    for bullet in bullets:
+        yield paragraph(run(bullet), style='ListBullet')
+
+
+def iter_education(rows):
+    for edu in rows:
+        title = edu.degree + (f' in {edu.field_of_study}' if edu.field_of_study else '')
+        lines = []
+        if edu.gpa:
+            lines.append(f'GPA: {edu.gpa}')
+        if edu.description:
+            lines.append(edu.description)
+        yield from iter_item(title, edu.school, date_range(edu.start_date, edu.end_date), lines)
+
+
+def iter_experience(rows):
+    for exp in rows:
+        aside = date_range(exp.start_date, exp.end_date, exp.is_current)
+        if exp.location:
+            aside += f', {exp.location}'
+        yield from iter_item(exp.position, exp.company, aside, bullets=exp.description_bullets)
+
+
+def iter_projects(rows):
+    for project in rows:
+        lines = []
+        if project.description:
+            lines.append(project.description)
+        if project.technologies:
+            lines.append((run('Technologies: ', bold=True), run(project.technologies)))
+        links = []
+        if project.project_url:
+            links += [run('URL: ', bold=True), run(project.project_url + ' ')]
+        if project.github_url:
+            links += [run('GitHub: ', bold=True), run(project.github_url)]
+        if links:
+            lines.append(tuple(links))
+        yield from iter_item(project.name, aside=date_range(project.start_date, project.end_date), lines=lines)
+
+
+def iter_skills(rows):
+    for category, skills in groupby(rows, key=lambda skill: skill.category):
+        names = ', '.join(skill.name for skill in skills)
+        yield paragraph(run(f'{category or "General"}: ', bold=True), run(names))
+
+
+def iter_certifications(rows):
+    for cert in rows:
+        aside = format_date(cert.issue_date)
+        if cert.expiration_date:
+            aside += f' - {format_date(cert.expiration_date)}'
+        lines = []
+        if cert.credential_id:
+            lines.append(f'Credential ID: {cert.credential_id}')
+        if cert.credential_url:
+            lines.append(f'URL: {cert.credential_url}')
+        yield from iter_item(cert.name, cert.issuing_organization, aside, lines)
+
+
+def iter_achievements(rows):
+    for achievement in rows:
+        title = achievement.title + (f' - {achievement.organization}' if achievement.organization else '')
+        lines = [achievement.description] if achievement.description else []
+        yield from iter_item(title, aside=format_date(achievement.date_achieved), lines=lines)
+
+
+SECTIONS = (
+    ('education', 'Education', iter_education),
+    ('experience', 'Professional Experience', iter_experience),
+    ('projects', 'Projects', iter_projects),
+    ('skills', 'Skills', iter_skills),
+    ('certifications', 'Certifications', iter_certifications),
+    ('achievements', 'Achievements', iter_achievements),
+)
+
+
+def iter_document_xml(resume, sections):
+    """Yield word/document.xml in chunks, one paragraph at a time."""
+    yield XML_DECLARATION
+    yield f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>'
+    yield from iter_header(resume)
+    for name, title, iter_rows in SECTIONS:
+        rows = list(sections[name])
+        if rows:
+            yield paragraph(run(title), style='Heading1')
+            yield from iter_rows(rows)
+    yield (
+        f'<w:sectPr><w:pgSz w:w="{PAGE_WIDTH}" w:h="{PAGE_HEIGHT}"/>'
+        f'<w:pgMar w:top="{PAGE_MARGIN}" w:right="{PAGE_MARGIN}" w:bottom="{PAGE_MARGIN}" '
+        f'w:left="{PAGE_MARGIN}" w:header="708" w:footer="708" w:gutter="0"/></w:sectPr>'
+    )
+    yield '</w:body></w:document>'
+
+
+def write_docx(resume, sections, fileobj):
+    """Write the .docx package for ``resume`` to a binary file object."""
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as package:
+        def entry(name):
+            info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            return info
+
+        package.writestr(entry('[Content_Types].xml'), CONTENT_TYPES_XML)
+        package.writestr(entry('_rels/.rels'), PACKAGE_RELS_XML)
+        package.writestr(entry('docProps/core.xml'), core_properties_xml(resume))
+        package.writestr(entry('word/_rels/document.xml.rels'), DOCUMENT_RELS_XML)
+        package.writestr(entry('word/styles.xml'), STYLES_XML)
+        package.writestr(entry('word/numbering.xml'), NUMBERING_XML)
+        with package.open(entry('word/document.xml'), 'w') as document:
+            for chunk in iter_document_xml(resume, sections):
+                document.write(chunk.encode())
+
+
+def render_resume_docx(resume, sections):
+    buffer = io.BytesIO()
+    write_docx(resume, sections, buffer)
+    return buffer.getvalue()
+
+
+def docx_cache_key(fingerprint):
+    return f'resume-docx:{FORMAT_VERSION}:{fingerprint}'
+
+
+def docx_etag(fingerprint):
+    return f'"{fingerprint}-{FORMAT_VERSION}"'
+
+
+def get_or_render_docx(resume):
+    """Return (docx_bytes, fingerprint), building only on a cache miss."""
+    fingerprint = fingerprint_from_versions(get_section_versions(resume))
+    cache = get_pdf_cache()
+    docx = cache.get(docx_cache_key(fingerprint))
+    if docx is None:
+        docx = render_resume_docx(resume, get_section_querysets(resume))
+        cache.set(docx_cache_key(fingerprint), docx, getattr(settings, 'PDF_CACHE_TIMEOUT', 86400))
+    return docx, fingerprint
+
+
+def docx_filename(resume):
+    title = resume.title.replace(' ', '_') if resume.title else 'resume'
+    return f"resume_{title}_{resume.id}.docx"
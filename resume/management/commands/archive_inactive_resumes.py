@@ -0,0 +1,48 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.archive import CODECS, archive_resumes, get_archive_settings, inactive_resumes, resolve_codec
+
+
+class Command(BaseCommand):
+    help = (
+        'Move the sections of resumes not updated for --days into compressed '
+        'archive rows, a batch of resumes per transaction. Archived resumes '
+        'are restored automatically the next time they are read or edited.'
+    )
+
+    def add_arguments(self, parser):
+        options = get_archive_settings()
+        parser.add_argument('--days', type=int, default=options['INACTIVE_DAYS'],
+                            help='Archive resumes inactive for at least this many days')
+        parser.add_argument('--codec', choices=CODECS, default=options['CODEC'])
+        parser.add_argument('--batch-size', type=int, default=100, help='Resumes per transaction')
+        parser.add_argument('--limit', type=int, default=None, help='Archive at most this many resumes')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the resumes that would be archived')
+
+    def handle(self, *args, **options):
+        try:
+            codec = resolve_codec(options['codec'])
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+        resume_ids = list(inactive_resumes(options['days']).values_list('pk', flat=True)[:options['limit']])
+        if options['dry_run']:
+            self.stdout.write(f'{len(resume_ids)} resumes would be archived')
+            return
+
+        totals = [0, 0, 0, 0]
+        started = time.perf_counter()
+        for first in range(0, len(resume_ids), options['batch_size']):
+            batch = archive_resumes(resume_ids[first:first + options['batch_size']], codec)
+            totals = [total + value for total, value in zip(totals, batch)]
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{first + batch[0]}/{len(resume_ids)} resumes')
+
+        resumes, rows, raw_size, stored_size = totals
+        ratio = f', {raw_size / stored_size:.1f}x smaller' if stored_size else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {resumes} resumes ({rows} rows, {raw_size} bytes stored as {stored_size} '
+            f'with {codec}{ratio}) in {time.perf_counter() - started:.1f}s'
+        ))
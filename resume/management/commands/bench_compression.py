@@ -0,0 +1,147 @@
+import json
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from resume_builder.middleware import brotli, compress_body, get_compression_settings
+
+WORDS = (
+    'designed built led migrated optimized scalable platform api team customers '
+    'latency reduced improved python django react postgres caching pipeline '
+    'deployed monitoring reliability mentored features delivered roadmap '
+    'performance services integration testing automation cloud infrastructure'
+).split()
+
+
+def _sentence(rng, low=8, high=22):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + '.'
+
+
+def _timestamp(rng):
+    moment = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randint(0, 10**7))
+    return moment.isoformat().replace('+00:00', 'Z')
+
+
+def build_resume_payload(rng, resume_id):
+    """Build a full resume as the API returns it: header plus every section list."""
+    def dates():
+        start = date(2010, 1, 1) + timedelta(days=rng.randint(0, 4000))
+        return start.isoformat(), (start + timedelta(days=rng.randint(100, 1500))).isoformat()
+
+    def section(count, build):
+        items = []
+        for index in range(count):
+            start, end = dates()
+            item = {'id': resume_id * 100 + index, 'resume': resume_id}
+            item.update(build(start, end))
+            item.update({'created_at': _timestamp(rng), 'updated_at': _timestamp(rng)})
+            items.append(item)
+        return items
+
+    return {
+        'id': resume_id,
+        'title': 'Senior Software Engineer',
+        'user': 'user%d' % resume_id,
+        'uuid': '%032x' % rng.getrandbits(128),
+        'name': 'Jordan Example',
+        'professional_title': 'Backend Engineer',
+        'phone': '+1 555 010 %04d' % rng.randint(0, 9999),
+        'email': 'jordan%d@example.com' % resume_id,
+        'location': 'Berlin, Germany',
+        'linkedin_url': 'https://www.linkedin.com/in/jordan-example',
+        'github_url': 'https://github.com/jordan-example',
+        'website_url': '',
+        'twitter_url': '',
+        'created_at': _timestamp(rng),
+        'updated_at': _timestamp(rng),
+        'education': section(rng.randint(1, 3), lambda start, end: {
+            'school': 'Technical University', 'degree': 'Bachelor of Science',
+            'field_of_study': 'Computer Science', 'start_date': start, 'end_date': end,
+            'gpa': '3.70', 'description': _sentence(rng),
+        }),
+        'experience': section(rng.randint(2, 6), lambda start, end: {
+            'company': 'Example Corp', 'position': 'Software Engineer', 'location': 'Remote',
+            'start_date': start, 'end_date': end, 'is_current': False,
+            'description': '\n'.join(_sentence(rng) for _ in range(rng.randint(3, 7))),
+        }),
+        'projects': section(rng.randint(1, 5), lambda start, end: {
+            'name': 'Project %d' % rng.randint(1, 99), 'description': _sentence(rng, 15, 40),
+            'technologies': 'Python, Django, React, PostgreSQL', 'start_date': start,
+            'end_date': end, 'project_url': '', 'github_url': 'https://github.com/example/project',
+        }),
+        'skills': section(rng.randint(8, 25), lambda start, end: {
+            'name': rng.choice(WORDS).title(), 'category': rng.choice(['Languages', 'Tools', 'Cloud']),
+            'level': rng.choice(['beginner', 'intermediate', 'advanced', 'expert']),
+            'years_of_experience': rng.randint(1, 10),
+        }),
+        'certifications': section(rng.randint(0, 3), lambda start, end: {
+            'name': 'Certified Cloud Practitioner', 'issuing_organization': 'Cloud Vendor',
+            'issue_date': start, 'expiration_date': end, 'credential_id': 'ABC-%d' % rng.randint(1000, 9999),
+            'credential_url': '',
+        }),
+        'achievements': section(rng.randint(0, 4), lambda start, end: {
+            'title': 'Engineering Excellence Award', 'description': _sentence(rng),
+            'date_achieved': start, 'organization': 'Example Corp',
+        }),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark gzip/brotli compression of representative resume API payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Compressions per measurement')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        renderer = JSONRenderer()
+        single = build_resume_payload(rng, 1)
+        payloads = {
+            'resume_detail': renderer.render({k: v for k, v in single.items() if not isinstance(v, list)}),
+            'full_resume': renderer.render(single),
+            'skills_list': renderer.render(single['skills']),
+            'resume_list_50': renderer.render([build_resume_payload(rng, i) for i in range(50)]),
+        }
+
+        configured = get_compression_settings()
+        codecs = [('gzip', level, dict(configured, GZIP_LEVEL=level)) for level in (1, 6, 9)]
+        if brotli is not None:
+            codecs += [('br', quality, dict(configured, BROTLI_QUALITY=quality)) for quality in (1, 5, 11)]
+        else:
+            self.stderr.write('brotli is not installed; only gzip is measured.')
+
+        results = []
+        for name, payload in payloads.items():
+            for encoding, level, codec_options in codecs:
+                iterations = options['iterations'] if level < 9 else max(1, options['iterations'] // 10)
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    compressed = compress_body(payload, encoding, codec_options)
+                elapsed = time.perf_counter() - started
+                results.append({
+                    'payload': name,
+                    'encoding': encoding,
+                    'level': level,
+                    'original_bytes': len(payload),
+                    'compressed_bytes': len(compressed),
+                    'saved_pct': round(100.0 * (1 - len(compressed) / len(payload)), 1),
+                    'cpu_ms': round(elapsed / iterations * 1000, 3),
+                    'mb_per_s': round(len(payload) * iterations / elapsed / 1e6, 1),
+                })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'payload':<16}{'codec':<8}{'bytes':>10}{'->':>4}{'bytes':>10}{'saved':>8}{'ms/op':>10}{'MB/s':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['payload']:<16}{row['encoding'] + '-' + str(row['level']):<8}"
+                f"{row['original_bytes']:>10}{'':>4}{row['compressed_bytes']:>10}"
+                f"{row['saved_pct']:>7}%{row['cpu_ms']:>10}{row['mb_per_s']:>9}"
+            )
@@ -0,0 +1,196 @@
+import asyncio
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from resume.models import Resume, Experience, Skill
+from resume_builder.benchmarking import percentile, throwaway_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare WSGI and ASGI read throughput while slow clients hold '
+        'connections open. WSGI is modelled as a fixed pool of sync workers; '
+        'ASGI runs every client on one event loop with the native async views.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode')
+        parser.add_argument('--workers', type=int, default=4, help='WSGI worker threads')
+        parser.add_argument('--fast-clients', type=int, default=16)
+        parser.add_argument('--slow-clients', type=int, default=8)
+        parser.add_argument('--slow-seconds', type=float, default=2.0,
+                            help='How long a slow client takes to read each response')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Request path (repeatable); defaults to resume and skill lists')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            token, resume_id = self.create_fixture()
+            paths = options['paths'] or ['/api/resumes/', f'/api/skills/?resume={resume_id}']
+            results = [
+                self.run_wsgi(options, paths, token),
+                self.run_asgi(options, paths, token),
+            ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:<5} fast req/s={row['throughput_rps']:<8} "
+                f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms p99={row['p99_ms']}ms "
+                f"requests={row['requests']} errors={row['errors']} slow_served={row['slow_served']}"
+            )
+
+    def create_fixture(self):
+        user = User.objects.create_user(username='bench', password='bench-password-123')
+        resume = Resume.objects.create(title='Benchmark Resume', user=user, name='Bench User')
+        Skill.objects.bulk_create([
+            Skill(resume=resume, name=f'Skill {index}', category='Tools') for index in range(25)
+        ])
+        Experience.objects.bulk_create([
+            Experience(resume=resume, company=f'Company {index}', position='Engineer',
+                       start_date=date(2015 + index, 1, 1), description='Built things.\nShipped things.')
+            for index in range(5)
+        ])
+        return str(RefreshToken.for_user(user).access_token), resume.id
+
+    def summarize(self, mode, latencies, errors, slow_served, elapsed):
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'mode': mode,
+            'requests': len(latencies),
+            'errors': errors,
+            'slow_served': slow_served,
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': ms(percentile(latencies, 50)),
+            'p95_ms': ms(percentile(latencies, 95)),
+            'p99_ms': ms(percentile(latencies, 99)),
+        }
+
+    def run_wsgi(self, options, paths, token):
+        application = WSGIHandler()
+        pool = ThreadPoolExecutor(max_workers=options['workers'])
+        deadline = time.monotonic() + options['duration']
+        lock = threading.Lock()
+        latencies, counters = [], {'errors': 0, 'slow': 0}
+
+        def serve(path, slow):
+            path_info, _, query = path.partition('?')
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path_info, 'QUERY_STRING': query,
+                'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+                'SERVER_PROTOCOL': 'HTTP/1.1', 'REMOTE_ADDR': '127.0.0.1',
+                'HTTP_AUTHORIZATION': f'Bearer {token}',
+                'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+                'wsgi.url_scheme': 'http', 'wsgi.version': (1, 0),
+                'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+            }
+            statuses = []
+            body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+            for _ in body:
+                if slow:
+                    # A sync worker stays occupied while the client drains the socket
+                    time.sleep(options['slow_seconds'])
+            body.close()
+            return statuses[0].startswith('200')
+
+        def client(slow, index):
+            while time.monotonic() < deadline:
+                path = paths[index % len(paths)]
+                started = time.perf_counter()
+                ok = pool.submit(serve, path, slow).result()
+                with lock:
+                    if slow:
+                        counters['slow'] += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+                    if not ok:
+                        counters['errors'] += 1
+                index += 1
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(True, i)) for i in range(options['slow_clients'])]
+        threads += [threading.Thread(target=client, args=(False, i)) for i in range(options['fast_clients'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.shutdown()
+        connections.close_all()
+        return self.summarize('wsgi', latencies, counters['errors'], counters['slow'],
+                              time.monotonic() - started)
+
+    def run_asgi(self, options, paths, token):
+        with override_settings(ROOT_URLCONF='resume_builder.asgi_urls'):
+            return asyncio.run(self.asgi_clients(options, paths, token))
+
+    async def asgi_clients(self, options, paths, token):
+        application = ASGIHandler()
+        deadline = time.monotonic() + options['duration']
+        latencies, counters = [], {'errors': 0, 'slow': 0}
+
+        async def request(path, slow):
+            path_info, _, query = path.partition('?')
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path_info,
+                'raw_path': path_info.encode(), 'query_string': query.encode(), 'root_path': '',
+                'headers': [(b'host', b'localhost'), (b'authorization', f'Bearer {token}'.encode())],
+                'client': ('127.0.0.1', 40000), 'server': ('localhost', 80),
+            }
+            received = False
+            statuses = []
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # Stay connected until the handler stops listening for a disconnect
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif slow:
+                    # Only this connection waits on the slow reader
+                    await asyncio.sleep(options['slow_seconds'])
+
+            await application(scope, receive, send)
+            return statuses[0] == 200
+
+        async def client(slow, index):
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                ok = await request(paths[index % len(paths)], slow)
+                if slow:
+                    counters['slow'] += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+                if not ok:
+                    counters['errors'] += 1
+                index += 1
+
+        started = time.monotonic()
+        await asyncio.gather(
+            *[client(True, i) for i in range(options['slow_clients'])],
+            *[client(False, i) for i in range(options['fast_clients'])],
+        )
+        return self.summarize('asgi', latencies, counters['errors'], counters['slow'],
+                              time.monotonic() - started)
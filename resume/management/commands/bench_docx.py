@@ -0,0 +1,67 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume.docx import render_resume_docx
+from resume.management.sample_data import build_sample_resume
+from resume.pdf import render_resume_pdf
+from resume_builder.benchmarking import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare building a resume as .docx (streamed OOXML) with rendering '
+        'it as a PDF through WeasyPrint, both without cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--pdf-iterations', type=int, default=5,
+                            help='PDF renders are slow; time fewer of them')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        resume, sections = build_sample_resume(random.Random(options['seed']))
+        results = [
+            self.measure('docx', lambda: render_resume_docx(resume, sections), options['iterations']),
+            self.measure('pdf', lambda: render_resume_pdf(resume, sections), options['pdf_iterations']),
+        ]
+        docx, pdf = results
+        if docx['p50_ms'] and pdf.get('p50_ms'):
+            docx['speedup_vs_pdf'] = round(pdf['p50_ms'] / docx['p50_ms'], 1)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            if 'error' in row:
+                self.stdout.write(f"{row['format']:<5} unavailable: {row['error']}")
+                continue
+            line = (
+                f"{row['format']:<5} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+                f"bytes={row['bytes']}"
+            )
+            if 'speedup_vs_pdf' in row:
+                line += f" ({row['speedup_vs_pdf']}x faster than pdf)"
+            self.stdout.write(line)
+
+    def measure(self, name, build, iterations):
+        samples, output = [], b''
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                output = build()
+            except OSError as e:
+                # WeasyPrint's native libraries (pango) aren't installed
+                return {'format': name, 'error': str(e)}
+            samples.append(time.perf_counter() - started)
+        return {
+            'format': name,
+            'iterations': iterations,
+            'bytes': len(output),
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        }
@@ -0,0 +1,100 @@
+import json
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from resume.models import Experience, Resume, Skill, split_bullets
+from resume.serializers import ExperienceSerializer, SkillSerializer
+from resume.values_serializers import get_values_serializer
+from resume_builder.benchmarking import percentile, throwaway_database
+
+MODELS = {'skills': (Skill, SkillSerializer), 'experience': (Experience, ExperienceSerializer)}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare list serialization through the DRF serializers with the '
+        'values_list() fast path (resume.values_serializers), from query to '
+        'rendered JSON, on a throwaway database. Checks both give the same bytes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000,100000', help='Comma-separated row counts')
+        parser.add_argument('--budget', type=float, default=2.0,
+                            help='Seconds to spend timing each path at each size (at least 3 runs)')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers')
+
+        results = []
+        with throwaway_database():
+            user = User.objects.create_user(username='bench', password='bench-password-123')
+            resumes = {size: self.create_resume(user, size) for size in sizes}
+            renderer = JSONRenderer()
+            for name, (model, serializer_class) in MODELS.items():
+                values_serializer = get_values_serializer(serializer_class)
+                for size in sizes:
+                    def rows():
+                        # A fresh queryset per run, so both paths pay for their query
+                        return model.objects.filter(resume=resumes[size])
+
+                    paths = {
+                        'serializer': lambda: renderer.render(serializer_class(rows(), many=True).data),
+                        'values': lambda: renderer.render(
+                            values_serializer.serialize(values_serializer.values(rows()))),
+                    }
+                    outputs = {path: render() for path, render in paths.items()}
+                    if outputs['serializer'] != outputs['values']:
+                        raise CommandError(f'{name} at {size} rows: the fast path output differs')
+                    row = {'endpoint': name, 'rows': size, 'bytes': len(outputs['values'])}
+                    for path, render in paths.items():
+                        row[path] = self.time(render, options['budget'])
+                    row['speedup'] = round(row['serializer']['p50_ms'] / row['values']['p50_ms'], 1)
+                    results.append(row)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'endpoint':<12}{'rows':>8}{'bytes':>12}{'serializer p50':>16}{'values p50':>12}{'speedup':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:<12}{row['rows']:>8}{row['bytes']:>12}"
+                f"{row['serializer']['p50_ms']:>14}ms{row['values']['p50_ms']:>10}ms{row['speedup']:>8}x"
+            )
+
+    def create_resume(self, user, rows):
+        """A resume with ``rows`` skills and as many experience entries."""
+        resume = Resume.objects.create(title=f'Benchmark Resume ({rows} rows)', user=user, name='Bench User')
+        description = 'Designed the billing service.\nCut p95 latency by 40%.\nMentored two engineers.'
+        Skill.objects.bulk_create([
+            Skill(resume=resume, name=f'Skill {index}', category='Tools', years_of_experience=index % 10)
+            for index in range(rows)
+        ], batch_size=1000)
+        Experience.objects.bulk_create([
+            # bulk_create skips save(), which normally fills in the bullets
+            Experience(resume=resume, company=f'Company {index}', position='Engineer', location='Remote',
+                       start_date=date(2000 + index % 20, 1, 1), description=description,
+                       description_bullets=split_bullets(description))
+            for index in range(rows)
+        ], batch_size=1000)
+        return resume
+
+    def time(self, func, budget):
+        samples = []
+        deadline = time.perf_counter() + budget
+        while len(samples) < 3 or time.perf_counter() < deadline:
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+        return {
+            'runs': len(samples),
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        }
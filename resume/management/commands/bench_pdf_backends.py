@@ -0,0 +1,90 @@
+import json
+import random
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from resume.management.sample_data import build_sample_resume
+from resume.pdf import get_pdf_backend
+from resume.themes import get_theme
+from resume_builder.benchmarking import percentile
+
+IMPORT_SCRIPT = 'import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the built-in PDF backend with WeasyPrint on the classic '
+        'theme: render time without cache, output size and page count, plus '
+        'the cold import time each adds to a worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--weasyprint-iterations', type=int, default=5,
+                            help='WeasyPrint renders are slow; time fewer of them')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        resume, sections = build_sample_resume(random.Random(options['seed']))
+        theme = get_theme('classic')
+        results = [
+            self.measure('builtin', resume, sections, theme, options['iterations'], 'resume.builtin_pdf'),
+            self.measure('weasyprint', resume, sections, theme, options['weasyprint_iterations'], 'weasyprint'),
+        ]
+        builtin, weasyprint = results
+        if builtin.get('p50_ms') and weasyprint.get('p50_ms'):
+            builtin['speedup_vs_weasyprint'] = round(weasyprint['p50_ms'] / builtin['p50_ms'], 1)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            if 'error' in row:
+                self.stdout.write(f"{row['backend']:<10} unavailable: {row['error']}")
+                continue
+            line = (
+                f"{row['backend']:<10} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+                f"pages={row['pages']} bytes={row['bytes']} import={row['import_ms']}ms"
+            )
+            if 'speedup_vs_weasyprint' in row:
+                line += f" ({row['speedup_vs_weasyprint']}x faster)"
+            self.stdout.write(line)
+
+    def measure(self, name, resume, sections, theme, iterations, module):
+        backend = get_pdf_backend(name)
+        samples, output, pages = [], b'', 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                document = backend.layout(backend.prepare(resume, sections), theme)
+                output = document.write_pdf()
+            except OSError as e:
+                # WeasyPrint's native libraries (pango) aren't installed
+                return {'backend': name, 'error': str(e)}
+            samples.append(time.perf_counter() - started)
+            pages = len(document.pages)
+        return {
+            'backend': name,
+            'iterations': iterations,
+            'pages': pages,
+            'bytes': len(output),
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 95) * 1000, 3),
+            'import_ms': self.import_time(module),
+        }
+
+    def import_time(self, module):
+        """Cold import time of ``module`` in a fresh interpreter."""
+        result = subprocess.run(
+            [sys.executable, '-c', 'import django; django.setup(); ' + IMPORT_SCRIPT.format(module=module)],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        try:
+            return round(float(result.stdout.strip()) * 1000, 1)
+        except ValueError:
+            return None
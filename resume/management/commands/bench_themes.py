@@ -0,0 +1,87 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.utils.safestring import mark_safe
+
+from resume.management.sample_data import build_sample_resume
+from resume.pdf import render_resume_html, write_pdf
+from resume.themes import FRAGMENT_NAMES, get_themes
+from resume_builder.benchmarking import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Render a sample resume with every registered theme, comparing the '
+        'per-request cost of compiling the template and parsing the stylesheet '
+        'against the theme\'s cached artifacts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--pdf', action='store_true',
+                            help='Also time full PDF output (layout and write) with the cached stylesheet')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        from weasyprint import CSS
+
+        resume, sections = build_sample_resume(random.Random(options['seed']))
+        results = []
+        for theme in get_themes():
+            resume.theme = theme.name
+
+            def uncached():
+                # What every request paid before themes cached their artifacts
+                engine = engines['django']
+                fragments = {
+                    name: mark_safe(engine.from_string(theme.section_template(name).template.source)
+                                    .render(dict(sections, resume=resume)))
+                    for name in FRAGMENT_NAMES
+                }
+                engine.from_string(theme.template.template.source).render({'resume': resume, 'fragments': fragments})
+                CSS(string=theme.stylesheet_source)
+
+            def cached():
+                render_resume_html(resume, sections)
+                theme.stylesheet
+
+            started = time.perf_counter()
+            theme.warm()
+            row = {
+                'theme': theme.name,
+                'version': theme.version,
+                'warm_up_ms': round((time.perf_counter() - started) * 1000, 2),
+                'uncached': self.time(uncached, options['iterations']),
+                'cached': self.time(cached, options['iterations']),
+            }
+            if options['pdf']:
+                html_string = render_resume_html(resume, sections)
+                row['pdf'] = self.time(lambda: write_pdf(html_string, theme), max(1, options['iterations'] // 10))
+            results.append(row)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            line = (
+                f"{row['theme']:<10} warm-up={row['warm_up_ms']}ms "
+                f"uncached p50={row['uncached']['p50_ms']}ms cached p50={row['cached']['p50_ms']}ms"
+            )
+            if 'pdf' in row:
+                line += f" pdf p50={row['pdf']['p50_ms']}ms"
+            self.stdout.write(line)
+
+    def time(self, func, iterations):
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+        return {
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        }
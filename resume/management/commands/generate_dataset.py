@@ -0,0 +1,215 @@
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from resume.models import (
+    Resume, Education, Experience, Project, Skill, Certification, Achievement, split_bullets,
+)
+from resume.themes import get_themes
+
+WORDS = (
+    'built designed led migrated shipped reduced improved automated scaled owned '
+    'api service pipeline dashboard platform cache queue database schema frontend '
+    'backend latency throughput cost reliability onboarding release tooling tests '
+    'team customers partners stakeholders users engineers across multiple regions '
+    'using python django react postgres redis kubernetes terraform aws gcp kafka'
+).split()
+COMPANIES = ('Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne')
+SCHOOLS = ('State University', 'Institute of Technology', 'City College', 'Polytechnic', 'Technical University')
+DEGREES = ('BSc', 'BA', 'BEng', 'MSc', 'MBA', 'PhD')
+FIELDS = ('Computer Science', 'Mathematics', 'Physics', 'Economics', 'Design', '')
+POSITIONS = ('Software Engineer', 'Senior Engineer', 'Staff Engineer', 'Data Analyst', 'Product Manager', 'Designer')
+LOCATIONS = ('Remote', 'Berlin, Germany', 'Austin, TX', 'Bangalore, India', 'London, UK', '')
+SKILL_CATEGORIES = ('Languages', 'Frameworks', 'Tools', 'Cloud', 'Soft Skills')
+SKILL_NAMES = tuple(f'{word.title()} {n}' for word in WORDS for n in range(1, 4))
+SKILL_LEVELS = [level for level, _ in Skill.SKILL_LEVELS]
+VENDORS = ('AWS', 'Google', 'Microsoft', 'Linux Foundation', 'Oracle', 'Scrum Alliance')
+
+# Rows per resume, as (values, weights); skewed like real resumes, with a long tail
+SECTION_COUNTS = {
+    'education': ((0, 1, 2, 3), (5, 60, 30, 5)),
+    'experience': (tuple(range(11)), (3, 8, 14, 16, 15, 12, 10, 8, 6, 4, 4)),
+    'projects': (tuple(range(9)), (20, 18, 17, 14, 11, 8, 6, 4, 2)),
+    'certifications': (tuple(range(7)), (45, 20, 14, 9, 6, 4, 2)),
+    'achievements': (tuple(range(6)), (40, 25, 15, 10, 6, 4)),
+}
+
+
+class DatasetBuilder:
+    """Builds unsaved model instances from a single seeded RNG."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.themes = sorted(theme.name for theme in get_themes())
+
+    def count(self, section):
+        values, weights = SECTION_COUNTS[section]
+        return self.rng.choices(values, weights)[0]
+
+    def sentence(self):
+        # Log-normal word counts: mostly one-liners, a few paragraphs
+        length = min(60, max(3, int(self.rng.lognormvariate(2.4, 0.5))))
+        return ' '.join(self.rng.choices(WORDS, k=length)).capitalize() + '.'
+
+    def description(self, max_bullets):
+        bullets = [self.sentence() for _ in range(self.rng.randint(1, max_bullets))]
+        marker = self.rng.choice(('', '- ', '• '))
+        return '\n'.join(marker + bullet for bullet in bullets)
+
+    def day(self, start_year, end_year):
+        start = date(start_year, 1, 1)
+        return start + timedelta(days=self.rng.randrange((date(end_year, 1, 1) - start).days))
+
+    def end_after(self, start, open_probability=0.0):
+        if self.rng.random() < open_probability:
+            return None
+        return start + timedelta(days=self.rng.randint(60, 2000))
+
+    def user(self, username, password):
+        return User(username=username, email=f'{username}@example.com', password=password)
+
+    def resume(self, user, index):
+        rng = self.rng
+        return Resume(
+            user=user, uuid=uuid.UUID(int=rng.getrandbits(128), version=4),
+            title=f'{rng.choice(POSITIONS)} Resume {index + 1}',
+            name=f'{user.username.title()} Example', professional_title=rng.choice(POSITIONS),
+            email=user.email, phone=f'555-{rng.randint(0, 9999):04d}', location=rng.choice(LOCATIONS),
+            linkedin_url=f'https://linkedin.com/in/{user.username}' if rng.random() < 0.7 else '',
+            github_url=f'https://github.com/{user.username}' if rng.random() < 0.5 else '',
+            theme=rng.choice(self.themes),
+        )
+
+    def education(self, resume):
+        for _ in range(self.count('education')):
+            start = self.day(1995, 2022)
+            yield Education(
+                resume=resume, school=f'{self.rng.choice(COMPANIES)} {self.rng.choice(SCHOOLS)}',
+                degree=self.rng.choice(DEGREES), field_of_study=self.rng.choice(FIELDS),
+                start_date=start, end_date=self.end_after(start, 0.1),
+                description=self.description(3) if self.rng.random() < 0.3 else '',
+            )
+
+    def experience(self, resume):
+        for _ in range(self.count('experience')):
+            start = self.day(2000, 2025)
+            end = self.end_after(start, 0.15)
+            yield Experience(
+                resume=resume, company=f'{self.rng.choice(COMPANIES)} {self.rng.choice(("Inc", "Labs", "GmbH", "Ltd"))}',
+                position=self.rng.choice(POSITIONS), location=self.rng.choice(LOCATIONS),
+                start_date=start, end_date=end, is_current=end is None,
+                description=self.description(8),
+            )
+
+    def projects(self, resume):
+        for index in range(self.count('projects')):
+            start = self.day(2010, 2025)
+            yield Project(
+                resume=resume, name=f'{self.rng.choice(WORDS).title()} {index + 1}',
+                description=self.description(4),
+                technologies=', '.join(self.rng.sample(WORDS[-12:], self.rng.randint(1, 5))),
+                start_date=start, end_date=self.end_after(start, 0.3),
+                github_url=f'https://github.com/example/project-{index}' if self.rng.random() < 0.5 else '',
+            )
+
+    def skills(self, resume):
+        # Names are unique per resume
+        count = int(self.rng.triangular(3, 40, 12))
+        for name in self.rng.sample(SKILL_NAMES, count):
+            yield Skill(
+                resume=resume, name=name, category=self.rng.choice(SKILL_CATEGORIES),
+                level=self.rng.choice(SKILL_LEVELS), years_of_experience=self.rng.randint(0, 15),
+            )
+
+    def certifications(self, resume):
+        for index in range(self.count('certifications')):
+            issued = self.day(2012, 2025)
+            yield Certification(
+                resume=resume, name=f'Certified {self.rng.choice(WORDS).title()} {index + 1}',
+                issuing_organization=self.rng.choice(VENDORS), issue_date=issued,
+                expiration_date=self.end_after(issued, 0.5),
+                credential_id=f'{self.rng.getrandbits(40):010X}',
+            )
+
+    def achievements(self, resume):
+        for index in range(self.count('achievements')):
+            yield Achievement(
+                resume=resume, title=f'{self.rng.choice(WORDS).title()} Award {index + 1}',
+                description=self.description(2), organization=self.rng.choice(COMPANIES + ('',)),
+                date_achieved=self.day(2005, 2025),
+            )
+
+
+SECTIONS = (
+    (Education, 'education'),
+    (Experience, 'experience'),
+    (Project, 'projects'),
+    (Skill, 'skills'),
+    (Certification, 'certifications'),
+    (Achievement, 'achievements'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-create a synthetic dataset for scale testing: N users with M '
+        'resumes each and realistically distributed section rows. Output is '
+        'deterministic for a given seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--resumes', type=int, default=2, help='Resumes per user')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--prefix', default='gen', help='Username prefix; must not already be in use')
+        parser.add_argument('--password', default='dataset-password',
+                            help='Password of every generated user (hashed once)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT')
+
+    def handle(self, *args, **options):
+        prefix, batch_size = options['prefix'], options['batch_size']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users starting with "{prefix}" already exist; pass another --prefix')
+
+        builder = DatasetBuilder(random.Random(options['seed']))
+        password = make_password(options['password'])
+        counts = dict.fromkeys(['users', 'resumes'] + [name for _, name in SECTIONS], 0)
+        # Enough users per transaction that each resume INSERT fills a batch
+        chunk = max(1, batch_size // max(1, options['resumes']))
+        width = len(str(options['users'] - 1))
+        started = time.perf_counter()
+
+        for first in range(0, options['users'], chunk):
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    builder.user(f'{prefix}{index:0{width}d}', password)
+                    for index in range(first, min(first + chunk, options['users']))
+                ], batch_size=batch_size)
+                resumes = Resume.objects.bulk_create([
+                    builder.resume(user, index) for user in users for index in range(options['resumes'])
+                ], batch_size=batch_size)
+                counts['users'] += len(users)
+                counts['resumes'] += len(resumes)
+                for model, name in SECTIONS:
+                    rows = [row for resume in resumes for row in getattr(builder, name)(resume)]
+                    for row in rows:
+                        if hasattr(row, 'description_bullets'):
+                            # bulk_create skips save(), which normally fills these in
+                            row.description_bullets = split_bullets(row.description)
+                    model.objects.bulk_create(rows, batch_size=batch_size)
+                    counts[name] += len(rows)
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{counts['users']}/{options['users']} users")
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in counts.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
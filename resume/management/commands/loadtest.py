@@ -0,0 +1,311 @@
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time
+from datetime import date
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+
+from resume.models import Resume, Experience, Skill
+from resume_builder.benchmarking import percentile, throwaway_database
+from user.views import ThrottledTokenObtainPairView
+
+DEFAULT_MIX = 'login=1,list=6,crud=2,pdf=1'
+OPERATIONS = ('login', 'list', 'crud', 'pdf')
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def parse_mix(value):
+    """Parse 'login=1,list=6' into {'login': 1.0, 'list': 6.0}."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in OPERATIONS:
+            raise CommandError(f'Unknown operation "{name}" in --mix; choose from {", ".join(OPERATIONS)}')
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise CommandError(f'Invalid weight for "{name}" in --mix')
+    if not any(mix.values()):
+        raise CommandError('--mix needs at least one operation with a positive weight')
+    return mix
+
+
+def histogram(latencies):
+    counts = {f'<={bound}': 0 for bound in HISTOGRAM_BOUNDS_MS}
+    counts[f'>{HISTOGRAM_BOUNDS_MS[-1]}'] = 0
+    for latency in latencies:
+        ms = latency * 1000
+        for bound in HISTOGRAM_BOUNDS_MS:
+            if ms <= bound:
+                counts[f'<={bound}'] += 1
+                break
+        else:
+            counts[f'>{HISTOGRAM_BOUNDS_MS[-1]}'] += 1
+    return counts
+
+
+def summarize(samples, elapsed):
+    """Summarise (latency, ok, status) samples for one operation or overall."""
+    latencies = [latency for latency, _, _ in samples]
+    errors = sum(1 for _, ok, _ in samples if not ok)
+    statuses = {}
+    for _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    def ms(pct):
+        value = percentile(latencies, pct)
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': ms(50),
+        'p95_ms': ms(95),
+        'p99_ms': ms(99),
+        'status_counts': statuses,
+        'histogram_ms': histogram(latencies),
+    }
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadClient:
+    """One simulated user: a keep-alive HTTP connection plus a JWT."""
+
+    def __init__(self, base_url, username, password, rng, record):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.username, self.password = username, password
+        self.rng = rng
+        self.record = record
+        self.connection = None
+        self.token = None
+        self.resume_id = None
+
+    def request(self, method, path, body=None, auth=True):
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if auth and self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body).encode() if body is not None else None
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                # Server closed the keep-alive connection; retry once on a new one
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+    def timed(self, name, method, path, body=None, expect=(200,), auth=True):
+        started = time.perf_counter()
+        try:
+            status, content = self.request(method, path, body, auth)
+        except (http.client.HTTPException, OSError):
+            status, content = 'connection_error', b''
+        self.record(name, time.perf_counter() - started, status in expect, status)
+        if status == 401 and auth:
+            self.token = None  # expired access token; log in again next time
+        return status, content
+
+    def login(self):
+        status, content = self.timed(
+            'login', 'POST', '/api/auth/token/',
+            {'username': self.username, 'password': self.password}, auth=False,
+        )
+        if status == 200:
+            self.token = json.loads(content)['access']
+
+    def ensure_session(self):
+        if self.token is None:
+            self.login()
+        if self.token and self.resume_id is None:
+            status, content = self.request('GET', '/api/resumes/')
+            if status == 200 and json.loads(content):
+                self.resume_id = json.loads(content)[0]['id']
+        return self.token is not None and self.resume_id is not None
+
+    def run(self, operation):
+        if operation == 'login':
+            return self.login()
+        if not self.ensure_session():
+            return
+        if operation == 'list':
+            self.timed('list', 'GET', '/api/resumes/')
+        elif operation == 'pdf':
+            self.timed('pdf', 'GET', f'/api/resumes/{self.resume_id}/download-pdf/')
+        elif operation == 'crud':
+            status, content = self.timed('section_create', 'POST', '/api/experience/', {
+                'resume': self.resume_id, 'company': f'Load Co {self.rng.randint(1, 10 ** 6)}',
+                'position': 'Engineer', 'start_date': '2020-01-01',
+                'description': 'Built things\nShipped things',
+            }, expect=(201,))
+            if status != 201:
+                return
+            experience_id = json.loads(content)['id']
+            self.timed('section_update', 'PATCH', f'/api/experience/{experience_id}/',
+                       {'position': 'Senior Engineer'})
+            self.timed('section_delete', 'DELETE', f'/api/experience/{experience_id}/', expect=(204,))
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive a mix of login, resume list, section CRUD and PDF download '
+        'requests with N concurrent clients and report latency percentiles, '
+        'histograms, throughput and error rates. Without --url the app is '
+        'served in-process on 127.0.0.1 against a throwaway database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running local server, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--username', help='Account to log in as with --url (every client shares it)')
+        parser.add_argument('--password')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+        parser.add_argument('--mix', default=DEFAULT_MIX,
+                            help=f'Weighted operation mix (default "{DEFAULT_MIX}")')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--keep-throttles', action='store_true',
+                            help='In-process only: keep login throttling, which rejects most load-test logins')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        if options['url']:
+            if not (options['username'] and options['password']):
+                raise CommandError('--url needs --username and --password')
+            if urlsplit(options['url']).hostname not in ('localhost', '127.0.0.1', '::1'):
+                raise CommandError('--url must point at a local server')
+            credentials = [(options['username'], options['password'])] * options['clients']
+            report = self.drive(options['url'], credentials, mix, options)
+        else:
+            report = self.run_in_process(mix, options)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(
+            f"{report['target']} clients={report['clients']} requests={report['overall']['requests']} "
+            f"throughput={report['overall']['throughput_rps']} req/s "
+            f"error_rate={report['overall']['error_rate']}"
+        )
+        for name, row in report['operations'].items():
+            self.stdout.write(
+                f"  {name:<15} n={row['requests']:<6} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+                f"p99={row['p99_ms']}ms errors={row['errors']}"
+            )
+
+    def run_in_process(self, mix, options):
+        with throwaway_database():
+            credentials = self.create_fixture(options['clients'])
+            server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False)
+            server.set_app(get_wsgi_application())
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            original_throttles = ThrottledTokenObtainPairView.throttle_classes
+            if not options['keep_throttles']:
+                ThrottledTokenObtainPairView.throttle_classes = []
+            try:
+                url = f'http://127.0.0.1:{server.server_address[1]}'
+                return self.drive(url, credentials, mix, options, target='in-process')
+            finally:
+                ThrottledTokenObtainPairView.throttle_classes = original_throttles
+                server.shutdown()
+                server.server_close()
+                connections.close_all()
+
+    def create_fixture(self, clients):
+        password = 'load-password-123'
+        encoded = make_password(password)
+        users = User.objects.bulk_create([User(username=f'load{index}', password=encoded) for index in range(clients)])
+        resumes = Resume.objects.bulk_create([
+            Resume(user=user, title='Load Test Resume', name=f'Load User {index}')
+            for index, user in enumerate(users)
+        ])
+        Experience.objects.bulk_create([
+            Experience(resume=resume, company=f'Company {index}', position='Engineer',
+                       start_date=date(2015 + index, 1, 1), description='Built things.\nShipped things.')
+            for resume in resumes for index in range(3)
+        ])
+        Skill.objects.bulk_create([
+            Skill(resume=resume, name=f'Skill {index}', category='Tools')
+            for resume in resumes for index in range(10)
+        ])
+        return [(user.username, password) for user in users]
+
+    def drive(self, url, credentials, mix, options, target=None):
+        names, weights = zip(*mix.items())
+        samples, lock = {}, threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def record(name, latency, ok, status):
+            with lock:
+                samples.setdefault(name, []).append((latency, ok, status))
+
+        def client(index):
+            rng = random.Random(options['seed'] + index)
+            username, password = credentials[index]
+            load_client = LoadClient(url, username, password, rng, record)
+            try:
+                while time.monotonic() < deadline:
+                    load_client.run(rng.choices(names, weights)[0])
+            finally:
+                load_client.close()
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(len(credentials))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        return {
+            'target': target or url,
+            'revision': self.revision(),
+            'clients': len(credentials),
+            'duration_s': round(elapsed, 2),
+            'mix': mix,
+            'overall': summarize([sample for rows in samples.values() for sample in rows], elapsed),
+            'operations': {name: summarize(rows, elapsed) for name, rows in sorted(samples.items())},
+        }
+
+    def revision(self):
+        """The checked-out commit, so reports can be compared across commits."""
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from resume.models import Resume
+
+
+def child_tables():
+    """(table, primary key, foreign key column) of every model pointing at Resume."""
+    return [
+        (relation.related_model._meta.db_table, relation.related_model._meta.pk.column, relation.field.column)
+        for relation in Resume._meta.related_objects
+    ]
+
+
+def delete_in_batches(table, pk, column, resume_id, batch_size, pause=0.0):
+    """Delete ``table``'s rows for ``resume_id``, ``batch_size`` per transaction."""
+    quote = connection.ops.quote_name
+    sql = (
+        f'DELETE FROM {quote(table)} WHERE {quote(pk)} IN '
+        f'(SELECT {quote(pk)} FROM {quote(table)} WHERE {quote(column)} = %s LIMIT %s)'
+    )
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [resume_id, batch_size])
+                count = cursor.rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)  # let other writers take the lock
+
+
+class Command(BaseCommand):
+    help = (
+        'Permanently delete resumes deleted through the API, with their sections. '
+        'Rows go in small raw DELETE batches, each in its own transaction, so '
+        'the database write lock is never held for long. Safe to re-run, or to '
+        'run again after an interrupted purge.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per DELETE')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+        parser.add_argument('--older-than', type=int, default=0,
+                            help='Only purge resumes deleted at least this many minutes ago')
+        parser.add_argument('--limit', type=int, default=None, help='Purge at most this many resumes')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        pending = Resume.all_objects.pending_deletion().filter(deleted_at__lte=cutoff).order_by('deleted_at')
+        resume_ids = list(pending.values_list('pk', flat=True)[:options['limit']])
+        tables = child_tables()
+        quote = connection.ops.quote_name
+        resume_sql = (
+            f'DELETE FROM {quote(Resume._meta.db_table)} '
+            f'WHERE {quote("id")} = %s AND {quote("deleted_at")} IS NOT NULL'
+        )
+
+        rows = 0
+        for resume_id in resume_ids:
+            for table, pk, column in tables:
+                rows += delete_in_batches(table, pk, column, resume_id, options['batch_size'], options['pause'])
+            # Last, so an interrupted purge leaves the resume pending and is finished by the next run
+            with connection.cursor() as cursor:
+                cursor.execute(resume_sql, [resume_id])
+                rows += cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f'Purged {len(resume_ids)} resumes ({rows} rows)'))
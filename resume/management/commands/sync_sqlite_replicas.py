@@ -0,0 +1,36 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from resume_builder.db_router import get_replication_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into each SQLite replica alias, for '
+        'trying read-replica routing locally (see DATABASE_REPLICAS). Run it '
+        'again to "replicate" newer writes.'
+    )
+
+    def handle(self, *args, **options):
+        replication = get_replication_settings()
+        primary = connections[replication['PRIMARY']].settings_dict
+        replicas = [connections[alias].settings_dict for alias in replication['REPLICAS']]
+        if not replicas:
+            raise CommandError('No replicas configured; set DATABASE_REPLICAS')
+        if any(db['ENGINE'] != 'django.db.backends.sqlite3' for db in [primary] + replicas):
+            raise CommandError('Only SQLite databases can be synced this way')
+
+        source = sqlite3.connect(primary['NAME'])
+        try:
+            for alias, replica in zip(replication['REPLICAS'], replicas):
+                target = sqlite3.connect(replica['NAME'])
+                try:
+                    # The online backup API copies a consistent snapshot while the primary is in use
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: copied {primary['NAME']} to {replica['NAME']}")
+        finally:
+            source.close()
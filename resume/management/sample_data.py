@@ -0,0 +1,55 @@
+from datetime import date
+
+from resume.models import (
+    Resume, Education, Experience, Project, Skill, Certification, Achievement, split_bullets,
+)
+
+
+def build_sample_resume(rng):
+    """
+    An unsaved resume and section lists for render benchmarks, so no
+    database is needed.
+    """
+    resume = Resume(
+        id=1, title='Benchmark Resume', name='Bench User', professional_title='Engineer',
+        email='bench@example.com', phone='555-0100', location='Remote',
+        github_url='https://github.com/bench', linkedin_url='https://linkedin.com/in/bench',
+    )
+    sections = {
+        'education': [
+            Education(school=f'University {index}', degree='BSc', field_of_study='Computer Science',
+                      start_date=date(2008 + index, 9, 1), end_date=date(2012 + index, 6, 1))
+            for index in range(2)
+        ],
+        'experience': [
+            Experience(company=f'Company {index}', position='Engineer', location='Remote',
+                       start_date=date(2012 + index, 1, 1), end_date=date(2013 + index, 1, 1),
+                       description='\n'.join(f'Shipped feature {rng.randint(1, 999)}' for _ in range(4)))
+            for index in range(6)
+        ],
+        'projects': [
+            Project(name=f'Project {index}', description='Built and maintained a service.',
+                    technologies='Python, Django', start_date=date(2018, index + 1, 1))
+            for index in range(4)
+        ],
+        'skills': [
+            Skill(name=f'Skill {index}', category=rng.choice(['Languages', 'Frameworks', 'Tools']))
+            for index in range(24)
+        ],
+        'certifications': [
+            Certification(name=f'Certification {index}', issuing_organization='Vendor',
+                          issue_date=date(2020, index + 1, 1))
+            for index in range(3)
+        ],
+        'achievements': [
+            Achievement(title=f'Award {index}', description='Recognised for impact.',
+                        organization='Company', date_achieved=date(2021, index + 1, 1))
+            for index in range(3)
+        ],
+    }
+    sections['skills'].sort(key=lambda skill: (skill.category, skill.name))
+    for name in ('education', 'experience', 'projects', 'achievements'):
+        for item in sections[name]:
+            # Normally filled in by save()
+            item.description_bullets = split_bullets(item.description)
+    return resume, sections
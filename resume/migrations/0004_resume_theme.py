@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0003_resume_email_resume_github_url_resume_linkedin_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='theme',
+            field=models.CharField(default='classic', help_text='PDF theme name (see resume.themes)', max_length=50),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.3 on 2026-10-19 17:37
+
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+BULLET_MARKER = re.compile(r'^(?:[•·▪‣]\s*|[-*]\s+)')
+
+
+def split_bullets(text):
+    # Frozen copy of resume.models.split_bullets as of this migration
+    if not text:
+        return []
+    bullets = []
+    for line in text.split('\n'):
+        line = BULLET_MARKER.sub('', line.strip()).strip()
+        if line:
+            bullets.append(line)
+    return bullets
+
+
+def backfill_bullets(apps, schema_editor):
+    """Fill description_bullets in keyset-paginated batches of BATCH_SIZE rows."""
+    for model_name in ('Education', 'Experience', 'Project', 'Achievement'):
+        model = apps.get_model('resume', model_name)
+        last_pk = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'description')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            for row in batch:
+                row.description_bullets = split_bullets(row.description)
+            # bulk_update bypasses save(), so updated_at is left untouched
+            model.objects.bulk_update(batch, ['description_bullets'])
+            last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0004_resume_theme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='description_bullets',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='education',
+            name='description_bullets',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='description_bullets',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_bullets',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(backfill_bullets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0005_description_bullets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0006_resume_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='achievement',
+            options={'ordering': ['sort_order', '-date_achieved']},
+        ),
+        migrations.AlterModelOptions(
+            name='certification',
+            options={'ordering': ['sort_order', '-issue_date']},
+        ),
+        migrations.AlterModelOptions(
+            name='education',
+            options={'ordering': ['sort_order', '-end_date', '-start_date']},
+        ),
+        migrations.AlterModelOptions(
+            name='experience',
+            options={'ordering': ['sort_order', '-end_date', '-start_date']},
+        ),
+        migrations.AlterModelOptions(
+            name='project',
+            options={'ordering': ['sort_order', '-end_date', '-start_date']},
+        ),
+        migrations.AlterModelOptions(
+            name='skill',
+            options={'ordering': ['sort_order', 'category', 'name']},
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddField(
+            model_name='certification',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddField(
+            model_name='education',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Position within the section, set by the reorder endpoint'),
+        ),
+        migrations.AddIndex(
+            model_name='achievement',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_achi_resume__147d8f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_cert_resume__8cd1ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_educ_resume__71b314_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_expe_resume__4b9497_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_proj_resume__1d54d5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['resume', 'sort_order'], name='resume_skil_resume__19b4ef_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0007_section_sort_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeArchive',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='resume.resume')),
+                ('codec', models.CharField(max_length=10)),
+                ('data', models.BinaryField()),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('raw_size', models.PositiveIntegerField(default=0, help_text='Bytes before compression')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0008_resume_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='share_key',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0009_resume_share_key'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='skill',
+            options={'ordering': ['category', 'sort_order', 'name']},
+        ),
+    ]
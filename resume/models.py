@@ -1,7 +1,60 @@
 from django.db import models
 from django.contrib.auth.models import User
+import re
 import uuid
 
+BULLET_MARKER = re.compile(r'^(?:[•·▪‣]\s*|[-*]\s+)')
+
+
+def split_bullets(text):
+    """
+    Normalise a description into bullet points: one per non-blank line,
+    stripped, with any leading bullet marker ("•", "- ", "* ") removed.
+    """
+    if not text:
+        return []
+    bullets = []
+    for line in text.split('\n'):
+        line = BULLET_MARKER.sub('', line.strip()).strip()
+        if line:
+            bullets.append(line)
+    return bullets
+
+
+class DescriptionBulletsModel(models.Model):
+    """
+    Stores ``description`` pre-split into bullet points, computed once in
+    save() so templates and API clients never re-parse the raw text.
+    QuerySet.update() and bulk_update() bypass save(): recompute there.
+    """
+    description_bullets = models.JSONField(default=list, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.description_bullets = split_bullets(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'description_bullets'}
+        super().save(*args, **kwargs)
+
+
+class ResumeQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def pending_deletion(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class ActiveResumeManager(models.Manager.from_queryset(ResumeQuerySet)):
+    """Hides resumes that are deleted but not yet purged."""
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
+
 class Resume(models.Model):
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=200)
@@ -21,8 +74,21 @@ class Resume(models.Model):
     website_url = models.URLField(blank=True, help_text="Portfolio/personal website URL")
     twitter_url = models.URLField(blank=True, help_text="Twitter profile URL")
     
+    # Presentation
+    theme = models.CharField(max_length=50, default='classic', help_text="PDF theme name (see resume.themes)")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set by a delete through the API; the purge_deleted_resumes command removes the rows later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
+    # Sections moved to a ResumeArchive by archive_inactive_resumes (see resume.archive)
+    is_archived = models.BooleanField(default=False, editable=False)
+    # Secret part of the public share URLs (resume.share); blank when not shared
+    share_key = models.CharField(max_length=32, blank=True, editable=False)
+
+    # ``objects`` leaves out resumes pending deletion; ``all_objects`` has every row
+    objects = ActiveResumeManager()
+    all_objects = ResumeQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
@@ -31,7 +97,7 @@ class Resume(models.Model):
         return f"{self.title} - {self.user.username}"
 
 
-class Education(models.Model):
+class Education(DescriptionBulletsModel):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='education')
     school = models.CharField(max_length=200)
     degree = models.CharField(max_length=200)
@@ -40,17 +106,19 @@ class Education(models.Model):
     end_date = models.DateField(null=True, blank=True)
     gpa = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
     description = models.TextField(blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-end_date', '-start_date']
+        ordering = ['sort_order', '-end_date', '-start_date']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
     
     def __str__(self):
         return f"{self.degree} at {self.school}"
 
 
-class Experience(models.Model):
+class Experience(DescriptionBulletsModel):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='experience')
     company = models.CharField(max_length=200)
     position = models.CharField(max_length=200)
@@ -59,17 +127,19 @@ class Experience(models.Model):
     end_date = models.DateField(null=True, blank=True)
     is_current = models.BooleanField(default=False)
     description = models.TextField(blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-end_date', '-start_date']
+        ordering = ['sort_order', '-end_date', '-start_date']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
     
     def __str__(self):
         return f"{self.position} at {self.company}"
 
 
-class Project(models.Model):
+class Project(DescriptionBulletsModel):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='projects')
     name = models.CharField(max_length=200)
     description = models.TextField()
@@ -78,11 +148,13 @@ class Project(models.Model):
     end_date = models.DateField(null=True, blank=True)
     project_url = models.URLField(blank=True)
     github_url = models.URLField(blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-end_date', '-start_date']
+        ordering = ['sort_order', '-end_date', '-start_date']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
     
     def __str__(self):
         return self.name
@@ -101,11 +173,13 @@ class Skill(models.Model):
     category = models.CharField(max_length=100, blank=True)
     level = models.CharField(max_length=20, choices=SKILL_LEVELS, default='intermediate')
     years_of_experience = models.PositiveIntegerField(null=True, blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['category', 'name']
+        ordering = ['category', 'sort_order', 'name']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
         unique_together = ['resume', 'name']
     
     def __str__(self):
@@ -120,27 +194,44 @@ class Certification(models.Model):
     expiration_date = models.DateField(null=True, blank=True)
     credential_id = models.CharField(max_length=100, blank=True)
     credential_url = models.URLField(blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-issue_date']
+        ordering = ['sort_order', '-issue_date']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
     
     def __str__(self):
         return f"{self.name} - {self.issuing_organization}"
 
 
-class Achievement(models.Model):
+class Achievement(DescriptionBulletsModel):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='achievements')
     title = models.CharField(max_length=200)
     description = models.TextField()
     date_achieved = models.DateField()
     organization = models.CharField(max_length=200, blank=True)
+    sort_order = models.PositiveIntegerField(default=0, editable=False, help_text="Position within the section, set by the reorder endpoint")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-date_achieved']
+        ordering = ['sort_order', '-date_achieved']
+        indexes = [models.Index(fields=['resume', 'sort_order'])]
     
     def __str__(self):
         return self.title
+
+
+class ResumeArchive(models.Model):
+    """An archived resume's section rows as one compressed JSON dump (see resume.archive)."""
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='archive')
+    codec = models.CharField(max_length=10)
+    data = models.BinaryField()
+    row_count = models.PositiveIntegerField(default=0)
+    raw_size = models.PositiveIntegerField(default=0, help_text="Bytes before compression")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive of resume {self.resume_id} ({self.row_count} rows)"
@@ -0,0 +1,527 @@
+"""
+Shared helpers for turning a Resume into PDF bytes.
+
+Both the WSGI view and the async ASGI view load the same sections, render
+the same template and hand it to WeasyPrint through these functions.
+
+Rendered PDFs are cached under a fingerprint of the resume's content (its
+own updated_at plus the row count and latest updated_at of every section)
+and of its theme's sources, so any edit, insert, delete or theme change
+produces a new key and stale bytes are never served.
+
+Templates and stylesheets come from the resume's theme (resume.themes),
+which compiles and parses them once per process. The header and each
+section are rendered as separate fragments, cached under that section's
+own version, so the HTML preview and the PDF share one render path and an
+edit re-renders only the fragment it touches.
+
+Each theme names the PDF backend that lays it out. WeasyPrintBackend
+renders that HTML with the theme's stylesheet, importing WeasyPrint on
+first use. BuiltinBackend draws the classic layout directly
+(resume.builtin_pdf). When the builtin fonts can't set a resume's text,
+BuiltinBackend hands it to WeasyPrint.
+
+Concurrent cache misses for the same resume and fingerprint (a double
+click, several tabs) share one render through resume.singleflight: across
+threads in a process, and across processes through lock files when
+PDF_RENDER_COALESCING['LOCK_DIR'] is set. That needs a PDF cache shared
+by all workers, so the lock files are skipped when it's local memory.
+"""
+import asyncio
+import hashlib
+import logging
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+from django.utils.safestring import mark_safe
+
+from resume_builder.cache_utils import is_shared_cache
+from resume_builder.metrics import observe_pdf_coalesced, observe_pdf_render
+
+from . import builtin_pdf
+from .models import Resume, Education, Experience, Project, Skill, Certification, Achievement
+from .singleflight import SingleFlight
+from .themes import FRAGMENT_NAMES, get_theme
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCING_SETTINGS = {
+    'TIMEOUT': 30.0,
+    'LOCK_DIR': None,
+    'LOCK_STRIPES': 256,
+}
+
+SECTION_MODELS = {
+    'education': Education,
+    'experience': Experience,
+    'projects': Project,
+    'skills': Skill,
+    'certifications': Certification,
+    'achievements': Achievement,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_pdf_flights = None
+_async_flights = weakref.WeakKeyDictionary()  # event loop -> {flight key: task}
+_render_slots = threading.BoundedSemaphore(getattr(settings, 'PDF_RENDER_WORKERS', 2))
+
+
+# Order each section is rendered in: the user's order first (see the reorder
+# endpoints), then dates for rows never reordered. The keys are also
+# Resume's related names.
+# Skills keep their categories contiguous for {% regroup %} and groupby();
+# a user-chosen order applies within each category
+SECTION_ORDERING = {
+    'education': ('sort_order', '-start_date'),
+    'experience': ('sort_order', '-start_date'),
+    'projects': ('sort_order', '-start_date'),
+    'skills': ('category', 'sort_order', 'name'),
+    'certifications': ('sort_order', '-issue_date'),
+    'achievements': ('sort_order', '-date_achieved'),
+}
+
+
+def get_section_querysets(resume):
+    """Return the (lazy) section querysets rendered into the PDF, keyed by context name."""
+    return {
+        name: model.objects.filter(resume=resume).order_by(*SECTION_ORDERING[name])
+        for name, model in SECTION_MODELS.items()
+    }
+
+
+def section_prefetches():
+    """Prefetch objects loading every section, in render order, for a list of resumes."""
+    return [
+        Prefetch(name, queryset=model.objects.order_by(*SECTION_ORDERING[name]))
+        for name, model in SECTION_MODELS.items()
+    ]
+
+
+def get_prefetched_sections(resume):
+    """Sections of a resume loaded with section_prefetches(), without queries."""
+    return {name: getattr(resume, name).all() for name in SECTION_MODELS}
+
+
+async def aget_sections(resume):
+    """Evaluate every section queryset with the async ORM."""
+    return {
+        name: [item async for item in queryset]
+        for name, queryset in get_section_querysets(resume).items()
+    }
+
+
+def section_versions_queryset(resume_id):
+    """
+    One query returning the resume's updated_at and theme and, per section,
+    the row count and latest updated_at.
+    """
+    annotations = {}
+    for name, model in SECTION_MODELS.items():
+        rows = model.objects.filter(resume=OuterRef('pk')).order_by().values('resume')
+        annotations[f'{name}_count'] = Subquery(rows.annotate(n=Count('pk')).values('n'))
+        annotations[f'{name}_updated'] = Subquery(rows.annotate(m=Max('updated_at')).values('m'))
+    return Resume.all_objects.filter(pk=resume_id).values('pk', 'updated_at', 'theme').annotate(**annotations)
+
+
+def fingerprint_from_versions(versions):
+    theme = get_theme(versions['theme'])
+    backend = get_pdf_backend(theme.pdf_backend)
+    versions = dict(versions, theme=f'{theme.name}:{backend.name}:{backend.version(theme)}')
+    digest = hashlib.sha256()
+    for key in sorted(versions):
+        digest.update(f'{key}={versions[key]};'.encode())
+    return digest.hexdigest()[:32]
+
+
+def get_section_versions(resume):
+    return section_versions_queryset(resume.pk).get()
+
+
+def resume_fingerprint(resume):
+    return fingerprint_from_versions(get_section_versions(resume))
+
+
+def get_pdf_cache():
+    return caches[getattr(settings, 'PDF_CACHE_ALIAS', 'default')]
+
+
+def pdf_cache_key(fingerprint):
+    return f'resume-pdf:{fingerprint}'
+
+
+def get_fragment_cache():
+    return caches[getattr(settings, 'RESUME_FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def fragment_versions(versions):
+    """
+    Map each fragment to the version its cache entry varies on: the resume's
+    updated_at for the header, a section's row count and latest updated_at
+    for the rest (the count catches deletes).
+    """
+    result = {'header': versions['updated_at']}
+    for name in SECTION_MODELS:
+        result[name] = f"{versions[f'{name}_count']}:{versions[f'{name}_updated']}"
+    return result
+
+
+def fragment_cache_key(theme, resume_id, name, version):
+    digest = hashlib.sha256(f'{theme.name}:{theme.version}:{resume_id}:{name}:{version}'.encode())
+    return f'resume-fragment:{digest.hexdigest()[:32]}'
+
+
+def render_fragments(resume, sections, versions=None):
+    """
+    Render the header and every section to HTML, returning the fragments
+    and the names actually rendered.
+
+    With ``versions`` (a section_versions_queryset row) fragments are read
+    from and written to the fragment cache in one round trip each, and a
+    section's rows are only used on a miss, so lazy querysets cost nothing
+    on a hit. Without it every fragment is rendered and nothing is cached.
+    """
+    theme = get_theme(resume.theme)
+
+    def render(name):
+        context = {'resume': resume}
+        if name in sections:
+            context[name] = sections[name]
+        return theme.render_section(name, context)
+
+    if versions is None:
+        return {name: render(name) for name in FRAGMENT_NAMES}, list(FRAGMENT_NAMES)
+
+    cache = get_fragment_cache()
+    keys = {
+        name: fragment_cache_key(theme, resume.pk, name, version)
+        for name, version in fragment_versions(versions).items()
+    }
+    cached = cache.get_many(keys.values())
+    fragments, rendered = {}, []
+    for name in FRAGMENT_NAMES:
+        html_string = cached.get(keys[name])
+        if html_string is None:
+            html_string = render(name)
+            rendered.append(name)
+        fragments[name] = mark_safe(html_string)
+    if rendered:
+        cache.set_many(
+            {keys[name]: str(fragments[name]) for name in rendered},
+            getattr(settings, 'RESUME_FRAGMENT_CACHE_TIMEOUT', 86400),
+        )
+    return fragments, rendered
+
+
+def render_layout(resume, fragments):
+    """Assemble rendered fragments into the theme's page layout."""
+    return get_theme(resume.theme).render({'resume': resume, 'fragments': fragments})
+
+
+def render_resume_html(resume, sections, versions=None):
+    """The complete HTML handed to WeasyPrint, also served as the preview."""
+    fragments, _ = render_fragments(resume, sections, versions)
+    return render_layout(resume, fragments)
+
+
+def layout_pdf(html_string, theme):
+    """Run WeasyPrint's layout step and return the paginated document."""
+    # Imported here: it's slow to load, and themes on other backends never need it
+    from weasyprint import HTML
+
+    return HTML(string=html_string, base_url=settings.BASE_DIR).render(
+        stylesheets=[theme.stylesheet]
+    )
+
+
+def write_pdf(html_string, theme):
+    return layout_pdf(html_string, theme).write_pdf()
+
+
+class WeasyPrintBackend:
+    """Lays out the theme's HTML and stylesheet with WeasyPrint."""
+
+    name = 'weasyprint'
+
+    def prepare(self, resume, sections, versions=None):
+        return render_resume_html(resume, sections, versions)
+
+    def version(self, theme):
+        return theme.version
+
+    def layout(self, html_string, theme):
+        return layout_pdf(html_string, theme)
+
+
+class BuiltinBackend:
+    """Lays out the classic structure directly, without HTML or CSS."""
+
+    name = 'builtin'
+
+    def prepare(self, resume, sections, versions=None):
+        return builtin_pdf.build_flow(resume, sections)
+
+    def version(self, theme):
+        return builtin_pdf.LAYOUT_VERSION
+
+    def layout(self, flow, theme):
+        return builtin_pdf.paginate(flow)
+
+
+_pdf_backends = {}
+
+
+def register_pdf_backend(backend):
+    """
+    Make ``backend`` available to themes by its name. A backend has
+    prepare(resume, sections, versions), returning its source (raising
+    builtin_pdf.UnsupportedContent to hand the resume to WeasyPrint),
+    layout(source, theme), returning a document with ``pages`` and
+    ``write_pdf()``, and version(theme), a string that changes whenever its
+    output for the theme would. The PDF fingerprint includes that version,
+    so a backend only invalidates cached PDFs for changes it reads.
+    """
+    _pdf_backends[backend.name] = backend
+    return backend
+
+
+def get_pdf_backend(name):
+    return _pdf_backends.get(name) or _pdf_backends[WeasyPrintBackend.name]
+
+
+register_pdf_backend(WeasyPrintBackend())
+register_pdf_backend(BuiltinBackend())
+
+
+def prepare_pdf(resume, sections, versions=None):
+    """Return (backend, source) for laying out the resume with its theme's backend."""
+    backend = get_pdf_backend(get_theme(resume.theme).pdf_backend)
+    try:
+        return backend, backend.prepare(resume, sections, versions)
+    except builtin_pdf.UnsupportedContent:
+        backend = get_pdf_backend(WeasyPrintBackend.name)
+        return backend, backend.prepare(resume, sections, versions)
+
+
+def render_resume_pdf(resume, sections, versions=None):
+    """
+    Render a resume to PDF bytes. With materialised section lists (as the
+    async view passes) this runs no queries and is safe in an executor.
+    """
+    with _render_slots:
+        started = time.perf_counter()
+        backend, source = prepare_pdf(resume, sections, versions)
+        document = backend.layout(source, get_theme(resume.theme))
+        pdf = document.write_pdf()
+        observe_pdf_render(time.perf_counter() - started, len(document.pages))
+        return pdf
+
+
+class StageClock:
+    """
+    Builds render progress events: the stage's name, the time since
+    ``started`` and the stage's own duration, both in milliseconds.
+    """
+
+    def __init__(self, started=None):
+        self.started = self.last = started if started is not None else time.perf_counter()
+
+    def __call__(self, name, **detail):
+        now = time.perf_counter()
+        event = {
+            'stage': name,
+            'elapsed_ms': round((now - self.started) * 1000, 1),
+            'duration_ms': round((now - self.last) * 1000, 1),
+        }
+        event.update(detail)
+        self.last = now
+        return event
+
+
+def render_with_stages(resume, fingerprint, sections, versions=None, clock=None, report=None):
+    """
+    Render and cache a resume PDF from materialised ``sections``, calling
+    ``report`` with a progress event (see StageClock) after each stage:
+    queued, template_rendered, layout, written and cached. Returns the PDF.
+    ``report`` is called while a render slot is held, so it should only
+    hand the event on.
+    """
+    clock = clock or StageClock()
+    report = report or (lambda event: None)
+    with _render_slots:
+        report(clock('queued'))
+        render_started = time.perf_counter()
+        backend, source = prepare_pdf(resume, sections, versions)
+        detail = {'html_bytes': len(source)} if isinstance(source, str) else {}
+        report(clock('template_rendered', backend=backend.name, **detail))
+        document = backend.layout(source, get_theme(resume.theme))
+        report(clock('layout', pages=len(document.pages)))
+        pdf = document.write_pdf()
+        observe_pdf_render(time.perf_counter() - render_started, len(document.pages))
+        report(clock('written', pdf_bytes=len(pdf)))
+
+    get_pdf_cache().set(pdf_cache_key(fingerprint), pdf, getattr(settings, 'PDF_CACHE_TIMEOUT', 86400))
+    report(clock('cached', fingerprint=fingerprint))
+    return pdf
+
+
+def iter_render_stages(resume, fingerprint, started=None, versions=None):
+    """
+    Render and cache a resume PDF, yielding its progress events: querying,
+    then render_with_stages()'s. The sections are loaded in the calling
+    thread and the render runs in a thread of its own, so a slow reader
+    never holds up a render slot. Render errors are raised from here.
+
+    The render goes through coalesced_render(). When it joins another
+    request's render of the same PDF, that render's stages aren't seen,
+    and a single 'cached' event with ``shared`` set follows once it lands.
+    """
+    clock = StageClock(started)
+    sections = {name: list(queryset) for name, queryset in get_section_querysets(resume).items()}
+    yield clock('querying', rows=sum(len(rows) for rows in sections.values()))
+
+    events = queue.SimpleQueue()
+    errors = []
+
+    def render():
+        return render_with_stages(resume, fingerprint, sections, versions, clock, events.put)
+
+    def run():
+        try:
+            coalesced_render(resume, fingerprint, render)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name='pdf-progress', daemon=True).start()
+    rendered = False
+    while (event := events.get()) is not None:
+        rendered = True
+        yield event
+    if errors:
+        raise errors[0]
+    if not rendered:
+        yield clock('cached', fingerprint=fingerprint, shared=True)
+
+
+async def aiter_render_stages(resume, fingerprint, started=None, versions=None):
+    """
+    iter_render_stages() for async views: the sections are loaded with the
+    async ORM and the render runs on the bounded render executor, through
+    acoalesced_render().
+    """
+    clock = StageClock(started)
+    sections = await aget_sections(resume)
+    yield clock('querying', rows=sum(len(rows) for rows in sections.values()))
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def report(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def render():
+        return render_with_stages(resume, fingerprint, sections, versions, clock, report)
+
+    task = asyncio.ensure_future(acoalesced_render(resume, fingerprint, render))
+    # Lands after every event the render reported, which were all queued through
+    # call_soon_threadsafe before its executor future completed
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    rendered = False
+    while (event := await events.get()) is not None:
+        rendered = True
+        yield event
+    task.result()
+    if not rendered:
+        yield clock('cached', fingerprint=fingerprint, shared=True)
+
+
+def get_pdf_flights():
+    """The process's SingleFlight for PDF renders, built from PDF_RENDER_COALESCING."""
+    global _pdf_flights
+    with _executor_lock:
+        if _pdf_flights is None:
+            options = dict(DEFAULT_COALESCING_SETTINGS, **getattr(settings, 'PDF_RENDER_COALESCING', {}))
+            lock_dir = options['LOCK_DIR']
+            if lock_dir and not is_shared_cache(get_pdf_cache()):
+                # Other workers could never see the result they waited for
+                logger.warning('PDF_RENDER_COALESCING LOCK_DIR ignored: the PDF cache is local to each process')
+                lock_dir = None
+            _pdf_flights = SingleFlight(
+                timeout=options['TIMEOUT'], lock_dir=lock_dir,
+                stripes=options['LOCK_STRIPES'], on_wait=observe_pdf_coalesced,
+            )
+        return _pdf_flights
+
+
+def coalesced_render(resume, fingerprint, render):
+    """
+    Run ``render`` (which must cache the PDF) for a cache miss, sharing it
+    with concurrent requests for the same resume and fingerprint.
+    """
+    key = pdf_cache_key(fingerprint)
+    return get_pdf_flights().run(f'{resume.pk}:{fingerprint}', render, lambda: get_pdf_cache().get(key))
+
+
+async def acoalesced_render(resume, fingerprint, render):
+    """
+    coalesced_render() for async views. Requests on one event loop for the
+    same PDF await a single task, which waits for the flight (and any lock
+    file) in a thread of the loop's default executor. Only ``render``
+    itself runs on the bounded render executor, so waiting never takes up
+    a render thread. The task is shielded: a client that leaves doesn't
+    cancel the render for the others.
+    """
+    loop = asyncio.get_running_loop()
+    flights = _async_flights.setdefault(loop, {})
+    key = f'{resume.pk}:{fingerprint}'
+    task = flights.get(key)
+    if task is None:
+        def run():
+            return get_render_executor().submit(render).result()
+
+        task = flights[key] = loop.run_in_executor(None, coalesced_render, resume, fingerprint, run)
+        task.add_done_callback(lambda _: flights.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def get_or_render_pdf(resume):
+    """Return (pdf_bytes, fingerprint), rendering only on a cache miss."""
+    versions = get_section_versions(resume)
+    fingerprint = fingerprint_from_versions(versions)
+    pdf = get_pdf_cache().get(pdf_cache_key(fingerprint))
+    if pdf is None:
+        def render():
+            sections = {name: list(queryset) for name, queryset in get_section_querysets(resume).items()}
+            return render_with_stages(resume, fingerprint, sections, versions)
+
+        pdf = coalesced_render(resume, fingerprint, render)
+    return pdf, fingerprint
+
+
+def pdf_filename(resume):
+    title = resume.title.replace(' ', '_') if resume.title else 'resume'
+    return f"resume_{title}_{resume.id}.pdf"
+
+
+def get_render_executor():
+    """
+    Bounded thread pool for PDF renders started from async views, so
+    WeasyPrint never runs on the event loop and at most
+    PDF_RENDER_WORKERS renders run at once per process.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PDF_RENDER_WORKERS', 2),
+                thread_name_prefix='pdf-render',
+            )
+        return _executor
@@ -1,60 +1,99 @@
 from rest_framework import serializers
 from .models import Resume, Education, Experience, Project, Skill, Certification, Achievement
+from .autosave import save_changed_fields
+from .pdf import get_prefetched_sections
+from .text import render_resume_text
+from .themes import is_registered
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ChangedFieldsMixin:
+    """Updates write only the fields whose values change; see resume.autosave."""
+
+    def update(self, instance, validated_data):
+        save_changed_fields(instance, validated_data)
+        return instance
+
+
+class ResumeSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     
     class Meta:
         model = Resume
         fields = ['id', 'title', 'user', 'uuid', 'name', 'professional_title', 'phone', 
                  'email', 'location', 'linkedin_url', 'github_url', 'website_url', 
-                 'twitter_url', 'created_at', 'updated_at']
+                 'twitter_url', 'theme', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'uuid', 'created_at', 'updated_at']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.context.get('include_text'):
+            data['text'] = render_resume_text(instance, get_prefetched_sections(instance))
+        return data
+
+    def validate_theme(self, value):
+        if not is_registered(value):
+            raise serializers.ValidationError(f'Unknown theme "{value}".')
+        return value
+
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Education
         fields = ['id', 'resume', 'school', 'degree', 'field_of_study', 'start_date', 
-                 'end_date', 'gpa', 'description', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                 'end_date', 'gpa', 'description', 'description_bullets', 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'description_bullets', 'created_at', 'updated_at']
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Experience
         fields = ['id', 'resume', 'company', 'position', 'location', 'start_date', 
-                 'end_date', 'is_current', 'description', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                 'end_date', 'is_current', 'description', 'description_bullets', 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'description_bullets', 'created_at', 'updated_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
-        fields = ['id', 'resume', 'name', 'description', 'technologies', 'start_date', 
-                 'end_date', 'project_url', 'github_url', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'resume', 'name', 'description', 'description_bullets', 'technologies', 
+                 'start_date', 'end_date', 'project_url', 'github_url', 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'description_bullets', 'created_at', 'updated_at']
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ['id', 'resume', 'name', 'category', 'level', 'years_of_experience', 
-                 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'created_at', 'updated_at']
 
 
-class CertificationSerializer(serializers.ModelSerializer):
+class CertificationSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Certification
         fields = ['id', 'resume', 'name', 'issuing_organization', 'issue_date', 
-                 'expiration_date', 'credential_id', 'credential_url', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                 'expiration_date', 'credential_id', 'credential_url', 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'created_at', 'updated_at']
 
 
-class AchievementSerializer(serializers.ModelSerializer):
+class AchievementSerializer(ChangedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Achievement
-        fields = ['id', 'resume', 'title', 'description', 'date_achieved', 
-                 'organization', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'resume', 'title', 'description', 'description_bullets', 'date_achieved', 
+                 'organization', 'sort_order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'sort_order', 'description_bullets', 'created_at', 'updated_at']
+
+
+class ReorderSerializer(serializers.Serializer):
+    """A resume and the ids of one of its sections' rows, in their new order."""
+    resume = serializers.PrimaryKeyRelatedField(queryset=Resume.objects.all())
+    order = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate_resume(self, value):
+        if value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('Resume not found.')
+        return value
+
+    def validate_order(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError('Ids must not repeat.')
+        return value
@@ -0,0 +1,205 @@
+"""
+Public, CDN-cacheable share links for resumes, keyed by Resume.uuid.
+
+The owner turns sharing on or off through ``/api/resumes/<id>/share/``.
+Turning it on gives the resume a random share_key; turning it off clears
+the key. The public URLs are:
+
+    /share/<uuid>/                          redirects to the current HTML version
+    /share/<uuid>/resume.pdf                redirects to the current PDF version
+    /share/<uuid>/<version>/                the HTML page
+    /share/<uuid>/<version>/resume.pdf      the PDF
+    /share/assets/<theme>.<version>.css     the theme stylesheet
+
+``version`` hashes the share_key with the resume's content fingerprint.
+An edit, or revoking and sharing again, gives a new version and therefore
+new URLs. Versioned responses never change, so they are served with
+``Cache-Control: public, immutable`` and a strong ETag, one per content
+coding when CompressionMiddleware compresses them. Only the small
+redirects are revalidated, after ENTRY_MAX_AGE seconds, so a CDN absorbs
+nearly all share traffic.
+
+Revoking makes every URL 404 at the origin. A CDN keeps copies of old
+versions it already holds until they expire, so purge ``/share/<uuid>/``
+there when a takedown must take effect at once.
+"""
+import hashlib
+import re
+import secrets
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+from resume_builder.middleware import decoded_etag
+
+from .archive import restore_if_archived
+from .autosave import flush_pending
+from .models import Resume
+from .pdf import (
+    fingerprint_from_versions, get_or_render_pdf, get_section_querysets, get_section_versions,
+    render_fragments, render_layout,
+)
+from .themes import get_theme, is_registered
+
+DEFAULT_SHARING_SETTINGS = {
+    'ENTRY_MAX_AGE': 60,
+    'VERSIONED_MAX_AGE': 60 * 60 * 24 * 365,
+}
+
+# The layout's stylesheet <link> is relative, for WeasyPrint; shared pages get a versioned one
+STYLESHEET_LINK = re.compile(r'<link rel="stylesheet"[^>]*>')
+
+
+def get_sharing_settings():
+    """Return RESUME_SHARING merged over the defaults."""
+    options = dict(DEFAULT_SHARING_SETTINGS)
+    options.update(getattr(settings, 'RESUME_SHARING', {}))
+    return options
+
+
+def enable_sharing(resume):
+    """Give the resume a share key if it has none; returns the key."""
+    if not resume.share_key:
+        resume.share_key = secrets.token_hex(16)
+        # update() leaves updated_at, and with it the PDF fingerprint, alone
+        Resume.objects.filter(pk=resume.pk).update(share_key=resume.share_key)
+    return resume.share_key
+
+
+def revoke_sharing(resume):
+    resume.share_key = ''
+    Resume.objects.filter(pk=resume.pk).update(share_key='')
+
+
+def share_version(resume, fingerprint):
+    # The theme version covers the shared HTML page, which the PDF
+    # fingerprint doesn't for themes laid out without templates
+    theme = get_theme(resume.theme)
+    return hashlib.sha256(f'{resume.share_key}:{theme.version}:{fingerprint}'.encode()).hexdigest()[:20]
+
+
+def share_urls(request, resume):
+    """The resume's public entry URLs, or None when it isn't shared."""
+    if not resume.share_key:
+        return None
+    return {
+        'url': request.build_absolute_uri(reverse('share_resume', args=[resume.uuid])),
+        'pdf_url': request.build_absolute_uri(reverse('share_resume_pdf', args=[resume.uuid])),
+    }
+
+
+def get_shared_resume(uuid):
+    resume = get_object_or_404(Resume.objects.exclude(share_key=''), uuid=uuid)
+    if flush_pending(resume.user_id):
+        resume.refresh_from_db()
+    restore_if_archived(resume)
+    versions = get_section_versions(resume)
+    return resume, versions, share_version(resume, fingerprint_from_versions(versions))
+
+
+def cache_for(response, max_age, immutable=False):
+    response['Cache-Control'] = f'public, max-age={max_age}' + (', immutable' if immutable else '')
+    return response
+
+
+def redirect_to_version(resume, version, name):
+    url_name = 'share_resume_version_pdf' if name == 'pdf' else 'share_resume_version'
+    response = HttpResponseRedirect(reverse(url_name, args=[resume.uuid, version]))
+    return cache_for(response, get_sharing_settings()['ENTRY_MAX_AGE'])
+
+
+def versioned(request, version, build):
+    """Serve ``build()``'s response as the immutable representation of ``version``."""
+    etag = f'"{version}"'
+    # A cached copy may carry the ETag of one of its compressed codings
+    cached = next(
+        (tag for tag in parse_etags(request.headers.get('If-None-Match', '')) if decoded_etag(tag) == etag),
+        etag,
+    )
+    response = get_conditional_response(request, etag=cached)
+    if response is None:
+        response = build()
+        response['ETag'] = etag
+        response.etag_per_encoding = True
+    else:
+        response['ETag'] = cached
+        if cached != etag:
+            patch_vary_headers(response, ('Accept-Encoding',))
+    return cache_for(response, get_sharing_settings()['VERSIONED_MAX_AGE'], immutable=True)
+
+
+def not_found_response():
+    response = HttpResponse('Not found', status=404, content_type='text/plain; charset=utf-8')
+    return cache_for(response, get_sharing_settings()['ENTRY_MAX_AGE'])
+
+
+@require_safe
+def share_entry_view(request, uuid):
+    try:
+        resume, _, version = get_shared_resume(uuid)
+    except Http404:
+        return not_found_response()
+    return redirect_to_version(resume, version, 'html')
+
+
+@require_safe
+def share_entry_pdf_view(request, uuid):
+    try:
+        resume, _, version = get_shared_resume(uuid)
+    except Http404:
+        return not_found_response()
+    return redirect_to_version(resume, version, 'pdf')
+
+
+@require_safe
+def share_html_view(request, uuid, version):
+    try:
+        resume, versions, current = get_shared_resume(uuid)
+    except Http404:
+        return not_found_response()
+    if version != current:
+        return redirect_to_version(resume, current, 'html')
+
+    def build():
+        theme = get_theme(resume.theme)
+        fragments, _ = render_fragments(resume, get_section_querysets(resume), versions)
+        stylesheet = reverse('share_stylesheet', args=[theme.name, theme.version])
+        html = STYLESHEET_LINK.sub(
+            f'<link rel="stylesheet" type="text/css" href="{stylesheet}">\n    '
+            f'<link rel="alternate" type="application/pdf" href="resume.pdf">',
+            render_layout(resume, fragments), count=1,
+        )
+        return HttpResponse(html, content_type='text/html; charset=utf-8')
+
+    return versioned(request, version, build)
+
+
+@require_safe
+def share_pdf_view(request, uuid, version):
+    try:
+        resume, _, current = get_shared_resume(uuid)
+    except Http404:
+        return not_found_response()
+    if version != current:
+        return redirect_to_version(resume, current, 'pdf')
+
+    def build():
+        pdf, _ = get_or_render_pdf(resume)
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'inline; filename="resume-{resume.uuid}.pdf"'
+        return response
+
+    return versioned(request, version, build)
+
+
+@require_safe
+def share_stylesheet_view(request, name, version):
+    if not is_registered(name) or get_theme(name).version != version:
+        return not_found_response()
+    theme = get_theme(name)
+    return versioned(request, version, lambda: HttpResponse(theme.stylesheet_source, content_type='text/css; charset=utf-8'))
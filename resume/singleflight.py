@@ -0,0 +1,111 @@
+"""
+Single-flight execution: concurrent calls for the same key share one run.
+
+Within a process, the first thread to ask for a key becomes its leader and
+runs the work. Threads that ask while it runs wait for it and get the same
+result, or the same exception. Across processes, leaders of the same key
+take turns through a file lock (fcntl, so POSIX only). The ``lookup`` that
+a leader tries once it holds the lock picks up what an earlier holder left
+in a shared cache.
+
+Nobody waits longer than ``timeout``: a waiter that runs out of patience
+runs the work itself, so one stuck leader can't hang every request behind
+it.
+"""
+import contextlib
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; coalescing is then per process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    ``run(key, compute, lookup)`` returns ``compute()``'s result, computing
+    it at most once at a time per key. Files for the cross-process lock are
+    kept in ``lock_dir``, with keys hashed over ``stripes`` files so they
+    don't pile up. Without a ``lock_dir`` only threads are coalesced.
+    """
+
+    def __init__(self, timeout=30.0, lock_dir=None, stripes=256, on_wait=None):
+        self.timeout = timeout
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        self.stripes = stripes
+        self.on_wait = on_wait or (lambda outcome: None)
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def run(self, key, compute, lookup=None):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            if flight.done.wait(self.timeout):
+                self.on_wait('shared')
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            logger.warning('Gave up waiting for %s after %ss; computing it again', key, self.timeout)
+            self.on_wait('timeout')
+            return compute()
+
+        try:
+            with self.file_lock(key):
+                result = lookup() if lookup else None
+                if result is None:
+                    result = compute()
+            flight.result = result
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    @contextlib.contextmanager
+    def file_lock(self, key):
+        """Hold ``key``'s lock file, or carry on without it after ``timeout``."""
+        if fcntl is None or self.lock_dir is None:
+            yield
+            return
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        stripe = int(hashlib.sha256(key.encode()).hexdigest(), 16) % self.stripes
+        with open(self.lock_dir / f'{stripe}.lock', 'a') as handle:
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.warning('Gave up waiting for the lock on %s after %ss', key, self.timeout)
+                        self.on_wait('timeout')
+                        yield
+                        return
+                    time.sleep(LOCK_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
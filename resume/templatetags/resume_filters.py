@@ -2,16 +2,15 @@ from django import template
 from django.utils.safestring import mark_safe
 import re
 
+from resume.models import split_bullets
+
 register = template.Library()
 
 
 @register.filter
 def linebreaks_to_list(value):
     """Convert line breaks to HTML list items"""
-    if not value:
-        return ""
-    
-    lines = [line.strip() for line in value.split('\n') if line.strip()]
+    lines = split_bullets(value)
     if not lines:
         return ""
     
@@ -62,10 +61,6 @@ def linebreaks_filter(value):
     """
     Split text by line breaks and return as a list for use in templates.
     This is useful for converting description text into bullet points.
+    Prefer the stored ``description_bullets`` where a model has them.
     """
-    if not value:
-        return []
-    
-    # Split by newlines and filter out empty lines
-    lines = [line.strip() for line in value.split('\n') if line.strip()]
-    return lines
+    return split_bullets(value)
@@ -1,10 +1,70 @@
+import asyncio
+import gzip
+import html
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+import zipfile
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework.test import APITestCase
-from rest_framework import status
+from django.utils import timezone
+from django.utils.html import strip_tags
+from rest_framework.test import APIRequestFactory, APITestCase, APITransactionTestCase
+from rest_framework import serializers, status
 from rest_framework_simplejwt.tokens import RefreshToken
-from datetime import date
-from .models import Resume, Education, Experience, Project, Skill, Certification, Achievement
+from resume_builder import metrics
+from resume_builder.db_router import ReplicaRouter, ReplicaRoutingMiddleware
+from resume_builder.profiling import ProfilingMiddleware
+from user.authentication import CachedJWTAuthentication
+from datetime import date, timedelta
+from .models import (
+    Resume, ResumeArchive, Education, Experience, Project, Skill, Certification, Achievement, split_bullets,
+)
+from .serializers import ResumeSerializer, SkillSerializer
+from .views import ResumeViewSet, ValuesListMixin
+from .docx import render_resume_docx
+from . import archive as archive_module, builtin_pdf, docx as docx_module, text as text_module
+from .pdf import (
+    BuiltinBackend, WeasyPrintBackend, acoalesced_render, coalesced_render, fingerprint_from_versions,
+    get_pdf_flights, get_section_querysets, get_section_versions, iter_render_stages, pdf_cache_key,
+    prepare_pdf, render_fragments, render_resume_html, render_resume_pdf, resume_fingerprint,
+)
+from .management.commands.loadtest import HISTOGRAM_BOUNDS_MS, histogram, parse_mix, summarize
+from .singleflight import SingleFlight
+from .values_serializers import get_values_serializer
+from .themes import FRAGMENT_NAMES, get_theme, get_themes
+
+
+def mock_pdf_layout(test):
+    """Replace both PDF backends' layout step with one mock returning a stub document."""
+    document = Mock(pages=[object()])
+    document.write_pdf.return_value = b'%PDF-1.7 test'
+    layout = Mock(return_value=document)
+    for patcher in (patch('resume.pdf.layout_pdf', layout), patch.object(BuiltinBackend, 'layout', layout)):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    return layout
 
 
 class ResumeViewSetTest(APITestCase):
@@ -76,6 +136,272 @@ class ResumeViewSetTest(APITestCase):
         self.assertFalse(Resume.objects.filter(pk=self.resume.pk).exists())
 
 
+class ResumeSoftDeleteTest(APITestCase):
+    """Test deferred deletion of resumes and the purge command"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        self.kept = Resume.objects.create(title='Kept Resume', user=self.user)
+        for resume in (self.resume, self.kept):
+            for n in range(3):
+                Skill.objects.create(resume=resume, name=f'Skill {n}')
+            Experience.objects.create(resume=resume, company='Tech Corp', position='Engineer',
+                                      start_date=date(2020, 1, 1))
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def purge(self, **options):
+        out = io.StringIO()
+        call_command('purge_deleted_resumes', stdout=out, **options)
+        return out.getvalue()
+
+    def test_delete_hides_resume_and_sections(self):
+        """Test a deleted resume and its sections disappear without deleting rows"""
+        response = self.client.delete(reverse('resume-detail', kwargs={'pk': self.resume.pk}))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNotNone(Resume.all_objects.get(pk=self.resume.pk).deleted_at)
+        self.assertEqual(Skill.objects.filter(resume=self.resume).count(), 3)
+        self.assertEqual([r['id'] for r in self.client.get(reverse('resume-list')).data], [self.kept.id])
+        self.assertEqual(len(self.client.get(reverse('skill-list')).data), 3)
+        for url in (reverse('resume-detail', kwargs={'pk': self.resume.pk}),
+                    reverse('download_resume_pdf', kwargs={'resume_id': self.resume.pk})):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_removes_rows_in_batches(self):
+        """Test the purge deletes only pending resumes' rows, and is idempotent"""
+        self.client.delete(reverse('resume-detail', kwargs={'pk': self.resume.pk}))
+
+        self.assertIn('Purged 1 resumes (5 rows)', self.purge(batch_size=2))
+        self.assertFalse(Resume.all_objects.filter(pk=self.resume.pk).exists())
+        self.assertFalse(Skill.objects.filter(resume_id=self.resume.pk).exists())
+        self.assertFalse(Experience.objects.filter(resume_id=self.resume.pk).exists())
+        self.assertEqual(self.kept.skills.count(), 3)
+        self.assertIn('Purged 0 resumes (0 rows)', self.purge())
+
+    def test_purge_grace_period(self):
+        """Test --older-than leaves recent deletions for a later run"""
+        self.client.delete(reverse('resume-detail', kwargs={'pk': self.resume.pk}))
+        self.assertIn('Purged 0 resumes', self.purge(older_than=60))
+        self.assertTrue(Resume.all_objects.filter(pk=self.resume.pk).exists())
+
+
+class ResumeArchiveTest(APITestCase):
+    """Test cold archival of inactive resumes and transparent restores"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Old Resume', name='Test User', user=self.user)
+        self.active = Resume.objects.create(title='Active Resume', user=self.user)
+        for resume in (self.resume, self.active):
+            Experience.objects.create(resume=resume, company='Tech Corp', position='Engineer',
+                                      start_date=date(2020, 1, 1), description='Built APIs\nShipped')
+            Skill.objects.create(resume=resume, name='Python')
+        old = timezone.now() - timedelta(days=400)
+        Resume.objects.filter(pk=self.resume.pk).update(updated_at=old)
+        for model in (Experience, Skill):
+            model.objects.filter(resume=self.resume).update(updated_at=old)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def archive(self, **options):
+        out = io.StringIO()
+        call_command('archive_inactive_resumes', stdout=out, codec='zlib', **options)
+        return out.getvalue()
+
+    def test_archive_moves_sections(self):
+        """Test only inactive resumes are archived, into one compressed row each"""
+        self.assertIn('1 resumes would be archived', self.archive(dry_run=True))
+        self.assertIn('Archived 1 resumes (2 rows', self.archive())
+
+        archive = ResumeArchive.objects.get(resume=self.resume)
+        self.assertEqual((archive.codec, archive.row_count), ('zlib', 2))
+        self.assertFalse(Experience.objects.filter(resume=self.resume).exists())
+        self.assertTrue(Resume.objects.get(pk=self.resume.pk).is_archived)
+        self.assertTrue(Experience.objects.filter(resume=self.active).exists())
+        self.assertIn('Archived 0 resumes', self.archive())
+
+    def test_recent_section_edit_keeps_resume_hot(self):
+        """Test a section edited since the cutoff keeps its resume out of the archive"""
+        Skill.objects.filter(resume=self.resume).update(updated_at=timezone.now())
+        self.assertIn('Archived 0 resumes', self.archive())
+
+    def test_reads_restore_rows_unchanged(self):
+        """Test reading an archived resume restores its rows with ids, timestamps and PDF fingerprint"""
+        experience = Experience.objects.get(resume=self.resume)
+        fingerprint = resume_fingerprint(self.resume)
+        self.archive()
+
+        response = self.client.get(reverse('experience-list'), {'resume': self.resume.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['id'], experience.id)
+        self.assertEqual(response.data[0]['description_bullets'], ['Built APIs', 'Shipped'])
+        restored = Experience.objects.get(pk=experience.pk)
+        self.assertEqual((restored.created_at, restored.updated_at), (experience.created_at, experience.updated_at))
+        self.assertEqual(resume_fingerprint(self.resume), fingerprint)
+        self.assertFalse(ResumeArchive.objects.exists())
+        self.assertFalse(Resume.objects.get(pk=self.resume.pk).is_archived)
+
+    def test_resume_endpoints_restore(self):
+        """Test exports and edits of an archived resume see its sections"""
+        self.archive()
+        text_url = reverse('export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'text'})
+        self.assertIn('Tech Corp', b''.join(self.client.get(text_url).streaming_content).decode())
+
+        self.archive(days=0)
+        self.assertEqual(len(self.client.get(reverse('resume-list')).data), 2)
+        self.assertTrue(ResumeArchive.objects.filter(resume=self.resume).exists())
+        response = self.client.post(reverse('skill-list'), {'resume': self.resume.id, 'name': 'Go'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Skill.objects.filter(resume=self.resume).count(), 2)
+
+    def test_section_writes_restore_only_their_resume(self):
+        """Test editing one resume's sections leaves the user's other archives cold"""
+        self.archive()
+        experience = Experience.objects.get(resume=self.active)
+        response = self.client.patch(reverse('experience-detail', kwargs={'pk': experience.pk}),
+                                     {'company': 'New Corp'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(ResumeArchive.objects.filter(resume=self.resume).exists())
+
+        self.client.post(reverse('skill-list'), {'resume': self.active.id, 'name': 'Go'}, format='json')
+        self.assertTrue(ResumeArchive.objects.filter(resume=self.resume).exists())
+
+    def test_archive_keeps_rows_added_meanwhile(self):
+        """Test a row inserted between the dump and the delete isn't deleted unarchived"""
+        dump_rows = archive_module.dump_rows
+
+        def dump_then_insert(objects):
+            Skill.objects.get_or_create(resume=self.resume, name='Rust')
+            return dump_rows(objects)
+
+        with patch('resume.archive.dump_rows', side_effect=dump_then_insert):
+            self.archive()
+        self.assertEqual(list(Skill.objects.filter(resume=self.resume).values_list('name', flat=True)), ['Rust'])
+
+        response = self.client.get(reverse('skill-list'), {'resume': self.resume.id})
+        self.assertEqual(sorted(item['name'] for item in response.data), ['Python', 'Rust'])
+
+    def test_restore_ignores_removed_fields(self):
+        """Test an archive holding a field later dropped from the model still restores"""
+        self.archive()
+        archive = ResumeArchive.objects.get(resume=self.resume)
+        rows = json.loads(archive_module.decompress(bytes(archive.data), archive.codec))
+        for row in rows:
+            row['fields']['legacy_notes'] = 'dropped by a later migration'
+        archive.data = archive_module.compress(json.dumps(rows).encode(), archive.codec)
+        archive.save()
+
+        response = self.client.get(reverse('experience-list'), {'resume': self.resume.id})
+        self.assertEqual([item['company'] for item in response.data], ['Tech Corp'])
+        self.assertFalse(ResumeArchive.objects.exists())
+
+
+class SectionReorderTest(APITestCase):
+    """Test user-controlled section order and the bulk reorder endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.jobs = [
+            Experience.objects.create(resume=self.resume, company=company, position='Engineer',
+                                      start_date=date(year, 1, 1), end_date=date(year + 1, 1, 1))
+            for company, year in (('Old Corp', 2015), ('Mid Corp', 2018), ('New Corp', 2021))
+        ]
+        self.url = reverse('experience-reorder')
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def companies(self):
+        return [item['company'] for item in self.client.get(reverse('experience-list')).data]
+
+    def test_dates_order_until_reordered(self):
+        """Test rows never reordered keep the date order"""
+        self.assertEqual(self.companies(), ['New Corp', 'Mid Corp', 'Old Corp'])
+
+    def test_reorder_single_update(self):
+        """Test a new order is applied with one UPDATE and honoured by lists, exports and new rows"""
+        old, mid, new = self.jobs
+        text_url = reverse('export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'text'})
+        before = b''.join(self.client.get(text_url).streaming_content).decode()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'resume': self.resume.id, 'order': [old.id, new.id, mid.id]},
+                                        format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['company'] for item in response.data], ['Old Corp', 'New Corp', 'Mid Corp'])
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE WHEN', updates[0])
+
+        self.assertEqual(self.companies(), ['Old Corp', 'New Corp', 'Mid Corp'])
+        after = b''.join(self.client.get(text_url).streaming_content).decode()
+        self.assertNotEqual(before, after)
+        self.assertLess(after.index('Old Corp'), after.index('New Corp'))
+        self.assertLess(after.index('New Corp'), after.index('Mid Corp'))
+
+        self.client.post(reverse('experience-list'), {
+            'resume': self.resume.id, 'company': 'Next Corp', 'position': 'Lead', 'start_date': '2024-01-01',
+        }, format='json')
+        self.assertEqual(self.companies()[-1], 'Next Corp')
+
+    def test_api_rows_keep_date_order(self):
+        """Test rows created through the API in a section never reordered still list newest first"""
+        Experience.objects.filter(resume=self.resume).delete()
+        for company, year in (('First Corp', 2015), ('Third Corp', 2021), ('Second Corp', 2018)):
+            self.client.post(reverse('experience-list'), {
+                'resume': self.resume.id, 'company': company, 'position': 'Engineer', 'start_date': f'{year}-01-01',
+            }, format='json')
+
+        self.assertEqual(self.companies(), ['Third Corp', 'Second Corp', 'First Corp'])
+
+    def test_new_rows_appended_after_reorder(self):
+        """Test rows created through the API after a reorder go after every existing row"""
+        self.client.post(self.url, {'resume': self.resume.id, 'order': [job.id for job in self.jobs]}, format='json')
+        for company in ('Next Corp', 'Last Corp'):
+            self.client.post(reverse('experience-list'), {
+                'resume': self.resume.id, 'company': company, 'position': 'Lead', 'start_date': '2010-01-01',
+            }, format='json')
+
+        self.assertEqual(self.companies(), ['Old Corp', 'Mid Corp', 'New Corp', 'Next Corp', 'Last Corp'])
+
+    def test_skill_order_keeps_categories_together(self):
+        """Test a skill order applies within each category, so categories stay contiguous"""
+        skills = [
+            Skill.objects.create(resume=self.resume, name=name, category=category)
+            for name, category in (('Django', 'Frameworks'), ('Python', 'Languages'),
+                                   ('React', 'Frameworks'), ('Go', 'Languages'))
+        ]
+        django_, python, react, go = skills
+        self.client.post(reverse('skill-reorder'), {
+            'resume': self.resume.id, 'order': [go.id, react.id, python.id, django_.id],
+        }, format='json')
+
+        sections = get_section_querysets(self.resume)
+        self.assertEqual([skill.name for skill in sections['skills']], ['React', 'Django', 'Go', 'Python'])
+        text_url = reverse('export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'text'})
+        text = b''.join(self.client.get(text_url).streaming_content).decode()
+        self.assertEqual(text.count('Frameworks'), 1)
+        self.assertIn('React, Django', text)
+
+    def test_reorder_validation(self):
+        """Test the order must be a permutation of the section's ids on the user's own resume"""
+        old, mid, new = self.jobs
+        other = Resume.objects.create(title='Other', user=User.objects.create_user(username='other'))
+        for data in (
+            {'resume': self.resume.id, 'order': [old.id, mid.id]},
+            {'resume': self.resume.id, 'order': [old.id, old.id, mid.id]},
+            {'resume': self.resume.id, 'order': [old.id, mid.id, new.id, 9999]},
+            {'resume': other.id, 'order': [old.id, mid.id, new.id]},
+        ):
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+        self.assertEqual(self.companies(), ['New Corp', 'Mid Corp', 'Old Corp'])
+
+
 class EducationViewSetTest(APITestCase):
     """Test for EducationViewSet"""
     
@@ -629,3 +955,1678 @@ class ResumePDFDownloadViewTest(APITestCase):
         self.authenticate()
         response = self.client.get(self.invalid_pdf_url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResponseCompressionTest(APITestCase):
+    """Test negotiated compression of API responses"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        for index in range(30):
+            Skill.objects.create(resume=self.resume, name=f'Skill {index}', category='Languages')
+        self.list_url = reverse('skill-list')
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_brotli_preferred_when_accepted(self):
+        """Test brotli is chosen when the client accepts it"""
+        import brotli
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))), 30)
+
+    def test_gzip_fallback(self):
+        """Test gzip is used when brotli is not accepted"""
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 30)
+
+    def test_no_compression_without_accept_encoding(self):
+        """Test identity responses when the client accepts no supported coding"""
+        response = self.client.get(self.list_url)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(len(response.json()), 30)
+
+    def test_small_responses_not_compressed(self):
+        """Test responses below the size threshold are left alone"""
+        url = reverse('resume-detail', kwargs={'pk': self.resume.pk})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(RESPONSE_COMPRESSION={'CONTENT_TYPES': ['text/html']})
+    def test_content_type_allowlist(self):
+        """Test content types outside the allowlist (e.g. PDF, JSON here) are skipped"""
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class MetricsEndpointTest(APITestCase):
+    """Test the Prometheus-format /metrics endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def sample(self, body, line_prefix):
+        for line in body.splitlines():
+            if line.startswith(line_prefix):
+                return float(line.rsplit(' ', 1)[1])
+        return 0.0
+
+    def test_requests_recorded_per_route(self):
+        """Test request counts, latency buckets, query counts and body sizes by route"""
+        key = 'http_requests_total{route="resume-list",method="GET",status="200"}'
+        before = self.sample(self.client.get(reverse('metrics')).content.decode(), key)
+        self.client.get(reverse('resume-list'))
+        self.client.post(reverse('skill-list'), {'resume': self.resume.id, 'name': 'Python'}, format='json')
+
+        response = self.client.get(reverse('metrics'))
+        body = response.content.decode()
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(self.sample(body, key), before + 1)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="resume-list",method="GET",status="200",le="+Inf"}', body)
+        self.assertIn('http_request_db_queries_count{route="resume-list",method="GET"}', body)
+        self.assertIn('http_request_body_bytes_count{route="skill-list",method="POST"}', body)
+
+    def test_async_stack_served_natively(self):
+        """Test the middleware is a coroutine on async stacks and counts queries run in threads"""
+        async def get_response(request):
+            await Resume.objects.acount()
+            await Resume.objects.aexists()
+            return HttpResponse()
+
+        def queries_recorded():
+            row = metrics.request_queries.values.get(('unmatched', 'GET'))
+            return row[-2] if row else 0
+
+        middleware = metrics.MetricsMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        before = queries_recorded()
+        async_to_sync(middleware)(APIRequestFactory().get('/'))
+        self.assertEqual(queries_recorded(), before + 2)
+
+    def test_multiprocess_files_aggregated(self):
+        """Test snapshots written by other workers are summed into the output"""
+        with tempfile.TemporaryDirectory() as directory:
+            # The parent process stands in for another running worker
+            Path(directory, f'metrics-{os.getppid()}-1.json').write_text(json.dumps({
+                'http_requests_total': [[['resume-list', 'GET', '200'], 40]],
+                'pdf_render_pages': [[[], [0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4.0, 2]]],
+            }))
+            with override_settings(METRICS={'MULTIPROCESS_DIR': directory, 'FLUSH_INTERVAL': 0}):
+                self.client.get(reverse('resume-list'))
+                body = self.client.get(reverse('metrics')).content.decode()
+                own_files = list(Path(directory).glob('metrics-*.json'))
+
+        key = 'http_requests_total{route="resume-list",method="GET",status="200"}'
+        self.assertGreaterEqual(self.sample(body, key), 41)
+        self.assertIn('pdf_render_pages_bucket{le="2"} ', body)
+        self.assertGreaterEqual(self.sample(body, 'pdf_render_pages_count'), 2)
+        self.assertEqual(len(own_files), 2)  # the fake worker's and this process's
+
+    def test_exited_workers_archived(self):
+        """Test files of exited workers are folded into the archive, keeping their counts"""
+        key = 'http_requests_total{route="resume-list",method="GET",status="200"}'
+        snapshot = json.dumps({'http_requests_total': [[['resume-list', 'GET', '200'], 10]]})
+        with tempfile.TemporaryDirectory() as directory:
+            # A worker whose pid is gone, and one whose pid a later process reused
+            for name in ('metrics-4194305-1.json', f'metrics-{os.getppid()}-1.json', f'metrics-{os.getppid()}-2.json'):
+                Path(directory, name).write_text(snapshot)
+            with override_settings(METRICS={'MULTIPROCESS_DIR': directory}):
+                before = self.sample(self.client.get(reverse('metrics')).content.decode(), key)
+                files = sorted(path.name for path in Path(directory).glob('*.json')
+                               if not path.name.startswith(f'metrics-{os.getpid()}-'))
+                after = self.sample(self.client.get(reverse('metrics')).content.decode(), key)
+
+        self.assertEqual(files, ['archived.json', f'metrics-{os.getppid()}-2.json'])
+        self.assertGreaterEqual(before, 30)
+        self.assertGreaterEqual(after, before)
+
+    @override_settings(METRICS={'AUTH_TOKEN': 'scrape-secret'})
+    def test_auth_token(self):
+        """Test a configured token is required from the scraper"""
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BatchAPITest(APITestCase):
+    """Test running several API calls through POST /api/batch/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        self.url = reverse('api_batch')
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_subrequests_dispatched_in_order(self):
+        """Test each sub-request's status and body come back under its id, authenticating once"""
+        authenticate = CachedJWTAuthentication.authenticate
+        with patch.object(CachedJWTAuthentication, 'authenticate', autospec=True,
+                          side_effect=authenticate) as mock_authenticate:
+            response = self.client.post(self.url, {'requests': [
+                {'id': 'create', 'method': 'POST', 'path': '/skills/',
+                 'body': {'resume': self.resume.id, 'name': 'Python'}},
+                {'id': 'list', 'method': 'GET', 'path': '/api/skills/'},
+                {'id': 'profile', 'method': 'GET', 'path': '/auth/user/'},
+                {'method': 'GET', 'path': '/missing/'},
+            ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_authenticate.call_count, 1)
+        create, listing, profile, missing = response.data['responses']
+        self.assertEqual((create['id'], create['status']), ('create', 201))
+        self.assertEqual(create['body']['name'], 'Python')
+        self.assertEqual([skill['name'] for skill in listing['body']], ['Python'])
+        self.assertEqual(profile['body']['username'], 'testuser')
+        self.assertEqual(missing['status'], 404)
+        self.assertNotIn('id', missing)
+        self.assertNotIn('rolled_back', response.data)
+
+    def test_atomic_batch_rolled_back_on_failure(self):
+        """Test one failing sub-request undoes the others and skips the rest"""
+        response = self.client.post(self.url, {'atomic': True, 'requests': [
+            {'method': 'POST', 'path': '/skills/', 'body': {'resume': self.resume.id, 'name': 'Python'}},
+            {'method': 'POST', 'path': '/skills/', 'body': {'resume': self.resume.id}},
+            {'method': 'POST', 'path': '/skills/', 'body': {'resume': self.resume.id, 'name': 'Go'}},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['rolled_back'])
+        self.assertEqual([item['status'] for item in response.data['responses']], [201, 400, 424])
+        self.assertFalse(Skill.objects.exists())
+
+    def test_other_users_data_not_reachable(self):
+        """Test sub-requests run as the batch's user"""
+        other = User.objects.create_user(username='other', password='testpass')
+        other_resume = Resume.objects.create(title='Other', user=other)
+        response = self.client.post(self.url, {'requests': [
+            {'method': 'GET', 'path': f'/resumes/{other_resume.id}/'},
+        ]}, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], 404)
+
+    @override_settings(BATCH_API={'MAX_REQUESTS': 2, 'MAX_BODY_BYTES': 100})
+    def test_limits(self):
+        """Test request count, body size, nesting and header limits"""
+        get = {'method': 'GET', 'path': '/resumes/'}
+        cases = [
+            [get, get, get],
+            [{'method': 'POST', 'path': '/skills/', 'body': {'name': 'x' * 200}}],
+            [{'method': 'POST', 'path': '/api/batch/', 'body': {'requests': []}}],
+            [{**get, 'headers': {'Authorization': 'Bearer other'}}],
+            [],
+        ]
+        for requests in cases:
+            response = self.client.post(self.url, {'requests': requests}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, requests)
+
+    def test_requires_authentication(self):
+        """Test anonymous batches are rejected"""
+        self.client.credentials()
+        response = self.client.post(self.url, {'requests': [{'method': 'GET', 'path': '/resumes/'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(DATABASE_REPLICATION={'REPLICAS': ['replica1', 'replica2'], 'STICKY_SECONDS': 5})
+class ReplicaRoutingTest(APITransactionTestCase):
+    """Test read-replica routing of safe requests and read-your-writes pinning"""
+    # Not APITestCase, whose per-test transaction would keep every read on the primary
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = APIRequestFactory()
+
+    def route(self, method='get', token='one', view=None):
+        """Run a request through the middleware; return the read alias its view saw."""
+        seen = []
+
+        def get_response(request):
+            if view:
+                view()
+            seen.append(self.router.db_for_read(Resume))
+            return HttpResponse()
+
+        request = getattr(self.factory, method)('/api/resumes/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        ReplicaRoutingMiddleware(get_response)(request)
+        return seen[0]
+
+    def test_safe_methods_read_from_replicas(self):
+        """Test GETs use a replica and writes, and reads outside requests, use the primary"""
+        self.assertIn(self.route(), ('replica1', 'replica2'))
+        self.assertIsNone(self.router.db_for_read(Resume))
+        self.assertEqual(self.router.db_for_write(Resume), 'default')
+        self.assertIsNone(self.route('post', token='two'))
+
+    def test_client_pinned_after_write(self):
+        """Test a client that wrote reads from the primary until the window ends"""
+        self.route('patch')
+        self.assertIsNone(self.route())
+        self.assertIsNotNone(self.route(token='other'))
+        cache.clear()  # the window expiring
+        self.assertIsNotNone(self.route())
+
+    def test_reads_after_write_in_request_use_primary(self):
+        """Test a GET that writes reads its own write back and pins the client"""
+        self.assertIsNone(self.route(view=lambda: self.router.db_for_write(Resume)))
+        self.assertIsNone(self.route())
+
+    def test_reads_in_transaction_use_primary(self):
+        """Test reads inside an atomic block stay on the primary"""
+        def view():
+            with transaction.atomic():
+                seen.append(self.router.db_for_read(Resume))
+        seen = []
+        self.route(view=view)
+        self.assertEqual(seen, [None])
+
+    def test_async_stack_routed(self):
+        """Test async stacks get a coroutine middleware whose routing reaches ORM threads"""
+        seen = []
+
+        async def get_response(request):
+            seen.append(await sync_to_async(self.router.db_for_read)(Resume))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = self.factory.get('/api/resumes/', HTTP_AUTHORIZATION='Bearer one')
+        async_to_sync(middleware)(request)
+        async_to_sync(middleware)(self.factory.post('/api/resumes/', HTTP_AUTHORIZATION='Bearer one'))
+        async_to_sync(middleware)(request)
+        self.assertIn(seen[0], ('replica1', 'replica2'))
+        self.assertEqual(seen[1:], [None, None])
+
+    @override_settings(DATABASE_REPLICATION={'REPLICAS': []})
+    def test_disabled_without_replicas(self):
+        """Test the middleware removes itself when no replicas are configured"""
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+class SingleFlightTest(SimpleTestCase):
+    """Test coalescing of concurrent identical PDF renders"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.lock_dir = directory.name
+        self.release = threading.Event()
+        self.calls = []
+
+    def compute(self):
+        self.calls.append(threading.get_ident())
+        self.release.wait(5)
+        return b'%PDF'
+
+    def run_concurrently(self, flights, count, lookup=None, hold=0.0):
+        """Start ``count`` calls spread over ``flights``, finish the render after ``hold``s; return results."""
+        results = [None] * count
+
+        def call(index):
+            try:
+                results[index] = flights[index % len(flights)].run('1:abc', self.compute, lookup)
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        time.sleep(hold)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_threads_share_one_render(self):
+        """Test callers arriving during a render get the leader's bytes"""
+        outcomes = []
+        flights = SingleFlight(timeout=5, on_wait=outcomes.append)
+        self.assertEqual(self.run_concurrently([flights], 4), [b'%PDF'] * 4)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(outcomes, ['shared'] * 3)
+        self.assertEqual(flights.flights, {})
+
+    def test_processes_share_through_lock_file(self):
+        """Test a leader holding the file lock makes others pick its result from the cache"""
+        cache_ = {}
+        render = self.compute
+
+        def compute():
+            cache_['pdf'] = render()
+            return cache_['pdf']
+
+        self.compute = compute
+        # Separate instances stand in for processes: only the lock file is shared
+        flights = [SingleFlight(timeout=5, lock_dir=self.lock_dir) for _ in range(3)]
+        self.assertEqual(self.run_concurrently(flights, 3, lookup=lambda: cache_.get('pdf')), [b'%PDF'] * 3)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_timeout_falls_back_to_own_render(self):
+        """Test a waiter renders itself rather than hang behind a stuck leader"""
+        flights = SingleFlight(timeout=0.05)
+        results = self.run_concurrently([flights], 2, hold=0.2)
+        self.assertEqual(results, [b'%PDF'] * 2)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_errors_shared(self):
+        """Test waiters see the leader's failure instead of rendering again"""
+        def compute():
+            self.calls.append(1)
+            self.release.wait(5)
+            raise OSError('layout failed')
+
+        self.compute = compute
+        results = self.run_concurrently([SingleFlight(timeout=5)], 3)
+        self.assertTrue(all(isinstance(result, OSError) for result in results))
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_async_waiters_leave_render_threads_free(self):
+        """Test async requests waiting on a render don't take up the bounded render executor"""
+        resume = Resume(pk=1)
+        slow_calls = []
+
+        def slow():
+            slow_calls.append(1)
+            self.release.wait(5)
+            return b'%PDF-slow'
+
+        waiters = [asyncio.ensure_future(acoalesced_render(resume, 'slow', slow)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        # Another PDF still gets a render thread while the first one's requests wait
+        self.assertEqual(await asyncio.wait_for(acoalesced_render(resume, 'fast', lambda: b'%PDF-fast'), 5),
+                         b'%PDF-fast')
+        self.release.set()
+        self.assertEqual(await asyncio.gather(*waiters), [b'%PDF-slow'] * 3)
+        self.assertEqual(len(slow_calls), 1)
+
+    def test_lock_files_need_shared_pdf_cache(self):
+        """Test workers only take turns on lock files when they can share the result"""
+        coalescing = {'LOCK_DIR': self.lock_dir}
+        with override_settings(PDF_RENDER_COALESCING=coalescing), patch('resume.pdf._pdf_flights', None):
+            self.assertIsNone(get_pdf_flights().lock_dir)
+        with override_settings(PDF_RENDER_COALESCING=coalescing), patch('resume.pdf._pdf_flights', None), \
+                patch('resume.pdf.is_shared_cache', return_value=True):
+            self.assertEqual(str(get_pdf_flights().lock_dir), self.lock_dir)
+
+
+class RequestProfilingTest(APITestCase):
+    """Test opt-in profiling of staff requests"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(REQUEST_PROFILER={
+            'ENABLED': True, 'DIRECTORY': self.directory, 'MAX_PROFILES': 2, 'BACKEND': 'cprofile',
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        self.resume = Resume.objects.create(title='Test Resume', user=self.staff)
+        token = RefreshToken.for_user(self.staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.list_url = reverse('resume-list')
+
+    def test_staff_jwt_request_profiled(self):
+        """Test ?__profile=1 profiles a DRF request and the admin pages serve it"""
+        response = self.client.get(self.list_url, {'__profile': '1'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+        self.assertTrue((self.directory / f'{profile_id}.prof').exists())
+
+        self.client.force_login(self.staff)
+        listing = self.client.get(reverse('admin_profiles'))
+        self.assertContains(listing, profile_id)
+        detail = self.client.get(reverse('admin_profile_detail', args=[profile_id]))
+        self.assertContains(detail, 'cumulative')
+        report = self.client.get(reverse('admin_profile_report', args=[profile_id, 'prof']))
+        self.assertEqual(report.status_code, status.HTTP_200_OK)
+
+    def test_untriggered_and_non_staff_requests_not_profiled(self):
+        """Test profiling needs both the trigger and a staff user"""
+        self.assertFalse(self.client.get(self.list_url).has_header('X-Profile-Id'))
+
+        user = User.objects.create_user(username='member', password='testpass')
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get(self.list_url, HTTP_X_PROFILE='1')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_retention_cap(self):
+        """Test only the newest MAX_PROFILES profiles are kept"""
+        ids = [self.client.get(self.list_url, HTTP_X_PROFILE='1')['X-Profile-Id'] for _ in range(3)]
+
+        self.assertEqual(sorted(path.stem for path in self.directory.glob('*.json')), ids[1:])
+        self.assertFalse(list(self.directory.glob(f'{ids[0]}.*')))
+
+    def test_async_stack_profiled(self):
+        """Test async stacks get a coroutine middleware that still profiles staff requests"""
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = ProfilingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        token = RefreshToken.for_user(self.staff).access_token
+        request = APIRequestFactory().get('/?__profile=1', HTTP_AUTHORIZATION=f'Bearer {token}')
+        profile_id = async_to_sync(middleware)(request)['X-Profile-Id']
+        self.assertTrue((self.directory / f'{profile_id}.json').exists())
+
+
+@override_settings(ROOT_URLCONF='resume_builder.asgi_urls')
+class AsyncReadViewsTest(APITestCase):
+    """Test the native async views used under ASGI"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.other_user = User.objects.create_user(username='otheruser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        self.other_resume = Resume.objects.create(title='Other Resume', user=self.other_user)
+        self.skill = Skill.objects.create(resume=self.resume, name='Python', category='Languages')
+        Skill.objects.create(resume=self.other_resume, name='Go', category='Languages')
+        token = RefreshToken.for_user(self.user).access_token
+        self.auth = {'Authorization': f'Bearer {token}'}
+
+    async def test_resume_list_matches_sync_view(self):
+        """Test async list output is identical to the DRF viewset"""
+        response = await self.async_client.get('/api/resumes/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        sync_view = ResumeViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/resumes/', HTTP_AUTHORIZATION=self.auth['Authorization'])
+        sync_response = await sync_to_async(sync_view)(request)
+        sync_response.render()
+        self.assertEqual(response.content, sync_response.content)
+
+    async def test_section_list_filtered_by_resume(self):
+        """Test section lists keep the ownership and ?resume= filtering"""
+        response = await self.async_client.get(f'/api/skills/?resume={self.resume.pk}', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.json()], ['Python'])
+
+    async def test_detail_of_other_users_resume_404(self):
+        """Test other users' rows are not found"""
+        response = await self.async_client.get(f'/api/resumes/{self.other_resume.pk}/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_unauthenticated_401(self):
+        """Test missing credentials are rejected like DRF does"""
+        response = await self.async_client.get('/api/skills/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+
+    async def test_writes_delegated_to_drf(self):
+        """Test non-GET methods still go through the DRF viewset"""
+        response = await self.async_client.patch(
+            f'/api/skills/{self.skill.pk}/', {'level': 'expert'},
+            content_type='application/json', headers=self.auth,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['level'], 'expert')
+
+    async def test_pdf_of_other_users_resume_404(self):
+        """Test the async PDF view checks ownership"""
+        response = await self.async_client.get(
+            f'/api/resumes/{self.other_resume.pk}/download-pdf/', headers=self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResumePDFRenderProgressViewTest(APITestCase):
+    """Test the Server-Sent Events render progress stream and the PDF cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.other_user = User.objects.create_user(username='otheruser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.other_resume = Resume.objects.create(title='Other Resume', user=self.other_user)
+        self.experience = Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer',
+            start_date=date(2020, 1, 1), description='Built APIs\nShipped features'
+        )
+        self.progress_url = reverse('resume_render_progress', kwargs={'resume_id': self.resume.id})
+        self.pdf_url = reverse('download_resume_pdf', kwargs={'resume_id': self.resume.id})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        # The PDF backends' output isn't under test here; count layouts instead
+        self.layout = mock_pdf_layout(self)
+
+    def read_events(self, response):
+        body = b''.join(response.streaming_content).decode()
+        events = []
+        for block in body.strip().split('\n\n'):
+            lines = dict(line.split(': ', 1) for line in block.split('\n'))
+            events.append((lines['event'], json.loads(lines['data'])))
+        return events
+
+    def test_streams_every_stage_then_done(self):
+        """Test the stream reports each render stage with timings"""
+        response = self.client.get(self.progress_url, HTTP_ACCEPT='text/event-stream')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self.read_events(response)
+        self.assertEqual(
+            [data['stage'] for event, data in events if event == 'stage'],
+            ['querying', 'queued', 'template_rendered', 'layout', 'written', 'cached'],
+        )
+        self.assertIn('duration_ms', events[0][1])
+        self.assertEqual(events[3][1]['pages'], 1)
+        self.assertEqual(events[-1], ('done', {
+            'download_url': self.pdf_url, 'fingerprint': events[-2][1]['fingerprint'],
+        }))
+
+    @override_settings(ROOT_URLCONF='resume_builder.asgi_urls')
+    async def test_async_stream(self):
+        """Test ASGI serves the stream from an async generator, so events aren't held back"""
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        response = await self.async_client.get(self.progress_url, headers={'Authorization': f'Bearer {token}'})
+
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        stages = re.findall(r'"stage": "(\w+)"', body)
+        self.assertEqual(stages, ['querying', 'queued', 'template_rendered', 'layout', 'written', 'cached'])
+        self.assertIn('event: done', body)
+
+    def test_slow_reader_holds_no_render_slot(self):
+        """Test a stream that isn't being read doesn't keep a render slot"""
+        slots = threading.BoundedSemaphore(1)
+        with patch('resume.pdf._render_slots', slots):
+            stages = iter_render_stages(self.resume, 'fingerprint')
+            self.assertEqual([next(stages)['stage'], next(stages)['stage']], ['querying', 'queued'])
+            self.assertTrue(slots.acquire(timeout=5))
+            slots.release()
+            self.assertEqual([stage['stage'] for stage in stages][-1], 'cached')
+
+    def test_stream_shares_concurrent_render(self):
+        """Test a stream for a PDF another request is rendering waits for that render"""
+        release = threading.Event()
+
+        def render():
+            release.wait(5)
+            cache.set(pdf_cache_key('fingerprint'), b'%PDF-1.7 test')
+            return b'%PDF-1.7 test'
+
+        download = threading.Thread(target=coalesced_render, args=(self.resume, 'fingerprint', render))
+        download.start()
+        threading.Timer(0.2, release.set).start()
+        events = list(iter_render_stages(self.resume, 'fingerprint'))
+        download.join()
+
+        self.assertEqual([event['stage'] for event in events], ['querying', 'cached'])
+        self.assertTrue(events[-1]['shared'])
+        self.layout.assert_not_called()
+
+    def test_download_after_stream_reuses_render(self):
+        """Test the final download is served from the cache"""
+        self.read_events(self.client.get(self.progress_url))
+        response = self.client.get(self.pdf_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'%PDF-1.7 test')
+        self.assertEqual(self.layout.call_count, 1)
+
+    def test_cached_resume_reports_hit(self):
+        """Test a second stream is answered from the cache without rendering"""
+        self.read_events(self.client.get(self.progress_url))
+        events = self.read_events(self.client.get(self.progress_url))
+
+        self.assertTrue(events[0][1]['hit'])
+        self.assertEqual(self.layout.call_count, 1)
+
+    def test_section_edit_changes_fingerprint(self):
+        """Test editing a section invalidates the cached PDF"""
+        first = self.client.get(self.pdf_url)['ETag']
+        self.experience.description = 'Led the platform team'
+        self.experience.save()
+        second = self.client.get(self.pdf_url)['ETag']
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.layout.call_count, 2)
+
+    def test_section_delete_changes_fingerprint(self):
+        """Test deleting a section row invalidates the cached PDF"""
+        first = self.client.get(self.pdf_url)['ETag']
+        self.experience.delete()
+
+        self.assertNotEqual(first, self.client.get(self.pdf_url)['ETag'])
+
+    def test_other_users_resume_404(self):
+        """Test user cannot stream another user's render"""
+        url = reverse('resume_render_progress', kwargs={'resume_id': self.other_resume.id})
+        response = self.client.get(url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+def weasyprint_available():
+    try:
+        from weasyprint import HTML
+        return HTML(string='<p>probe</p>').write_pdf().startswith(b'%PDF')
+    except Exception:
+        return False
+
+
+def pdf_text_ops(pdf):
+    """Decompressed content streams of a PDF written by resume.builtin_pdf."""
+    return [
+        zlib.decompress(stream).decode('latin-1')
+        for stream in re.findall(rb'stream\n(.*?)\nendstream', pdf, re.S)
+    ]
+
+
+class BuiltinPDFBackendTest(APITestCase):
+    """Test the built-in layout used by the classic theme"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(
+            title='Test Resume', name='Test User', email='test@example.com', user=self.user,
+        )
+        Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer', location='Remote',
+            start_date=date(2020, 1, 1), description='Built APIs\nShipped features (on time)'
+        )
+        Skill.objects.create(resume=self.resume, name='Python', category='Languages')
+
+    def sections(self):
+        return {name: list(rows) for name, rows in get_section_querysets(self.resume).items()}
+
+    def test_classic_renders_without_weasyprint(self):
+        """Test classic resumes are laid out by the built-in backend"""
+        backend, _ = prepare_pdf(self.resume, self.sections())
+        pdf = render_resume_pdf(self.resume, self.sections())
+
+        self.assertEqual(backend.name, 'builtin')
+        self.assertTrue(pdf.startswith(b'%PDF-1.4'))
+        self.assertIn(b'/Count 1', pdf)
+        content = ''.join(pdf_text_ops(pdf))
+        self.assertIn('(PROFESSIONAL EXPERIENCE)', content)
+        self.assertIn('(Shipped features \\(on time\\))', content)
+        self.assertIn('(Languages:)', content)
+
+    def test_long_resume_paginates_within_margins(self):
+        """Test overflowing content moves to new pages and stays inside the margins"""
+        for index in range(40):
+            Experience.objects.create(
+                resume=self.resume, company=f'Company {index}', position='Engineer',
+                start_date=date(1990 + index % 30, 1, 1), description='One\nTwo\nThree'
+            )
+        document = builtin_pdf.paginate(builtin_pdf.build_flow(self.resume, self.sections()))
+
+        self.assertGreater(len(document.pages), 1)
+        for page in document.pages:
+            for y in re.findall(r'[\d.]+ ([\d.]+) Td', '\n'.join(page)):
+                self.assertGreaterEqual(float(y), builtin_pdf.CONTENT_BOTTOM)
+
+    def test_unencodable_text_falls_back_to_weasyprint(self):
+        """Test text outside the built-in fonts' encoding is left to WeasyPrint"""
+        self.resume.name = 'Иван Петров'
+        backend, source = prepare_pdf(self.resume, self.sections())
+
+        self.assertEqual(backend.name, 'weasyprint')
+        self.assertIn('Иван Петров', source)
+
+    def test_text_matches_template(self):
+        """Test each section sets the words of its template fragment, in the same order"""
+        self.resume.professional_title = 'Backend Engineer'
+        self.resume.phone = '555-0100'
+        self.resume.github_url = 'https://github.com/test'
+        self.resume.save()
+        Education.objects.create(
+            resume=self.resume, school='State University', degree='BSc', field_of_study='Computing',
+            start_date=date(2014, 9, 1), end_date=date(2018, 6, 1), gpa='3.80', description='Graduated with honours'
+        )
+        Project.objects.create(
+            resume=self.resume, name='Resume Builder', start_date=date(2021, 1, 1), description='PDF resumes',
+            technologies='Django, React', project_url='https://example.com', github_url='https://github.com/test/rb'
+        )
+        Skill.objects.create(resume=self.resume, name='Django', category='Frameworks')
+        Skill.objects.create(resume=self.resume, name='SQL', category='Languages')
+        Certification.objects.create(
+            resume=self.resume, name='Cloud Practitioner', issuing_organization='AWS',
+            issue_date=date(2022, 3, 1), credential_id='ABC-123'
+        )
+        Achievement.objects.create(
+            resume=self.resume, title='Hackathon Winner', organization='DevFest',
+            date_achieved=date(2019, 11, 2), description='First of forty teams'
+        )
+        sections = self.sections()
+        fragments, _ = render_fragments(self.resume, sections)
+        flow = builtin_pdf.build_flow(self.resume, sections)
+
+        def drawn_words(group):
+            pages = builtin_pdf.paginate(flow._replace(groups=[group])).pages
+            strings = re.findall(r'\(((?:\\.|[^\\)])*)\) Tj', '\n'.join(op for page in pages for op in page))
+            text = ' '.join(re.sub(r'\\(.)', r'\1', string) for string in strings)
+            # Strings are Windows-1252 bytes; bullet markers aren't text in the HTML
+            return [word for word in text.encode('latin-1').decode('cp1252').casefold().split() if word != '•']
+
+        expected = [html.unescape(strip_tags(fragments[name])).casefold().split() for name in FRAGMENT_NAMES]
+        self.assertEqual([drawn_words(group) for group in flow.groups], [words for words in expected if words])
+
+    def test_fingerprint_follows_backend_version(self):
+        """Test stylesheet edits leave built-in PDFs cached and layout edits don't"""
+        versions = get_section_versions(self.resume)
+        theme = get_theme('classic')
+        fingerprint = fingerprint_from_versions(versions)
+
+        with patch.object(theme, 'version', theme.version + 'css'):
+            self.assertEqual(fingerprint_from_versions(versions), fingerprint)
+        with patch.object(builtin_pdf, 'LAYOUT_VERSION', 'changed'):
+            self.assertNotEqual(fingerprint_from_versions(versions), fingerprint)
+
+        compact = get_theme('compact')
+        versions['theme'] = 'compact'
+        fingerprint = fingerprint_from_versions(versions)
+        with patch.object(compact, 'version', compact.version + 'css'):
+            self.assertNotEqual(fingerprint_from_versions(versions), fingerprint)
+
+    def test_weasyprint_not_imported_at_startup(self):
+        """Test loading the app and its URLs doesn't import WeasyPrint"""
+        script = (
+            'import sys, django; django.setup(); import resume_builder.urls; '
+            'print("weasyprint" in sys.modules)'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'resume_builder.settings'},
+        )
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
+
+    @skipUnless(shutil.which('pdftoppm') and weasyprint_available(), 'needs WeasyPrint and pdftoppm')
+    def test_visual_match_with_weasyprint(self):
+        """Test the built-in layout looks like WeasyPrint's rendering of the classic theme"""
+        from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+        sections = self.sections()
+        theme = get_theme('classic')
+        builtin = BuiltinBackend()
+        weasyprint = WeasyPrintBackend()
+        outputs = {
+            'builtin': builtin.layout(builtin.prepare(self.resume, sections), theme).write_pdf(),
+            'weasyprint': weasyprint.layout(weasyprint.prepare(self.resume, sections), theme).write_pdf(),
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            pages = {}
+            for name, pdf in outputs.items():
+                path = Path(directory, f'{name}.pdf')
+                path.write_bytes(pdf)
+                subprocess.run(['pdftoppm', '-r', '40', '-gray', '-png', path, Path(directory, name)], check=True)
+                pages[name] = [Image.open(page).convert('L') for page in sorted(Path(directory).glob(f'{name}-*.png'))]
+
+        self.assertEqual(len(pages['builtin']), len(pages['weasyprint']))
+        for ours, theirs in zip(pages['builtin'], pages['weasyprint']):
+            # Blur away sub-pixel glyph differences; compare where ink lands
+            ours = ours.resize(theirs.size).filter(ImageFilter.GaussianBlur(3))
+            theirs = theirs.filter(ImageFilter.GaussianBlur(3))
+            self.assertLess(ImageStat.Stat(ImageChops.difference(ours, theirs)).mean[0], 6)
+
+
+class ResumeThemeTest(APITestCase):
+    """Test theme selection and the per-theme compiled artifacts"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.detail_url = reverse('resume-detail', kwargs={'pk': self.resume.id})
+        self.pdf_url = reverse('download_resume_pdf', kwargs={'resume_id': self.resume.id})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.layout = mock_pdf_layout(self)
+
+    def test_list_themes(self):
+        """Test every registered theme is listed"""
+        response = self.client.get(reverse('resume_themes'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in response.data], [theme.name for theme in get_themes()])
+        self.assertIn('modern', [row['name'] for row in response.data])
+
+    def test_select_theme(self):
+        """Test a resume can switch to a registered theme"""
+        response = self.client.patch(self.detail_url, {'theme': 'compact'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.theme, 'compact')
+
+    def test_unknown_theme_rejected(self):
+        """Test selecting an unregistered theme is a validation error"""
+        response = self.client.patch(self.detail_url, {'theme': 'missing'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('theme', response.data)
+
+    def test_theme_change_renders_with_new_theme(self):
+        """Test switching theme invalidates the cached PDF and uses its stylesheet"""
+        first = self.client.get(self.pdf_url)['ETag']
+        self.client.patch(self.detail_url, {'theme': 'modern'}, format='json')
+        second = self.client.get(self.pdf_url)['ETag']
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.layout.call_args_list[-1].args[1], get_theme('modern'))
+
+    def test_template_compiled_once(self):
+        """Test renders reuse the theme's compiled template"""
+        self.resume.theme = 'compact'
+        self.resume.save()
+        theme = get_theme('compact')
+        template = theme.template
+        self.client.get(self.pdf_url)
+        self.resume.save()
+        self.client.get(self.pdf_url)
+
+        self.assertEqual(self.layout.call_count, 2)
+        self.assertIs(theme.template, template)
+
+    def test_unknown_theme_falls_back_to_default(self):
+        """Test a stale theme name still renders with the default theme"""
+        self.assertEqual(get_theme('retired').name, 'classic')
+
+
+class ResumePreviewViewTest(APITestCase):
+    """Test the server-rendered HTML preview and its fragment cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.experience = Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer',
+            start_date=date(2020, 1, 1), description='Built APIs\nShipped features'
+        )
+        Skill.objects.create(resume=self.resume, name='Python', category='Languages')
+        self.url = reverse('resume_preview', kwargs={'resume_id': self.resume.id})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_preview_matches_pdf_html(self):
+        """Test the preview is exactly the HTML WeasyPrint receives"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        uncached = render_resume_html(self.resume, get_section_querysets(self.resume))
+        self.assertEqual(response.content.decode(), uncached)
+        self.assertIn('<li>Shipped features</li>', uncached)
+
+    def test_section_edit_rerenders_only_that_fragment(self):
+        """Test editing one experience re-renders just the experience fragment"""
+        first = self.client.get(self.url)
+        self.assertEqual(len(first['X-Rendered-Fragments'].split(',')), 7)
+
+        self.experience.position = 'Staff Engineer'
+        self.experience.save()
+        with self.assertNumQueries(3):  # resume, versions, then only the experience rows
+            second = self.client.get(self.url)
+
+        self.assertEqual(second['X-Rendered-Fragments'], 'experience')
+        self.assertIn('Staff Engineer', second.content.decode())
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_delete_rerenders_fragment(self):
+        """Test deleting a row invalidates its section's fragment"""
+        self.client.get(self.url)
+        self.experience.delete()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['X-Rendered-Fragments'], 'experience')
+        self.assertNotIn('Tech Corp', response.content.decode())
+
+    def test_not_modified(self):
+        """Test an unchanged resume revalidates with 304"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_fragments_shared_with_pdf(self):
+        """Test the PDF render reuses fragments cached by the preview"""
+        self.client.get(self.url)
+        versions = get_section_versions(self.resume)
+        with self.assertNumQueries(0):
+            html_string = render_resume_html(self.resume, get_section_querysets(self.resume), versions)
+        self.assertEqual(html_string, self.client.get(self.url).content.decode())
+
+    def test_theme_stylesheet(self):
+        """Test the preview's theme stylesheet is served"""
+        response = self.client.get(reverse('resume_theme_stylesheet', kwargs={'name': 'modern'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content.decode(), get_theme('modern').stylesheet_source)
+        missing = self.client.get(reverse('resume_theme_stylesheet', kwargs={'name': 'missing'}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_resume_404(self):
+        """Test user cannot preview another user's resume"""
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        other_resume = Resume.objects.create(title='Other Resume', user=other)
+        response = self.client.get(reverse('resume_preview', kwargs={'resume_id': other_resume.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ValuesListSerializationTest(APITestCase):
+    """Test list endpoints built from values_list() match the serializers byte for byte"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(
+            title='Résumé', user=self.user, name='Zoë Example', website_url='https://example.com/~zoë'
+        )
+        Resume.objects.create(title='Second', user=self.user)
+        Education.objects.create(resume=self.resume, school='MIT', degree='BS', start_date=date(2010, 9, 1), gpa='3.75')
+        Education.objects.create(resume=self.resume, school='ETH', degree='MS', start_date=date(2014, 9, 1),
+                                 end_date=date(2016, 6, 1))
+        Experience.objects.create(resume=self.resume, company='Tech Corp', position='Engineer',
+                                  start_date=date(2020, 1, 1), is_current=True, description='Built APIs\n• Shipped "features"')
+        Project.objects.create(resume=self.resume, name='Builder', technologies='Python, Django',
+                               start_date=date(2021, 1, 1), github_url='https://github.com/example/builder')
+        Skill.objects.create(resume=self.resume, name='Python', level='expert', years_of_experience=8)
+        Skill.objects.create(resume=self.resume, name='Go', category='Languages')
+        Certification.objects.create(resume=self.resume, name='AWS', issuing_organization='Amazon',
+                                     issue_date=date(2022, 1, 1), credential_id='ABC-1')
+        Achievement.objects.create(resume=self.resume, title='Award', date_achieved=date(2023, 1, 1))
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def assertSameAsSerializer(self, url, **params):
+        with patch('resume.views.get_values_serializer', wraps=get_values_serializer) as fast_path:
+            response = self.client.get(url, params)
+        fast_path.assert_called()
+        with patch.object(ValuesListMixin, 'get_values_serializer', return_value=None):
+            expected = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_every_list_endpoint(self):
+        """Test all seven list endpoints give the serializers' exact bytes"""
+        for name in ('resume', 'education', 'experience', 'project', 'skill', 'certification', 'achievement'):
+            with self.subTest(name=name):
+                response = self.assertSameAsSerializer(reverse(f'{name}-list'))
+                self.assertTrue(response.json())
+
+    def test_filtered_and_other_timezone(self):
+        """Test query filters apply and timestamps follow the active timezone"""
+        with timezone.override('Asia/Kolkata'):
+            response = self.assertSameAsSerializer(reverse('education-list'), resume=self.resume.pk)
+        self.assertEqual(len(response.json()), 2)
+        self.assertTrue(response.json()[0]['created_at'].endswith('+05:30'))
+
+    def test_reorder_response(self):
+        """Test the reorder action's list uses the same fast path"""
+        # Skills are ordered within their category
+        Skill.objects.filter(resume=self.resume).update(category='Languages')
+        skills = list(Skill.objects.filter(resume=self.resume).values_list('pk', flat=True))
+        response = self.client.post(reverse('skill-reorder'), {'resume': self.resume.pk, 'order': skills[::-1]},
+                                    format='json')
+        self.assertEqual([skill['id'] for skill in response.json()], skills[::-1])
+
+    def test_include_text_uses_serializer(self):
+        """Test ?include=text keeps the serializer, which adds the export"""
+        with patch('resume.views.get_values_serializer') as fast_path:
+            response = self.client.get(reverse('resume-list'), {'include': 'text'})
+        fast_path.assert_not_called()
+        self.assertIn('text', response.json()[0])
+
+    def test_unsupported_serializer(self):
+        """Test serializers with method fields get no fast path"""
+        class WithMethodField(SkillSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(SkillSerializer.Meta):
+                fields = SkillSerializer.Meta.fields + ['label']
+
+            def get_label(self, obj):
+                return obj.name.upper()
+
+        self.assertIsNone(get_values_serializer(WithMethodField))
+        self.assertIsNone(get_values_serializer(ResumeSerializer))
+        self.assertIsNotNone(get_values_serializer(ResumeSerializer, {'user': 'user__username'}))
+
+
+class DeltaUpdateAutosaveTest(APITestCase):
+    """Test updates write only changed fields and autosaves coalesce"""
+
+    def setUp(self):
+        cache.clear()
+        # Buffering needs a cache other processes could see
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            CACHES={**settings.CACHES, 'autosave': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory.name,
+            }},
+            RESUME_AUTOSAVE={'CACHE_ALIAS': 'autosave'},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.experience = Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer', start_date=date(2020, 1, 1)
+        )
+        self.detail_url = reverse('experience-detail', kwargs={'pk': self.experience.pk})
+        self.autosave_url = reverse('experience-autosave', kwargs={'pk': self.experience.pk})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def updates(self, queries):
+        return [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+
+    def test_noop_put_writes_nothing(self):
+        """Test saving unchanged data leaves the row and its timestamp alone"""
+        data = self.client.get(self.detail_url).json()
+        fingerprint = resume_fingerprint(self.resume)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(self.detail_url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.updates(queries), [])
+        self.assertEqual(response.json()['updated_at'], data['updated_at'])
+        self.assertEqual(resume_fingerprint(self.resume), fingerprint)
+
+    def test_patch_writes_changed_columns(self):
+        """Test a PATCH updates only the changed column and updated_at"""
+        before = self.experience.updated_at
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.detail_url, {'company': 'New Corp', 'position': 'Engineer'}, format='json')
+
+        [update] = self.updates(queries)
+        self.assertIn('"company"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"position"', update)
+        self.experience.refresh_from_db()
+        self.assertEqual(self.experience.company, 'New Corp')
+        self.assertGreater(self.experience.updated_at, before)
+
+    def test_autosave_coalesces_until_next_request(self):
+        """Test rapid autosaves are buffered and written once before the next read"""
+        first = self.client.patch(self.autosave_url, {'company': 'New Corp'}, format='json')
+        second = self.client.patch(self.autosave_url, {'position': 'Lead'}, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.json()['pending'], ['company', 'position'])
+        self.assertEqual(Experience.objects.get(pk=self.experience.pk).company, 'Tech Corp')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url)
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.assertEqual((response.json()['company'], response.json()['position']), ('New Corp', 'Lead'))
+
+    def test_autosave_written_when_window_closes(self):
+        """Test an autosave after the window writes the whole buffer"""
+        now = time.time()
+        with patch('resume.autosave.time.time', return_value=now):
+            self.client.patch(self.autosave_url, {'company': 'New Corp'}, format='json')
+        with patch('resume.autosave.time.time', return_value=now + 5):
+            response = self.client.patch(self.autosave_url, {'position': 'Lead'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.json()['company'], response.json()['position']), ('New Corp', 'Lead'))
+
+    def test_autosave_flush(self):
+        """Test ?flush=1 writes at once, and an unchanged value writes nothing"""
+        response = self.client.patch(f'{self.autosave_url}?flush=1', {'company': 'New Corp'}, format='json')
+        self.assertEqual(response.json()['company'], 'New Corp')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(f'{self.autosave_url}?flush=1', {'company': 'New Corp'}, format='json')
+        self.assertEqual(self.updates(queries), [])
+
+    def test_autosave_validated(self):
+        """Test an invalid delta is rejected without being buffered"""
+        response = self.client.patch(self.autosave_url, {'start_date': 'not a date'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNone(caches['autosave'].get(f'autosave:{self.user.pk}'))
+
+    def test_local_memory_cache_writes_at_once(self):
+        """Test autosaves aren't buffered in a cache other workers can't see"""
+        with override_settings(RESUME_AUTOSAVE={'CACHE_ALIAS': 'default'}):
+            response = self.client.patch(self.autosave_url, {'company': 'New Corp'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Experience.objects.get(pk=self.experience.pk).company, 'New Corp')
+
+    def test_locked_buffer_asks_for_retry(self):
+        """Test a delta isn't written past buffered ones while the user's lock is held"""
+        self.client.patch(self.autosave_url, {'company': 'Older Corp'}, format='json')
+        with patch('resume.autosave.UserLock.acquire', return_value=False):
+            response = self.client.patch(self.autosave_url, {'company': 'Newer Corp'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(Experience.objects.get(pk=self.experience.pk).company, 'Tech Corp')
+
+    def test_preview_includes_pending_autosave(self):
+        """Test the preview writes the owner's buffered edits before rendering"""
+        url = reverse('resume-autosave', kwargs={'pk': self.resume.pk})
+        self.client.patch(url, {'name': 'Renamed User'}, format='json')
+        response = self.client.get(reverse('resume_preview', kwargs={'resume_id': self.resume.pk}))
+        self.assertIn('Renamed User', response.content.decode())
+
+
+class ResumeShareLinkTest(APITestCase):
+    """Test public share links and their HTTP caching"""
+
+    def setUp(self):
+        cache.clear()
+        self.layout = mock_pdf_layout(self)
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Test User', user=self.user)
+        self.experience = Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer', start_date=date(2020, 1, 1)
+        )
+        self.share_url = reverse('resume-share', kwargs={'pk': self.resume.pk})
+        self.entry_url = reverse('share_resume', kwargs={'uuid': self.resume.uuid})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def share(self):
+        response = self.client.post(self.share_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials()  # the public URLs are fetched anonymously
+        return response.data
+
+    def test_not_shared_by_default(self):
+        """Test a resume is private until its owner shares it"""
+        response = self.client.get(self.share_url)
+        self.assertEqual(response.data, {'shared': False, 'url': None, 'pdf_url': None})
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.entry_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_entry_redirects_to_immutable_version(self):
+        """Test the entry URL redirects briefly to a versioned, immutable page"""
+        data = self.share()
+        self.assertTrue(data['shared'])
+        self.assertEqual(data['url'], f'http://testserver{self.entry_url}')
+
+        entry = self.client.get(self.entry_url)
+        self.assertEqual(entry.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(entry['Cache-Control'], 'public, max-age=60')
+
+        page = self.client.get(entry['Location'])
+        self.assertEqual(page.status_code, status.HTTP_200_OK)
+        self.assertEqual(page['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertIn('Tech Corp', page.content.decode())
+        theme = get_theme(self.resume.theme)
+        stylesheet = reverse('share_stylesheet', kwargs={'name': theme.name, 'version': theme.version})
+        self.assertIn(f'href="{stylesheet}"', page.content.decode())
+
+        revalidated = self.client.get(entry['Location'], HTTP_IF_NONE_MATCH=page['ETag'])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_compressed_page_keeps_strong_etag(self):
+        """Test a compressed share gets a strong ETag per coding that revalidates"""
+        self.share()
+        url = self.client.get(self.entry_url)['Location']
+        version = url.rstrip('/').rsplit('/', 1)[1]
+
+        page = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        encoding = page['Content-Encoding']
+        self.assertEqual(page['ETag'], f'"{version}-{encoding}"')
+        self.assertIn('Accept-Encoding', page['Vary'])
+        self.assertEqual(self.client.get(url)['ETag'], f'"{version}"')
+
+        revalidated = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br', HTTP_IF_NONE_MATCH=page['ETag'])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated['ETag'], page['ETag'])
+        self.assertIn('Accept-Encoding', revalidated['Vary'])
+
+    def test_pdf(self):
+        """Test the shared PDF is served inline from the PDF cache"""
+        data = self.share()
+        entry = self.client.get(data['pdf_url'])
+        self.assertTrue(entry['Location'].endswith('/resume.pdf'))
+        response = self.client.get(entry['Location'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'%PDF-1.7 test')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.client.get(entry['Location'])
+        self.assertEqual(self.layout.call_count, 1)
+
+    def test_edit_changes_version(self):
+        """Test an edit moves the resume to new URLs and old ones redirect"""
+        self.share()
+        old = self.client.get(self.entry_url)['Location']
+        self.experience.position = 'Staff Engineer'
+        self.experience.save()
+
+        new = self.client.get(self.entry_url)['Location']
+        self.assertNotEqual(old, new)
+        stale = self.client.get(old)
+        self.assertEqual(stale.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(stale['Location'], new)
+        self.assertIn('Staff Engineer', self.client.get(new).content.decode())
+
+    def test_revoke(self):
+        """Test revoking 404s every URL and sharing again gives new versions"""
+        self.share()
+        old = self.client.get(self.entry_url)['Location']
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.delete(self.share_url)
+        self.assertFalse(response.data['shared'])
+        self.client.credentials()
+
+        self.assertEqual(self.client.get(self.entry_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(old).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.share()
+        self.assertNotEqual(self.client.get(self.entry_url)['Location'], old)
+
+    def test_sharing_keeps_pdf_cache(self):
+        """Test turning sharing on doesn't change the PDF fingerprint"""
+        fingerprint = resume_fingerprint(self.resume)
+        self.share()
+        self.assertEqual(resume_fingerprint(self.resume), fingerprint)
+
+    def test_stylesheet(self):
+        """Test theme stylesheets are served only at their current version"""
+        theme = get_theme('modern')
+        response = self.client.get(reverse('share_stylesheet', kwargs={'name': 'modern', 'version': theme.version}))
+        self.assertEqual(response.content.decode(), theme.stylesheet_source)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        stale = self.client.get(reverse('share_stylesheet', kwargs={'name': 'modern', 'version': 'old'}))
+        self.assertEqual(stale.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_resume(self):
+        """Test only the owner can share a resume"""
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        other_resume = Resume.objects.create(title='Other Resume', user=other)
+        response = self.client.post(reverse('resume-share', kwargs={'pk': other_resume.pk}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        other_resume.refresh_from_db()
+        self.assertEqual(other_resume.share_key, '')
+
+
+class ResumeAdminTest(APITestCase):
+    """Test the admin pages stay at a fixed number of queries"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='testpass')
+        self.client.force_login(self.admin)
+        for i in range(5):
+            user = User.objects.create_user(username=f'user{i}', password='testpass')
+            resume = Resume.objects.create(title=f'Resume {i}', user=user)
+            Education.objects.create(resume=resume, school='MIT', degree='BS', start_date=date(2010, 1, 1))
+            Experience.objects.create(resume=resume, company='Tech Corp', position='Engineer', start_date=date(2020, 1, 1))
+            Project.objects.create(resume=resume, name='Resume builder', start_date=date(2021, 1, 1))
+            Skill.objects.create(resume=resume, name='Python', level='expert')
+            Certification.objects.create(resume=resume, name='AWS', issuing_organization='Amazon', issue_date=date(2022, 1, 1))
+            Achievement.objects.create(resume=resume, title='Award', date_achieved=date(2023, 1, 1))
+        self.resume = resume
+
+    def test_changelists(self):
+        """Test every changelist runs the same queries however many rows it shows"""
+        # session, admin user, bounded count, rows (with their resume and user)
+        for model in (Resume, Education, Experience, Project, Skill, Certification, Achievement):
+            with self.subTest(model=model.__name__):
+                url = reverse(f'admin:resume_{model._meta.model_name}_changelist')
+                with self.assertNumQueries(4):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.context['cl'].result_list), 5)
+
+    def test_estimated_count(self):
+        """Test counts past EXACT_COUNT_LIMIT stop at the limit"""
+        url = reverse('admin:resume_resume_changelist')
+        with override_settings(ADMIN_PAGINATION={'EXACT_COUNT_LIMIT': 3}):
+            response = self.client.get(url)
+        self.assertEqual(response.context['cl'].result_count, 3)
+        self.assertEqual(self.client.get(url).context['cl'].result_count, 5)
+
+    def test_indexed_search(self):
+        """Test search matches ids, uuids and usernames exactly"""
+        url = reverse('admin:resume_experience_changelist')
+        for term in (self.resume.uuid, 'user4', self.resume.experience.get().pk):
+            with self.subTest(term=term):
+                results = self.client.get(url, {'q': term}).context['cl'].result_list
+                self.assertEqual([row.resume_id for row in results], [self.resume.pk])
+        self.assertEqual(len(self.client.get(url, {'q': 'user'}).context['cl'].result_list), 0)
+
+    def test_section_inlines_lazy(self):
+        """Test the change page counts sections and only loads the one asked for"""
+        url = reverse('admin:resume_resume_change', args=[self.resume.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.context['inline_admin_formsets'], [])
+        self.assertContains(response, '<a href="?section=experience">Experience</a> (1)')
+
+        response = self.client.get(url, {'section': 'experience'})
+        [formset] = response.context['inline_admin_formsets']
+        self.assertEqual(formset.opts.model, Experience)
+        self.assertContains(response, 'Tech Corp')
+
+    def test_deleted_resumes_listed_and_restored(self):
+        """Test resumes pending deletion can be filtered for, opened and restored"""
+        Resume.all_objects.filter(pk=self.resume.pk).update(deleted_at=timezone.now())
+        url = reverse('admin:resume_resume_changelist')
+
+        self.assertEqual(len(self.client.get(url).context['cl'].result_list), 5)
+        results = self.client.get(url, {'deleted_at__isnull': 'False'}).context['cl'].result_list
+        self.assertEqual([resume.pk for resume in results], [self.resume.pk])
+        change = self.client.get(reverse('admin:resume_resume_change', args=[self.resume.pk]))
+        self.assertEqual(change.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(url, {
+            'action': 'restore_deleted', '_selected_action': [self.resume.pk, self.resume.pk - 1],
+        })
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertTrue(Resume.objects.filter(pk=self.resume.pk).exists())
+
+
+class DescriptionBulletsTest(APITestCase):
+    """Test descriptions are split into bullets once, at write time"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', user=self.user)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_split_bullets(self):
+        """Test blank lines, whitespace and bullet markers are normalised away"""
+        self.assertEqual(
+            split_bullets('  • Built APIs \n\n- Shipped features\r\n* Led team\n-5% latency'),
+            ['Built APIs', 'Shipped features', 'Led team', '-5% latency'],
+        )
+        self.assertEqual(split_bullets(''), [])
+
+    def test_bullets_stored_on_save(self):
+        """Test every model with a description stores its bullets"""
+        experience = Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer',
+            start_date=date(2020, 1, 1), description='Built APIs\nShipped features'
+        )
+        project = Project.objects.create(
+            resume=self.resume, name='App', description='One\nTwo',
+            technologies='Python', start_date=date(2021, 1, 1)
+        )
+        experience.refresh_from_db()
+        project.refresh_from_db()
+        self.assertEqual(experience.description_bullets, ['Built APIs', 'Shipped features'])
+        self.assertEqual(project.description_bullets, ['One', 'Two'])
+
+    def test_update_fields_includes_bullets(self):
+        """Test saving only the description still refreshes its bullets"""
+        achievement = Achievement.objects.create(
+            resume=self.resume, title='Award', description='Old', date_achieved=date(2022, 1, 1)
+        )
+        achievement.description = 'New\nLine'
+        achievement.save(update_fields=['description'])
+        achievement.refresh_from_db()
+        self.assertEqual(achievement.description_bullets, ['New', 'Line'])
+
+    def test_api_returns_read_only_bullets(self):
+        """Test the API exposes bullets and ignores client-supplied ones"""
+        response = self.client.post(reverse('experience-list'), {
+            'resume': self.resume.id, 'company': 'Tech Corp', 'position': 'Engineer',
+            'start_date': '2020-01-01', 'description': 'Built APIs\nShipped features',
+            'description_bullets': ['Injected'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['description_bullets'], ['Built APIs', 'Shipped features'])
+
+
+class ResumeDOCXDownloadViewTest(APITestCase):
+    """Test the streamed OOXML Word export"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(title='Test Resume', name='Ada & Co <Dev>', user=self.user)
+        Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer',
+            start_date=date(2020, 1, 1), description='Built APIs\nShipped features'
+        )
+        Skill.objects.create(resume=self.resume, name='Python', category='Languages')
+        self.url = reverse('download_resume_docx', kwargs={'resume_id': self.resume.id})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def read_package(self, response):
+        return zipfile.ZipFile(io.BytesIO(response.content))
+
+    def test_download_docx(self):
+        """Test the download is a Word package holding the resume"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response['Content-Type'],
+            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        )
+        self.assertIn(f'resume_Test_Resume_{self.resume.id}.docx', response['Content-Disposition'])
+        package = self.read_package(response)
+        self.assertEqual(package.namelist()[0], '[Content_Types].xml')
+        document = package.read('word/document.xml').decode()
+        self.assertIn('Ada &amp; Co &lt;Dev&gt;', document)
+        self.assertIn('Shipped features', document)
+        self.assertIn('Languages: ', document)
+
+    def test_cached_by_fingerprint(self):
+        """Test an unchanged resume is built once and shares the PDF's ETag"""
+        with patch('resume.docx.render_resume_docx', wraps=render_resume_docx) as build:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+            self.assertEqual(first['ETag'], f'"{resume_fingerprint(self.resume)}-{docx_module.FORMAT_VERSION}"')
+            self.resume.save()
+            third = self.client.get(self.url)
+
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(first.content, second.content)
+        self.assertNotEqual(first['ETag'], third['ETag'])
+
+    def test_format_version_invalidates(self):
+        """Test a new exporter version rebuilds cached documents and changes the ETag"""
+        with patch('resume.docx.render_resume_docx', wraps=render_resume_docx) as build:
+            first = self.client.get(self.url)
+            with patch.object(docx_module, 'FORMAT_VERSION', 'changed'):
+                second = self.client.get(self.url)
+
+        self.assertEqual(build.call_count, 2)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_other_users_resume_404(self):
+        """Test user cannot download another user's resume"""
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        other_resume = Resume.objects.create(title='Other Resume', user=other)
+        response = self.client.get(reverse('download_resume_docx', kwargs={'resume_id': other_resume.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResumeTextExportViewTest(APITestCase):
+    """Test the streamed plain-text and Markdown exports"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.resume = Resume.objects.create(
+            title='Test Resume', name='Test User', professional_title='Engineer_1', user=self.user
+        )
+        Experience.objects.create(
+            resume=self.resume, company='Tech Corp', position='Engineer',
+            start_date=date(2020, 1, 1), is_current=True, description='Built APIs\nShipped features'
+        )
+        Education.objects.create(
+            resume=self.resume, school='State U', degree='BSc',
+            start_date=date(2014, 9, 1), end_date=date(2018, 6, 1)
+        )
+        self.text_url = reverse('export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'text'})
+        self.markdown_url = reverse(
+            'export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'markdown'}
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_plain_text_export(self):
+        """Test the text export is streamed with year ranges and bullets"""
+        response = self.client.get(self.text_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        text = b''.join(response.streaming_content).decode()
+        self.assertTrue(text.startswith('TEST USER\nEngineer_1\n'))
+        self.assertIn('Engineer, Tech Corp (2020 - Present)\n- Built APIs\n- Shipped features\n', text)
+        self.assertIn('BSc, State U (2014 - 2018)', text)
+        self.assertLess(text.index('EDUCATION'), text.index('PROFESSIONAL EXPERIENCE'))
+
+    def test_markdown_export(self):
+        """Test the Markdown export escapes user text"""
+        response = self.client.get(self.markdown_url)
+
+        self.assertEqual(response['Content-Type'], 'text/markdown; charset=utf-8')
+        text = b''.join(response.streaming_content).decode()
+        self.assertTrue(text.startswith('# Test User\n\n**Engineer\\_1**\n'))
+        self.assertIn('### Engineer - Tech Corp\n*2020 - Present*', text)
+
+    def test_cached_then_not_modified(self):
+        """Test a finished export is cached and revalidates with 304"""
+        first = self.client.get(self.text_url)
+        body = b''.join(first.streaming_content)
+
+        with self.assertNumQueries(2):  # resume, fingerprint
+            second = self.client.get(self.text_url)
+        self.assertFalse(second.streaming)
+        self.assertEqual(second.content, body)
+
+        response = self.client.get(self.text_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_format_version_invalidates(self):
+        """Test a new exporter version bypasses cached exports and their ETags"""
+        first = self.client.get(self.text_url)
+        b''.join(first.streaming_content)
+
+        with patch.object(text_module, 'FORMAT_VERSION', 'changed'):
+            response = self.client.get(self.text_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_unknown_format_404(self):
+        """Test only text and markdown are exported"""
+        url = reverse('export_resume_text', kwargs={'resume_id': self.resume.id, 'output_format': 'rtf'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_inlines_text(self):
+        """Test ?include=text adds each export to the list without per-resume queries"""
+        other = Resume.objects.create(title='Second', name='Second User', user=self.user)
+        Skill.objects.create(resume=other, name='Python', category='Languages')
+
+        with self.assertNumQueries(9):  # user, archived resumes, resumes, one per section
+            response = self.client.get(reverse('resume-list'), {'include': 'text'})
+
+        texts = {row['id']: row['text'] for row in response.data}
+        self.assertIn('- Shipped features', texts[self.resume.id])
+        self.assertIn('Languages: Python', texts[other.id])
+        self.assertNotIn('text', self.client.get(reverse('resume-list')).data[0])
+
+
+class GenerateDatasetCommandTest(APITestCase):
+    """Test the synthetic dataset generator"""
+
+    def generate(self, **options):
+        call_command('generate_dataset', stdout=io.StringIO(), **options)
+        return [
+            (resume.title, resume.phone, resume.theme, str(resume.uuid),
+             [(exp.company, exp.start_date, exp.description_bullets) for exp in resume.experience.all()],
+             sorted(resume.skills.values_list('name', 'level')))
+            for resume in Resume.objects.filter(user__username__startswith='gen').order_by('user__username', 'id')
+        ]
+
+    def test_deterministic_for_seed(self):
+        """Test the same seed reproduces the same rows, with bullets filled in"""
+        first = self.generate(users=3, resumes=2, seed=7)
+        self.assertEqual(len(first), 6)
+        self.assertTrue(all(bullets for row in first for _, _, bullets in row[4]))
+
+        User.objects.filter(username__startswith='gen').delete()
+        self.assertEqual(self.generate(users=3, resumes=2, seed=7), first)
+
+    def test_existing_prefix_rejected(self):
+        """Test generating twice under one prefix fails instead of colliding"""
+        self.generate(users=1, resumes=1)
+        with self.assertRaises(CommandError):
+            self.generate(users=1, resumes=1)
+
+
+class LoadTestCommandTest(SimpleTestCase):
+    """Test the load test's report helpers and a short in-process run"""
+
+    def test_parse_mix(self):
+        """Test weights parse, default to 1 and reject unknown operations and empty mixes"""
+        self.assertEqual(parse_mix('login=1, list=6,pdf'), {'login': 1.0, 'list': 6.0, 'pdf': 1.0})
+        for value in ('login=1,upload=2', 'list=fast', 'login=0,list=0'):
+            with self.assertRaises(CommandError):
+                parse_mix(value)
+
+    def test_histogram_buckets(self):
+        """Test latencies land in the first bucket whose bound they don't exceed"""
+        counts = histogram([0.0005, 0.001, 0.0011, 0.05, 4.9, 6.0])
+
+        self.assertEqual(list(counts), [f'<={bound}' for bound in HISTOGRAM_BOUNDS_MS] + ['>5000'])
+        self.assertEqual(counts['<=1'], 2)
+        self.assertEqual(counts['<=2'], 1)
+        self.assertEqual(counts['<=50'], 1)
+        self.assertEqual(counts['<=5000'], 1)
+        self.assertEqual(counts['>5000'], 1)
+        self.assertEqual(sum(counts.values()), 6)
+
+    def test_summarize(self):
+        """Test counts, rates and percentiles of (latency, ok, status) samples"""
+        samples = [(0.010, True, 200)] * 8 + [(0.100, False, 500), (1.0, False, 'connection_error')]
+        summary = summarize(samples, elapsed=2.0)
+
+        self.assertEqual(summary['requests'], 10)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['error_rate'], 0.2)
+        self.assertEqual(summary['throughput_rps'], 5.0)
+        self.assertEqual((summary['p50_ms'], summary['p99_ms']), (10.0, 1000.0))
+        self.assertEqual(summary['status_counts'], {'200': 8, '500': 1, 'connection_error': 1})
+        self.assertEqual(summary['histogram_ms']['<=10'], 8)
+        self.assertEqual(summarize([], elapsed=0)['p50_ms'], None)
+
+    def test_in_process_run(self):
+        """Test a short run against the in-process server covers every operation without errors"""
+        # A process of its own: the throwaway database can't replace the test run's in-memory one
+        result = subprocess.run(
+            [sys.executable, 'manage.py', 'loadtest', '--clients', '2', '--duration', '1',
+             '--mix', 'login=1,list=2,crud=1,pdf=1', '--json'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'resume_builder.settings'},
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout)
+
+        self.assertEqual((report['target'], report['clients']), ('in-process', 2))
+        self.assertGreater(report['overall']['requests'], 0)
+        self.assertEqual(report['overall']['errors'], 0, report['operations'])
+        self.assertLessEqual(set(report['operations']), {
+            'login', 'list', 'pdf', 'section_create', 'section_update', 'section_delete',
+        })
+        self.assertIn('login', report['operations'])
@@ -0,0 +1,239 @@
+"""
+Plain-text and Markdown export, for applicant tracking systems and pasting.
+
+Walks the same sections as the PDF and formats every date range with the
+format_date_range filter. Output is produced as a stream of lines and is
+cheap enough (no template engine, no layout) to inline in list responses.
+Cached exports are keyed on FORMAT_VERSION as well as the fingerprint.
+"""
+import hashlib
+import re
+from itertools import groupby
+from pathlib import Path
+
+from django.conf import settings
+
+from .pdf import get_pdf_cache
+from .templatetags.resume_filters import format_date_range
+
+# Part of the cache key and ETag: any edit to this module invalidates cached exports
+FORMAT_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+TEXT_FORMATS = {
+    'text': ('text/plain; charset=utf-8', 'txt'),
+    'markdown': ('text/markdown; charset=utf-8', 'md'),
+}
+
+MARKDOWN_SPECIAL = re.compile(r'([\\`*_\[\]<>#|])')
+
+
+class PlainTextFormatter:
+    def escape(self, text):
+        return text
+
+    def title(self, name):
+        yield name.upper()
+
+    def subtitle(self, text):
+        yield text
+
+    def contact(self, values):
+        yield ' | '.join(values)
+
+    def links(self, links):
+        yield '  '.join(f'{label}: {url}' for label, url in links)
+
+    def heading(self, text):
+        yield ''
+        yield text.upper()
+        yield '-' * len(text)
+
+    def item(self, title, subtitle=None, dates=None):
+        line = title
+        if subtitle:
+            line += f', {subtitle}'
+        if dates:
+            line += f' ({dates})'
+        yield line
+
+    def labelled(self, label, value):
+        yield f'{label}: {value}'
+
+    def line(self, text):
+        yield text
+
+    def bullet(self, text):
+        yield f'- {text}'
+
+
+class MarkdownFormatter(PlainTextFormatter):
+    def escape(self, text):
+        return MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+    def title(self, name):
+        yield f'# {self.escape(name)}'
+
+    def subtitle(self, text):
+        yield ''
+        yield f'**{self.escape(text)}**'
+
+    def contact(self, values):
+        yield ''
+        yield ' | '.join(self.escape(value) for value in values)
+
+    def links(self, links):
+        yield ''
+        yield ' | '.join(f'[{label}](<{url}>)' for label, url in links)
+
+    def heading(self, text):
+        yield ''
+        yield f'## {text}'
+
+    def item(self, title, subtitle=None, dates=None):
+        yield ''
+        line = f'### {self.escape(title)}'
+        if subtitle:
+            line += f' - {self.escape(subtitle)}'
+        yield line
+        if dates:
+            yield f'*{dates}*  '
+
+    def labelled(self, label, value):
+        yield f'**{label}:** {self.escape(value)}  '
+
+    def line(self, text):
+        yield f'{self.escape(text)}  '
+
+    def bullet(self, text):
+        yield f'- {self.escape(text)}'
+
+
+FORMATTERS = {
+    'text': PlainTextFormatter(),
+    'markdown': MarkdownFormatter(),
+}
+
+
+def iter_education(fmt, rows):
+    for edu in rows:
+        title = edu.degree + (f' in {edu.field_of_study}' if edu.field_of_study else '')
+        yield from fmt.item(title, edu.school, format_date_range(edu.start_date, edu.end_date))
+        if edu.gpa:
+            yield from fmt.labelled('GPA', str(edu.gpa))
+        for line in edu.description_bullets:
+            yield from fmt.line(line)
+
+
+def iter_experience(fmt, rows):
+    for exp in rows:
+        end_date = None if exp.is_current else exp.end_date
+        yield from fmt.item(exp.position, exp.company, format_date_range(exp.start_date, end_date))
+        if exp.location:
+            yield from fmt.line(exp.location)
+        for bullet in exp.description_bullets:
+            yield from fmt.bullet(bullet)
+
+
+def iter_projects(fmt, rows):
+    for project in rows:
+        yield from fmt.item(project.name, dates=format_date_range(project.start_date, project.end_date))
+        for line in project.description_bullets:
+            yield from fmt.line(line)
+        if project.technologies:
+            yield from fmt.labelled('Technologies', project.technologies)
+        if project.project_url:
+            yield from fmt.labelled('URL', project.project_url)
+        if project.github_url:
+            yield from fmt.labelled('GitHub', project.github_url)
+
+
+def iter_skills(fmt, rows):
+    for category, skills in groupby(rows, key=lambda skill: skill.category):
+        yield from fmt.labelled(category or 'General', ', '.join(skill.name for skill in skills))
+
+
+def iter_certifications(fmt, rows):
+    for cert in rows:
+        yield from fmt.item(cert.name, cert.issuing_organization,
+                            format_date_range(cert.issue_date, cert.expiration_date))
+        if cert.credential_id:
+            yield from fmt.labelled('Credential ID', cert.credential_id)
+        if cert.credential_url:
+            yield from fmt.labelled('URL', cert.credential_url)
+
+
+def iter_achievements(fmt, rows):
+    for achievement in rows:
+        dates = achievement.date_achieved.strftime('%Y') if achievement.date_achieved else None
+        yield from fmt.item(achievement.title, achievement.organization or None, dates)
+        for line in achievement.description_bullets:
+            yield from fmt.line(line)
+
+
+SECTIONS = (
+    ('education', 'Education', iter_education),
+    ('experience', 'Professional Experience', iter_experience),
+    ('projects', 'Projects', iter_projects),
+    ('skills', 'Skills', iter_skills),
+    ('certifications', 'Certifications', iter_certifications),
+    ('achievements', 'Achievements', iter_achievements),
+)
+
+
+def iter_resume_lines(resume, sections, output_format='text'):
+    """Yield the resume one line at a time (without newlines)."""
+    fmt = FORMATTERS[output_format]
+    yield from fmt.title(resume.name or resume.title or 'Resume')
+    if resume.professional_title:
+        yield from fmt.subtitle(resume.professional_title)
+    contact = [value for value in (resume.email, resume.phone, resume.location) if value]
+    if contact:
+        yield from fmt.contact(contact)
+    links = [
+        (label, url) for label, url in (
+            ('LinkedIn', resume.linkedin_url), ('GitHub', resume.github_url),
+            ('Website', resume.website_url), ('Twitter', resume.twitter_url),
+        ) if url
+    ]
+    if links:
+        yield from fmt.links(links)
+    for name, title, iter_rows in SECTIONS:
+        rows = list(sections[name])
+        if rows:
+            yield from fmt.heading(title)
+            yield from iter_rows(fmt, rows)
+
+
+def iter_resume_text(resume, sections, output_format='text'):
+    """Yield the export in newline-terminated chunks, ready to stream."""
+    for line in iter_resume_lines(resume, sections, output_format):
+        yield line + '\n'
+
+
+def render_resume_text(resume, sections, output_format='text'):
+    return ''.join(iter_resume_text(resume, sections, output_format))
+
+
+def text_cache_key(fingerprint, output_format):
+    return f'resume-{output_format}:{FORMAT_VERSION}:{fingerprint}'
+
+
+def text_etag(fingerprint, output_format):
+    return f'"{fingerprint}-{output_format}-{FORMAT_VERSION}"'
+
+
+def iter_and_cache(chunks, fingerprint, output_format):
+    """Pass ``chunks`` through and cache the whole export once fully produced."""
+    produced = []
+    for chunk in chunks:
+        produced.append(chunk)
+        yield chunk
+    get_pdf_cache().set(
+        text_cache_key(fingerprint, output_format), ''.join(produced),
+        getattr(settings, 'PDF_CACHE_TIMEOUT', 86400),
+    )
+
+
+def text_filename(resume, output_format):
+    title = resume.title.replace(' ', '_') if resume.title else 'resume'
+    return f"resume_{title}_{resume.id}.{TEXT_FORMATS[output_format][1]}"
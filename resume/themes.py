@@ -0,0 +1,139 @@
+"""
+Resume themes: a registry of template and stylesheet pairs for the PDF.
+
+Each theme compiles its layout and section templates and parses its
+stylesheet once per process, the first time it renders, and reuses those
+objects for every later render. Adding themes therefore adds no
+per-request parse cost.
+
+Themes come from the RESUME_THEMES setting (see DEFAULT_THEMES for the
+shape) and a resume picks one by name in Resume.theme.
+"""
+import hashlib
+import os
+from functools import cached_property
+
+from django.conf import settings
+from django.template.loader import get_template
+
+DEFAULT_THEME = 'classic'
+
+# Independently rendered (and cached) parts of a resume, in page order
+FRAGMENT_NAMES = (
+    'header', 'education', 'experience', 'projects', 'skills', 'certifications', 'achievements',
+)
+
+DEFAULT_THEMES = [
+    {
+        'name': 'classic',
+        'label': 'Classic',
+        'template': 'pdf/resume_pdf.html',
+        'stylesheet': 'pdf/resume_pdf_styles.css',
+        # Laid out without WeasyPrint; see resume.builtin_pdf
+        'pdf_backend': 'builtin',
+    },
+    {
+        'name': 'compact',
+        'label': 'Compact',
+        'template': 'pdf/resume_pdf.html',
+        'stylesheet': 'pdf/themes/compact.css',
+    },
+    {
+        'name': 'modern',
+        'label': 'Modern',
+        'template': 'pdf/resume_pdf.html',
+        'stylesheet': 'pdf/themes/modern.css',
+    },
+]
+
+
+class Theme:
+    """
+    A PDF theme. ``template`` is the layout template name, ``sections`` the
+    template directory holding one template per entry in FRAGMENT_NAMES
+    and ``stylesheet`` a path relative to the templates directory.
+    ``pdf_backend`` names the resume.pdf backend that lays it out.
+    """
+
+    def __init__(self, name, label, template, stylesheet, sections='pdf/sections', pdf_backend='weasyprint'):
+        self.name = name
+        self.label = label
+        self.pdf_backend = pdf_backend
+        self.template_name = template
+        self.sections_dir = sections
+        self.stylesheet_path = os.path.join(settings.BASE_DIR, 'templates', stylesheet)
+        self._section_templates = {}
+
+    def __repr__(self):
+        return f'<Theme {self.name}>'
+
+    @cached_property
+    def template(self):
+        return get_template(self.template_name)
+
+    def section_template(self, name):
+        template = self._section_templates.get(name)
+        if template is None:
+            template = self._section_templates[name] = get_template(f'{self.sections_dir}/{name}.html')
+        return template
+
+    @cached_property
+    def stylesheet_source(self):
+        with open(self.stylesheet_path, encoding='utf-8') as stylesheet:
+            return stylesheet.read()
+
+    @cached_property
+    def stylesheet(self):
+        """The parsed WeasyPrint stylesheet, shared by every render."""
+        # Imported here so listing or validating themes doesn't load WeasyPrint
+        from weasyprint import CSS
+
+        return CSS(string=self.stylesheet_source, base_url=settings.BASE_DIR)
+
+    @cached_property
+    def version(self):
+        """
+        Hash of the template and stylesheet sources. Versions the HTML,
+        fragments and stylesheet; PDFs use their backend's version.
+        """
+        digest = hashlib.sha256(self.template.template.source.encode())
+        for name in FRAGMENT_NAMES:
+            digest.update(self.section_template(name).template.source.encode())
+        digest.update(self.stylesheet_source.encode())
+        return digest.hexdigest()[:12]
+
+    def render(self, context):
+        return self.template.render(context)
+
+    def render_section(self, name, context):
+        return self.section_template(name).render(context)
+
+    def warm(self):
+        """Compile the templates and parse the stylesheet ahead of the first render."""
+        return self.template, self.stylesheet, self.version
+
+
+_registry = {}
+
+
+def register_theme(name, label, template, stylesheet, sections='pdf/sections', pdf_backend='weasyprint'):
+    theme = Theme(name, label, template, stylesheet, sections, pdf_backend)
+    _registry[name] = theme
+    return theme
+
+
+def get_theme(name):
+    """Return the named theme, falling back to the default for unknown names."""
+    return _registry.get(name) or _registry[DEFAULT_THEME]
+
+
+def get_themes():
+    return list(_registry.values())
+
+
+def is_registered(name):
+    return name in _registry
+
+
+for _options in getattr(settings, 'RESUME_THEMES', DEFAULT_THEMES):
+    register_theme(**_options)
@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     ResumeViewSet, EducationViewSet, ExperienceViewSet, 
     ProjectViewSet, SkillViewSet, CertificationViewSet, AchievementViewSet,
-    ResumePDFDownloadView
+    ResumePDFDownloadView, ResumeDOCXDownloadView, ResumePDFRenderProgressView, ResumePreviewView,
+    ResumeTextExportView, ResumeThemeListView, ResumeThemeStylesheetView,
 )
 from django.urls import include
 from rest_framework.routers import DefaultRouter
@@ -19,5 +20,11 @@ router.register(r'achievements', AchievementViewSet, basename='achievement')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('themes/', ResumeThemeListView.as_view(), name='resume_themes'),
+    path('themes/<str:name>/stylesheet/', ResumeThemeStylesheetView.as_view(), name='resume_theme_stylesheet'),
     path('resumes/<int:resume_id>/download-pdf/', ResumePDFDownloadView.as_view(), name='download_resume_pdf'),
+    path('resumes/<int:resume_id>/download-docx/', ResumeDOCXDownloadView.as_view(), name='download_resume_docx'),
+    path('resumes/<int:resume_id>/export/<str:output_format>/', ResumeTextExportView.as_view(), name='export_resume_text'),
+    path('resumes/<int:resume_id>/preview/', ResumePreviewView.as_view(), name='resume_preview'),
+    path('resumes/<int:resume_id>/render-progress/', ResumePDFRenderProgressView.as_view(), name='resume_render_progress'),
 ]
@@ -0,0 +1,143 @@
+"""
+A read-only fast path for list endpoints.
+
+A ModelSerializer with ``many=True`` pays for a model instance per row and,
+per field, an attribute lookup and a ``to_representation`` call. For a
+plain serializer, ValuesSerializer gives the same output from a
+``values_list()`` query instead. Each field's conversion is worked out
+once per serializer class: most fields need none, or a builtin such as
+``str`` or ``date.isoformat``. Anything unusual falls back to the DRF
+field's own ``to_representation``. The result renders to JSON that is
+byte for byte the serializer's.
+
+get_values_serializer() returns None when a serializer can't take the fast
+path, for example with nested serializers, method fields or a source that
+isn't a model column. Callers then use the serializer as usual. Related
+fields shown through ``__str__`` (StringRelatedField) need their column
+named in ``sources``, e.g. ``{'user': 'user__username'}``. A serializer's
+own ``to_representation()`` override is not run, so views skip the fast
+path when it would add anything (ResumeViewSet does for ?include=text).
+"""
+import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField, serializers.BooleanField, serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def datetime_converter(field, tz):
+    """DateTimeField.to_representation for ISO 8601 output in ``tz``, minus its per-call lookups."""
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def is_iso_8601(output_format):
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+class ValuesSerializer:
+    """Serialize ``values_list()`` rows like ``serializer_class(many=True)``; see the module docstring."""
+
+    def __init__(self, names, sources, converters, datetime_fields):
+        self.names = names
+        self.sources = sources
+        self.converters = converters
+        # DateTimeFields, converted in the timezone active when serializing
+        self.datetime_fields = datetime_fields
+
+    def values(self, queryset):
+        return queryset.values_list(*self.sources)
+
+    def serialize(self, rows):
+        converters = list(self.converters)
+        for index, field in self.datetime_fields:
+            tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+            converters[index] = field.to_representation if tz is None else datetime_converter(field, tz)
+        columns = list(zip(self.names, converters))
+        return [
+            {
+                name: value if convert is None or value is None else convert(value)
+                for (name, convert), value in zip(columns, row)
+            }
+            for row in rows
+        ]
+
+
+def compile_converter(field):
+    """Return (converter, is_datetime) for a serializer field; None converts nothing."""
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is not None:
+            return field.to_representation, False
+        return None, False
+    if isinstance(field, serializers.JSONField):
+        return (field.to_representation if field.binary else None), False
+    if isinstance(field, serializers.ChoiceField):
+        # As ChoiceField.to_representation: the choice key with the value's str()
+        get = field.choice_strings_to_values.get
+        return (lambda value: get(str(value), value)), False
+    if type(field) in (serializers.CharField, serializers.EmailField, serializers.URLField,
+                       serializers.SlugField, serializers.StringRelatedField):
+        return str, False
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str, False
+    if type(field) is serializers.DateTimeField and is_iso_8601(getattr(field, 'format', api_settings.DATETIME_FORMAT)):
+        return None, True
+    if type(field) is serializers.DateField and is_iso_8601(getattr(field, 'format', api_settings.DATE_FORMAT)):
+        return datetime.date.isoformat, False
+    return field.to_representation, False
+
+
+def is_column(model, source):
+    """Whether ``source`` names a field values_list() returns one value per row for."""
+    try:
+        field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and not field.many_to_many
+
+
+def build_values_serializer(serializer_class, sources):
+    model = serializer_class.Meta.model
+    names, columns, converters, datetime_fields = [], [], [], []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if name in sources:
+            column = sources[name]
+        elif isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField,
+                                serializers.RelatedField)) \
+                and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None
+        elif not is_column(model, field.source):
+            return None
+        else:
+            column = field.source
+        converter, is_datetime = compile_converter(field)
+        if is_datetime:
+            datetime_fields.append((len(converters), field))
+        names.append(name)
+        columns.append(column)
+        converters.append(converter)
+    return ValuesSerializer(names, columns, converters, datetime_fields)
+
+
+_values_serializers = {}
+
+
+def get_values_serializer(serializer_class, sources=None):
+    """The (cached) ValuesSerializer for ``serializer_class``, or None if it can't have one."""
+    sources = sources or {}
+    key = (serializer_class, tuple(sorted(sources.items())))
+    if key not in _values_serializers:
+        _values_serializers[key] = build_values_serializer(serializer_class, sources)
+    return _values_serializers[key]
@@ -1,101 +1,349 @@
 from rest_framework import permissions
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.http import HttpResponse
-from django.template.loader import render_to_string
+from django.db.models import Case, Max, PositiveIntegerField, Value, When
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.urls import reverse
+from django.utils import timezone
+import json
+import time
 from django.shortcuts import get_object_or_404
-from django.conf import settings
-from weasyprint import HTML, CSS
-import os
 from .models import Resume, Education, Experience, Project, Skill, Certification, Achievement
 from .serializers import (
     ResumeSerializer, EducationSerializer, ExperienceSerializer, 
-    ProjectSerializer, SkillSerializer, CertificationSerializer, AchievementSerializer
+    ProjectSerializer, SkillSerializer, CertificationSerializer, AchievementSerializer, ReorderSerializer,
 )
+from .pdf import (
+    fingerprint_from_versions, get_or_render_pdf, get_pdf_cache, get_section_querysets,
+    get_section_versions, iter_render_stages, pdf_cache_key, pdf_filename, render_fragments,
+    render_layout, resume_fingerprint, section_prefetches,
+)
+from .archive import restore_archived, restore_if_archived
+from .autosave import AutosaveBusy, flush_pending, stage_changes
+from .share import enable_sharing, revoke_sharing, share_urls
+from .values_serializers import get_values_serializer
+from .docx import DOCX_CONTENT_TYPE, docx_etag, docx_filename, get_or_render_docx
+from .text import TEXT_FORMATS, iter_and_cache, iter_resume_text, text_cache_key, text_etag, text_filename
+from .themes import get_theme, get_themes, is_registered
+
+def get_user_resume(user, resume_id):
+    """The user's resume, with their autosaves written and its sections back in place if it was archived."""
+    flush_pending(user.pk)
+    resume = get_object_or_404(Resume, id=resume_id, user=user)
+    restore_if_archived(resume)
+    return resume
+
+
+class ArchiveRestoreMixin:
+    """
+    Restore archived resumes (see resume.archive) before a request can read
+    or add to their sections. A section row that can be fetched by id
+    belongs to a resume that isn't archived, so only lists and creates
+    restore anything: ``rehydrate()`` picks the resumes a list needs (it
+    runs after authentication and is called separately by the async read
+    views), and perform_create() restores the one in the request body.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.rehydrate()
+
+    def rehydrate(self):
+        if self.action != 'list':
+            return
+        resumes = Resume.objects.filter(user=self.request.user)
+        resume_id = self.request.query_params.get('resume')
+        if resume_id is not None and resume_id.isdigit():
+            resumes = resumes.filter(pk=resume_id)
+        restore_archived(resumes)
+
+    def perform_create(self, serializer):
+        restore_if_archived(serializer.validated_data['resume'])
+        super().perform_create(serializer)
+
+
+class AutosaveMixin:
+    """
+    ``PATCH <endpoint>/<id>/autosave/`` takes a field-level delta and
+    buffers it, so that a burst of edits becomes one write (see
+    resume.autosave). It answers 202 with the fields still pending, or 200
+    with the object once the buffer is written; ``?flush=1`` writes it
+    straight away. 503 means the buffers were locked, and the client
+    retries. Every other request writes the user's buffers first.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action != 'autosave':
+            flush_pending(request.user.pk)
+
+    @action(detail=True, methods=['patch'])
+    def autosave(self, request, pk=None):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            written, pending, flush_in = stage_changes(
+                request.user.pk, instance, serializer.validated_data, flush=request.query_params.get('flush') == '1',
+            )
+        except AutosaveBusy:
+            return Response(
+                {'detail': 'Another save is in progress; retry shortly.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'},
+            )
+        if written:
+            return Response(self.get_serializer(instance).data)
+        return Response({'pending': pending, 'flush_in': round(flush_in, 3)}, status=status.HTTP_202_ACCEPTED)
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` through resume.values_serializers: the same JSON as the
+    serializer, built from a values_list() query instead of model
+    instances. Writes, single objects and serializers it can't handle use
+    the serializer as usual. ``values_sources`` names the columns behind
+    StringRelatedFields.
+    """
+    values_sources = {}
+
+    def get_values_serializer(self):
+        return get_values_serializer(self.get_serializer_class(), self.values_sources)
+
+    def serialize_list(self, queryset):
+        """List data for ``queryset``, unpaginated."""
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return self.get_serializer(queryset, many=True).data
+        return values_serializer.serialize(values_serializer.values(queryset))
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
 
-class ResumeViewSet(viewsets.ModelViewSet):
+
+class ResumeViewSet(ArchiveRestoreMixin, AutosaveMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ResumeSerializer
+    values_sources = {'user': 'user__username'}
 
     def get_queryset(self):
-        return Resume.objects.filter(user=self.request.user)
+        queryset = Resume.objects.filter(user=self.request.user).select_related('user')
+        if self.include_text():
+            queryset = queryset.prefetch_related(*section_prefetches())
+        return queryset
+
+    def include_text(self):
+        """``?include=text`` adds each resume's plain-text export to reads."""
+        return self.request.method == 'GET' and self.request.query_params.get('include') == 'text'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include_text'] = self.include_text()
+        return context
+
+    def get_values_serializer(self):
+        # The plain-text export needs the resumes and their prefetched sections
+        return None if self.include_text() else super().get_values_serializer()
+
+    def rehydrate(self):
+        # Lists only need the resume rows themselves; deletes and sharing need nothing
+        if 'pk' in self.kwargs and self.request.method != 'DELETE' and self.action != 'share':
+            restore_archived(Resume.objects.filter(user=self.request.user, pk=self.kwargs['pk']))
+        elif self.include_text():
+            restore_archived(Resume.objects.filter(user=self.request.user))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_destroy(self, instance):
+        # One UPDATE instead of cascading through every section table in the
+        # request; purge_deleted_resumes removes the rows in small batches.
+        Resume.all_objects.filter(pk=instance.pk).update(deleted_at=timezone.now())
+
+    @action(detail=True, methods=['get', 'post', 'delete'])
+    def share(self, request, pk=None):
+        """
+        The resume's public share link (see resume.share). POST turns sharing
+        on, DELETE revokes it; a link shared again after revoking is new.
+        """
+        resume = self.get_object()
+        if request.method == 'POST':
+            enable_sharing(resume)
+        elif request.method == 'DELETE':
+            revoke_sharing(resume)
+        urls = share_urls(request, resume)
+        return Response({'shared': urls is not None, **(urls or {'url': None, 'pdf_url': None})})
+
+
+class SectionOrderMixin:
+    """
+    User-controlled order for the section viewsets. ``POST <section>/reorder/``
+    with ``{"resume": id, "order": [ids...]}`` sets every row's sort_order in
+    one UPDATE ... CASE statement; its updated_at moves too, so the PDF
+    fingerprint and fragment caches see the change. Until a section has
+    been reordered every row stays at 0 and the section keeps its date
+    order; after that, new rows are added at its end. Skills stay grouped
+    by category, so their order applies within each category.
+    """
+
+    def perform_create(self, serializer):
+        model = serializer.Meta.model
+        last = model.objects.filter(resume=serializer.validated_data['resume']).aggregate(
+            last=Max('sort_order'))['last']
+        # A maximum of 0 means no reorder (or at most one row) yet: keep date order
+        serializer.save(sort_order=last + 1 if last else 0)
+
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        serializer = ReorderSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        resume, order = serializer.validated_data['resume'], serializer.validated_data['order']
+        restore_if_archived(resume)
+        model = self.get_serializer_class().Meta.model
+        rows = model.objects.filter(resume=resume)
+        if set(rows.values_list('pk', flat=True)) != set(order):
+            raise ValidationError({'order': ["Must list each of the section's ids exactly once."]})
+        rows.update(
+            sort_order=Case(
+                *[When(pk=pk, then=Value(index)) for index, pk in enumerate(order)],
+                output_field=PositiveIntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+        return Response(self.serialize_list(self.get_queryset().filter(resume=resume)))
+
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = EducationSerializer
 
     def get_queryset(self):
-        queryset = Education.objects.filter(resume__user=self.request.user)
+        queryset = Education.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ExperienceSerializer
 
     def get_queryset(self):
-        queryset = Experience.objects.filter(resume__user=self.request.user)
+        queryset = Experience.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ProjectSerializer
 
     def get_queryset(self):
-        queryset = Project.objects.filter(resume__user=self.request.user)
+        queryset = Project.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SkillSerializer
 
     def get_queryset(self):
-        queryset = Skill.objects.filter(resume__user=self.request.user)
+        queryset = Skill.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CertificationSerializer
 
     def get_queryset(self):
-        queryset = Certification.objects.filter(resume__user=self.request.user)
+        queryset = Certification.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
-class AchievementViewSet(viewsets.ModelViewSet):
+class AchievementViewSet(ArchiveRestoreMixin, AutosaveMixin, SectionOrderMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AchievementSerializer
 
     def get_queryset(self):
-        queryset = Achievement.objects.filter(resume__user=self.request.user)
+        queryset = Achievement.objects.filter(resume__user=self.request.user, resume__deleted_at__isnull=True)
         resume_id = self.request.query_params.get('resume', None)
         if resume_id is not None:
             queryset = queryset.filter(resume=resume_id)
         return queryset
 
 
+class ResumeThemeListView(APIView):
+    """List the PDF themes a resume can select."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response([{'name': theme.name, 'label': theme.label} for theme in get_themes()])
+
+
+class ResumeThemeStylesheetView(APIView):
+    """Serve a theme's stylesheet, for displaying the HTML preview."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, name):
+        if not is_registered(name):
+            raise Http404
+        theme = get_theme(name)
+        response = HttpResponse(theme.stylesheet_source, content_type='text/css; charset=utf-8')
+        response['ETag'] = f'"{theme.version}"'
+        return response
+
+
+class ResumePreviewView(APIView):
+    """
+    Server-rendered HTML preview of a resume: byte for byte the HTML that
+    WeasyPrint lays out for the PDF. Fragments are served from the
+    per-section cache, so after an edit only the changed section renders;
+    X-Rendered-Fragments lists which ones did. Revalidates by ETag.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, resume_id):
+        resume = get_user_resume(request.user, resume_id)
+        versions = get_section_versions(resume)
+        # The PDF fingerprint only covers what the PDF backend reads
+        etag = f'"{fingerprint_from_versions(versions)}-{get_theme(resume.theme).version}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        fragments, rendered = render_fragments(resume, get_section_querysets(resume), versions)
+        response = HttpResponse(render_layout(resume, fragments), content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        response['X-Rendered-Fragments'] = ','.join(rendered)
+        return response
+
+
 class ResumePDFDownloadView(APIView):
     """
     Generate and download resume as PDF using WeasyPrint
@@ -107,47 +355,150 @@ class ResumePDFDownloadView(APIView):
         user = request.user
         
         # Get the resume and ensure it belongs to the current user
-        resume = get_object_or_404(Resume, id=resume_id, user=user)
-        
-        # Get all related data
-        education = Education.objects.filter(resume=resume).order_by('-start_date')
-        experience = Experience.objects.filter(resume=resume).order_by('-start_date')
-        projects = Project.objects.filter(resume=resume).order_by('-start_date')
-        skills = Skill.objects.filter(resume=resume).order_by('category', 'name')
-        certifications = Certification.objects.filter(resume=resume).order_by('-issue_date')
-        achievements = Achievement.objects.filter(resume=resume).order_by('-date_achieved')
-        
-        # Prepare context for template
-        context = {
-            'resume': resume,
-            'education': education,
-            'experience': experience,
-            'projects': projects,
-            'skills': skills,
-            'certifications': certifications,
-            'achievements': achievements,
-        }
+        resume = get_user_resume(user, resume_id)
         
-        # Render HTML template
-        html_string = render_to_string('pdf/resume_pdf.html', context)
-        
-        # Generate PDF
+        # Generate PDF (served from cache when the resume hasn't changed)
         try:
-            # Get the CSS file path
-            css_path = os.path.join(settings.BASE_DIR, 'templates', 'pdf', 'resume_pdf_styles.css')
-            
-            # Create PDF from HTML with CSS
-            pdf = HTML(string=html_string, base_url=settings.BASE_DIR).write_pdf(
-                stylesheets=[CSS(css_path)]
-            )
+            pdf, fingerprint = get_or_render_pdf(resume)
             
             # Create response
             response = HttpResponse(pdf, content_type='application/pdf')
-            filename = f"resume_{resume.title.replace(' ', '_') if resume.title else 'resume'}_{resume_id}.pdf"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['Content-Disposition'] = f'attachment; filename="{pdf_filename(resume)}"'
+            response['ETag'] = f'"{fingerprint}"'
             
             return response
             
         except Exception as e:
             # Log the error in production
             return HttpResponse(f'Error generating PDF: {str(e)}', status=500)
+
+
+class ResumeDOCXDownloadView(APIView):
+    """
+    Download resume as a Word document, written directly as OOXML
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, resume_id):
+        resume = get_user_resume(request.user, resume_id)
+        docx, fingerprint = get_or_render_docx(resume)
+
+        response = HttpResponse(docx, content_type=DOCX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="{docx_filename(resume)}"'
+        response['ETag'] = docx_etag(fingerprint)
+        return response
+
+
+class ResumeTextExportView(APIView):
+    """
+    Export a resume as plain text or Markdown for applicant tracking systems.
+
+    The export is streamed and then cached under the resume's fingerprint
+    and the exporter's FORMAT_VERSION, which also make up the ETag, so
+    unchanged resumes revalidate with a 304.
+    Add ``?download=1`` to get an attachment instead of inline text.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, resume_id, output_format):
+        if output_format not in TEXT_FORMATS:
+            raise Http404
+        resume = get_user_resume(request.user, resume_id)
+        fingerprint = resume_fingerprint(resume)
+        etag = text_etag(fingerprint, output_format)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        content_type = TEXT_FORMATS[output_format][0]
+        text = get_pdf_cache().get(text_cache_key(fingerprint, output_format))
+        if text is not None:
+            response = HttpResponse(text, content_type=content_type)
+        else:
+            chunks = iter_resume_text(resume, get_section_querysets(resume), output_format)
+            response = StreamingHttpResponse(
+                iter_and_cache(chunks, fingerprint, output_format), content_type=content_type
+            )
+        disposition = 'attachment' if request.query_params.get('download') else 'inline'
+        response['Content-Disposition'] = f'{disposition}; filename="{text_filename(resume, output_format)}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate text/event-stream; only error responses are rendered
+    through it, as a single 'error' event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return server_sent_event('error', data).encode()
+
+
+def server_sent_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
+
+
+def cache_hit_event(started, fingerprint):
+    return server_sent_event('stage', {
+        'stage': 'cached',
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'duration_ms': 0.0,
+        'fingerprint': fingerprint,
+        'hit': True,
+    })
+
+
+def render_error_event(error):
+    # Log the error in production
+    return server_sent_event('error', {'detail': f'Error generating PDF: {str(error)}'})
+
+
+def render_done_event(resume, fingerprint):
+    return server_sent_event('done', {
+        'download_url': reverse('download_resume_pdf', kwargs={'resume_id': resume.id}),
+        'fingerprint': fingerprint,
+    })
+
+
+class ResumePDFRenderProgressView(APIView):
+    """
+    Stream the stages of a resume PDF render as Server-Sent Events.
+
+    Emits a 'stage' event for each of querying, queued, template_rendered,
+    layout, written and cached (with timings), then 'done' with the
+    download URL, which serves the freshly cached PDF without re-rendering.
+    Under ASGI, resume.async_views.resume_render_progress serves this URL.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, resume_id):
+        resume = get_user_resume(request.user, resume_id)
+        return event_stream_response(self.stream(resume))
+
+    def stream(self, resume):
+        started = time.perf_counter()
+        versions = get_section_versions(resume)
+        fingerprint = fingerprint_from_versions(versions)
+        if get_pdf_cache().get(pdf_cache_key(fingerprint)) is not None:
+            yield cache_hit_event(started, fingerprint)
+        else:
+            try:
+                for stage in iter_render_stages(resume, fingerprint, started, versions):
+                    yield server_sent_event('stage', stage)
+            except Exception as e:
+                yield render_error_event(e)
+                return
+        yield render_done_event(resume, fingerprint)
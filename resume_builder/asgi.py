@@ -3,6 +3,10 @@ ASGI config for resume_builder project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Under ASGI the resume and section reads and the PDF download are served by
+native async views (resume_builder.asgi_urls) instead of going through the
+sync-to-async thread adaptor.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +16,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_builder.settings')
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'resume_builder.asgi_urls')
 
 application = get_asgi_application()
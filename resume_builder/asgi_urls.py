@@ -0,0 +1,13 @@
+"""
+URL configuration used under ASGI (see asgi.py).
+
+Native async read views are tried first; everything else is identical to
+resume_builder.urls.
+"""
+from django.urls import path, include
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('api/', include('resume.async_urls')),
+] + wsgi_urlpatterns
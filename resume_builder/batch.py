@@ -0,0 +1,196 @@
+"""
+POST /api/batch/: run several API calls in one round trip.
+
+The body lists sub-requests::
+
+    {"atomic": false, "requests": [
+        {"id": "resumes", "method": "GET", "path": "/resumes/"},
+        {"method": "PATCH", "path": "/experience/7/", "body": {"position": "Lead"}}
+    ]}
+
+Paths are relative to /api/ (a leading /api/ is accepted too). The caller is
+authenticated once, for the batch; sub-requests are resolved against the API
+routes and run in order as that user, skipping the middleware stack. The
+response lists one ``{"id", "status", "headers", "body"}`` per sub-request.
+JSON bodies are returned parsed, other text as a string and binary content
+(PDFs) base64-encoded.
+
+With ``"atomic": true`` the sub-requests share one transaction: the first
+one to fail (status 400 or above) rolls all of them back, and the ones after
+it aren't run (status 424).
+"""
+import base64
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from rest_framework import permissions, serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SETTINGS = {
+    'MAX_REQUESTS': 25,
+    'MAX_BODY_BYTES': 64 * 1024,
+}
+
+API_PREFIX = '/api/'
+
+# Sub-requests always resolve against the WSGI routes, whose views are sync
+URLCONF = 'resume_builder.urls'
+
+# Headers a sub-request may set; auth, cookies and content headers come from the batch
+ALLOWED_HEADERS = ('Accept', 'Accept-Language', 'If-None-Match', 'If-Match', 'If-Modified-Since')
+
+# Parent request META copied to every sub-request
+INHERITED_META = ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'SERVER_PROTOCOL', 'HTTP_HOST', 'HTTP_USER_AGENT')
+
+
+def get_batch_settings():
+    """Return BATCH_API merged over the defaults."""
+    options = dict(DEFAULT_BATCH_SETTINGS)
+    options.update(getattr(settings, 'BATCH_API', {}))
+    return options
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.ChoiceField(choices=['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField(max_length=2000)
+    headers = serializers.DictField(child=serializers.CharField(max_length=1000), required=False)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError('Must start with "/".')
+        if not value.startswith(API_PREFIX):
+            value = API_PREFIX.rstrip('/') + value
+        if value.split('?', 1)[0] == BatchView.path:
+            raise serializers.ValidationError('Batches can not be nested.')
+        return value
+
+    def validate_headers(self, value):
+        unknown = sorted(set(value) - set(ALLOWED_HEADERS))
+        if unknown:
+            raise serializers.ValidationError(f'Not allowed: {", ".join(unknown)}.')
+        return value
+
+    def validate_body(self, value):
+        if len(json.dumps(value).encode()) > get_batch_settings()['MAX_BODY_BYTES']:
+            raise serializers.ValidationError('Body is too large.')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(default=False)
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        limit = get_batch_settings()['MAX_REQUESTS']
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} requests per batch.')
+        return value
+
+
+def build_subrequest(parent, spec):
+    """A WSGIRequest for ``spec``, carrying the batch's already authenticated user."""
+    path, _, query = spec['path'].partition('?')
+    payload = b'' if spec.get('body') is None else json.dumps(spec['body']).encode()
+    environ = {key: parent.META[key] for key in INHERITED_META if key in parent.META}
+    environ.update({
+        'REQUEST_METHOD': spec['method'],
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+        'wsgi.url_scheme': parent.scheme,
+    })
+    for name, value in spec.get('headers', {}).items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    request = WSGIRequest(environ)
+    # DRF's Request uses these in place of its authenticators, so the JWT is only checked once
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def encode_body(response):
+    try:
+        content = b''.join(response) if response.streaming else response.content
+    finally:
+        response.close()
+    content_type = response.get('Content-Type', '')
+    if not content:
+        return None, None
+    if 'json' in content_type:
+        return json.loads(content), None
+    if content_type.startswith('text/'):
+        return content.decode(response.charset), None
+    return base64.b64encode(content).decode('ascii'), 'base64'
+
+
+def run_subrequest(parent, spec):
+    try:
+        match = resolve(spec['path'].split('?', 1)[0], urlconf=URLCONF)
+    except Resolver404:
+        return {'status': status.HTTP_404_NOT_FOUND, 'headers': {}, 'body': {'detail': 'Not found.'}}
+    request = build_subrequest(parent, spec)
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        body, encoding = encode_body(response)
+    except Exception:
+        logger.exception('Batch sub-request %s %s failed', spec['method'], spec['path'])
+        return {'status': 500, 'headers': {}, 'body': {'detail': 'Server error.'}}
+    result = {'status': response.status_code, 'headers': dict(response.items()), 'body': body}
+    if encoding:
+        result['encoding'] = encoding
+    return result
+
+
+class BatchView(APIView):
+    """Run a list of API sub-requests in one round trip; see the module docstring."""
+
+    path = API_PREFIX + 'batch/'
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        specs = serializer.validated_data['requests']
+        atomic = serializer.validated_data['atomic']
+
+        results, rolled_back = [], False
+        if atomic:
+            with transaction.atomic():
+                for spec in specs:
+                    result = run_subrequest(request, spec)
+                    results.append(result)
+                    if result['status'] >= 400:
+                        transaction.set_rollback(True)
+                        rolled_back = True
+                        break
+            for spec in specs[len(results):]:
+                results.append({
+                    'status': status.HTTP_424_FAILED_DEPENDENCY, 'headers': {},
+                    'body': {'detail': 'Not run: an earlier request in the batch failed.'},
+                })
+        else:
+            results = [run_subrequest(request, spec) for spec in specs]
+
+        for spec, result in zip(specs, results):
+            if 'id' in spec:
+                result['id'] = spec['id']
+        payload = {'responses': results}
+        if atomic:
+            payload['rolled_back'] = rolled_back
+        return Response(payload)
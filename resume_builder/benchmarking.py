@@ -0,0 +1,42 @@
+"""
+Helpers shared by the bench_* management commands.
+"""
+import contextlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connection, connections
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples`` (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@contextlib.contextmanager
+def throwaway_database():
+    """
+    Point the default alias at a freshly migrated SQLite file for the
+    duration of a benchmark, so real data is never touched. A file (rather
+    than the in-memory test database) lets every benchmark thread open its
+    own connection.
+    """
+    db_file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+    db_file.close()
+    settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = db_file.name
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    # Rejected or failing requests would otherwise log on every iteration
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    try:
+        yield db_file.name
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if os.path.exists(db_file.name):
+            os.unlink(db_file.name)
@@ -0,0 +1,18 @@
+"""
+Helpers for features that keep state in Django's cache.
+
+Coordinating worker processes through the cache (autosave buffers, PDF
+render coalescing) only works when every worker sees the same cache. The
+local-memory and dummy backends are private to one process, so features
+that need sharing check is_shared_cache() and fall back to working
+alone.
+"""
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(cache):
+    """Whether ``cache`` can be seen by other worker processes."""
+    return not isinstance(cache, PROCESS_LOCAL_BACKENDS)
@@ -0,0 +1,148 @@
+"""
+Read-replica routing.
+
+ReplicaRoutingMiddleware picks a database for each request: GET, HEAD and
+OPTIONS requests read from one of DATABASE_REPLICATION['REPLICAS'], chosen
+at random, and every other request uses the primary. ReplicaRouter applies
+that choice to the ORM. Writes always go to the primary. Once a request
+has written, its remaining reads go to the primary too, as do reads inside
+a transaction.
+
+So users see their own changes despite replication lag, a client that
+writes is pinned to the primary for STICKY_SECONDS. The pin is stored in
+the cache, keyed by the client's credentials (the Authorization header,
+else the session cookie, else the IP address), so it works across worker
+processes when the cache is shared.
+
+Reads outside a request (management commands, the shell) and the bodies
+of streaming responses, which are produced after the middleware returns,
+use the primary. Without replicas configured the middleware removes itself
+and the router leaves every query on the primary.
+"""
+import contextvars
+import hashlib
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULT_REPLICATION_SETTINGS = {
+    'PRIMARY': DEFAULT_DB_ALIAS,
+    'REPLICAS': [],
+    'STICKY_SECONDS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_replication_settings():
+    """Return DATABASE_REPLICATION merged over the defaults."""
+    options = dict(DEFAULT_REPLICATION_SETTINGS)
+    options.update(getattr(settings, 'DATABASE_REPLICATION', {}))
+    return options
+
+
+class RoutingState:
+    """The current request's replica (None for the primary), and whether it has written."""
+
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        if connections[get_replication_settings()['PRIMARY']].in_atomic_block:
+            # Reads in a transaction must see its writes (and take its locks)
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return get_replication_settings()['PRIMARY']
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        options = get_replication_settings()
+        aliases = {options['PRIMARY'], *options['REPLICAS']}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+def pin_key(request):
+    credentials = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return 'db-pin:' + hashlib.sha256(credentials.encode()).hexdigest()[:32]
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choose the request's database for ReplicaRouter; see the module
+    docstring. Sync and async capable, so ASGI requests stay on the loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.options = get_replication_settings()
+        if not self.options['REPLICAS']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        cache = caches[self.options['CACHE_ALIAS']]
+        key = pin_key(request)
+        pinned = request.method not in SAFE_METHODS or cache.get(key)
+
+        state = self.routing_state(pinned)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote or request.method not in SAFE_METHODS:
+            cache.set(key, True, self.options['STICKY_SECONDS'])
+        return response
+
+    async def __acall__(self, request):
+        cache = caches[self.options['CACHE_ALIAS']]
+        key = pin_key(request)
+        pinned = request.method not in SAFE_METHODS or await cache.aget(key)
+
+        # Async views' ORM calls copy this context into their threads, and the state with it
+        state = self.routing_state(pinned)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote or request.method not in SAFE_METHODS:
+            await cache.aset(key, True, self.options['STICKY_SECONDS'])
+        return response
+
+    def routing_state(self, pinned):
+        return RoutingState(None if pinned else random.choice(self.options['REPLICAS']))
@@ -0,0 +1,431 @@
+"""
+In-process metrics exposed at /metrics in the Prometheus text format.
+
+MetricsMiddleware records per-route request counts, latency and DB query
+histograms, plus request body sizes for uploads. resume.pdf records PDF
+render durations, page counts and renders shared between requests.
+
+Every worker process keeps its own values. With METRICS['MULTIPROCESS_DIR']
+set, each process also writes a snapshot of its values to a file of its own
+there (at most once per FLUSH_INTERVAL seconds, and at exit). /metrics sums
+all those files with the serving process's live values, so any worker can
+answer for the whole group.
+
+Files are named by pid and process start time, so a process that reuses a
+dead worker's pid doesn't overwrite its totals. When /metrics is scraped,
+the files of workers that have exited (their pid is gone, or a newer file
+has it) are added into archived.json and deleted, under a lock file. That
+keeps counters from going backwards while recycled workers' files don't
+pile up.
+"""
+import atexit
+import bisect
+import contextlib
+import contextvars
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; exited workers' files are then kept
+    fcntl = None
+
+DEFAULT_METRICS_SETTINGS = {
+    'ENABLED': True,
+    'MULTIPROCESS_DIR': None,
+    'FLUSH_INTERVAL': 1.0,
+    'AUTH_TOKEN': None,
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PDF_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAGE_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+PROCESS_FILE = re.compile(r'^metrics-(\d+)-(\d+)\.json$')
+ARCHIVE_FILE = 'archived.json'
+
+
+def get_metrics_settings():
+    """Return METRICS merged over the defaults."""
+    options = dict(DEFAULT_METRICS_SETTINGS)
+    options.update(getattr(settings, 'METRICS', {}))
+    return options
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (
+        str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for value in values
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def snapshot(self):
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0) + value
+
+    def expose(self, samples):
+        for labels, value in sorted(samples.items()):
+            yield f'{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram; values are [bucket counts..., sum, count]."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, value, *labels):
+        row = self.values.get(labels)
+        if row is None:
+            row = self.values[labels] = [0] * (len(self.buckets) + 2)
+        # Counts are kept per bucket and made cumulative on exposition
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            row[index] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def snapshot(self):
+        return [[list(labels), list(row)] for labels, row in self.values.items()]
+
+    @staticmethod
+    def merge(total, row):
+        return [a + b for a, b in zip(total, row)] if total else list(row)
+
+    def expose(self, samples):
+        bucket_names = self.labelnames + ('le',)
+        for labels, row in sorted(samples.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f'{self.name}_bucket{format_labels(bucket_names, labels + (format_value(bound),))} {cumulative}'
+            yield f'{self.name}_bucket{format_labels(bucket_names, labels + ("+Inf",))} {row[-1]}'
+            yield f'{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(row[-2])}'
+            yield f'{self.name}_count{format_labels(self.labelnames, labels)} {row[-1]}'
+
+
+class Registry:
+    """This process's metrics, optionally mirrored to a shared directory."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.started = time.time_ns()
+        self.last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def check_fork(self):
+        if os.getpid() != self.pid:
+            # Forked after import: don't report the parent's values twice
+            self.pid = os.getpid()
+            self.started = time.time_ns()
+            for metric in self.metrics.values():
+                metric.values.clear()
+
+    @contextlib.contextmanager
+    def updating(self):
+        with self.lock:
+            self.check_fork()
+            yield
+            self.maybe_flush()
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def process_file(self, directory):
+        return Path(directory) / f'metrics-{self.pid}-{self.started}.json'
+
+    def maybe_flush(self, force=False):
+        options = get_metrics_settings()
+        directory = options['MULTIPROCESS_DIR']
+        now = time.monotonic()
+        if not directory or (not force and now - self.last_flush < options['FLUSH_INTERVAL']):
+            return
+        self.last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        write_json(self.process_file(directory), self.snapshot())
+
+    def flush(self):
+        with self.lock:
+            self.maybe_flush(force=True)
+
+    def collect(self):
+        """{metric name: {labels: value}} summed over every process."""
+        with self.lock:
+            self.check_fork()
+            snapshots = [self.snapshot()]
+            directory = get_metrics_settings()['MULTIPROCESS_DIR']
+            if directory and os.path.isdir(directory):
+                self.archive_exited(Path(directory))
+                own = self.process_file(directory)
+                paths = [Path(directory, ARCHIVE_FILE), *sorted(Path(directory).glob('metrics-*.json'))]
+                for path in paths:
+                    if path == own:
+                        continue  # the live values above are newer
+                    snapshot = read_json(path)
+                    if snapshot is not None:
+                        snapshots.append(snapshot)
+        return self.merge(snapshots)
+
+    def merge(self, snapshots):
+        """{metric name: {labels: value}} summed over ``snapshots``."""
+        totals = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for labels, value in samples:
+                    labels = tuple(labels)
+                    totals[name][labels] = metric.merge(totals[name].get(labels), value)
+        return totals
+
+    def archive_exited(self, directory):
+        """Add the files of workers that have exited into the archive, and delete them."""
+        if fcntl is None:
+            return
+        with open(directory / 'archive.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                exited = exited_process_files(directory)
+                if not exited:
+                    return
+                archive = directory / ARCHIVE_FILE
+                snapshots = [read_json(path) for path in [archive, *exited]]
+                totals = self.merge(snapshot for snapshot in snapshots if snapshot is not None)
+                write_json(archive, {
+                    name: [[list(labels), value] for labels, value in samples.items()]
+                    for name, samples in totals.items()
+                })
+                for path in exited:
+                    path.unlink(missing_ok=True)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def expose(self):
+        lines = []
+        for name, samples in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.expose(samples))
+        return '\n'.join(lines) + '\n'
+
+
+def read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    # Write then rename, so readers never see a half-written file
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False) as handle:
+        json.dump(data, handle)
+    os.replace(handle.name, path)
+
+
+def pid_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # someone else's process, but running
+    return True
+
+
+def exited_process_files(directory):
+    """Snapshot files whose process is gone: its pid isn't running, or a later process has it."""
+    by_pid = {}
+    for path in directory.glob('metrics-*.json'):
+        match = PROCESS_FILE.match(path.name)
+        if match:
+            by_pid.setdefault(int(match[1]), []).append((int(match[2]), path))
+    exited = []
+    for pid, files in by_pid.items():
+        files.sort()
+        exited.extend(path for _, path in (files if not pid_running(pid) else files[:-1]))
+    return exited
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+requests_total = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route, method and status.', ('route', 'method', 'status'),
+))
+request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route, method and status.',
+    ('route', 'method', 'status'),
+))
+request_queries = registry.register(Histogram(
+    'http_request_db_queries', 'Database queries run per HTTP request, by route.',
+    ('route', 'method'), QUERY_BUCKETS,
+))
+upload_size = registry.register(Histogram(
+    'http_request_body_bytes', 'Body size of requests that carry one (uploads, writes), by route.',
+    ('route', 'method'), SIZE_BUCKETS,
+))
+pdf_render_duration = registry.register(Histogram(
+    'pdf_render_duration_seconds', 'Time to render a resume PDF (HTML, layout and write).',
+    buckets=PDF_DURATION_BUCKETS,
+))
+pdf_pages = registry.register(Histogram(
+    'pdf_render_pages', 'Pages per rendered resume PDF.', buckets=PAGE_BUCKETS,
+))
+pdf_coalesced = registry.register(Counter(
+    'pdf_render_coalesced_total', 'PDF requests that waited on a concurrent identical render, by outcome.',
+    ('outcome',),
+))
+
+
+def observe_pdf_render(duration, pages):
+    with registry.updating():
+        pdf_render_duration.observe(duration)
+        pdf_pages.observe(pages)
+
+
+def observe_pdf_coalesced(outcome):
+    with registry.updating():
+        pdf_coalesced.inc(outcome)
+
+
+def route_name(request):
+    """A low-cardinality name for the matched route (never the raw path)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+# The current request's query count, in a one-item list. A ContextVar, so queries
+# that async views run through sync_to_async (which copies the context) count too.
+_query_count = contextvars.ContextVar('request_query_count', default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(connection, **kwargs):
+    """Add count_query to ``connection`` for good; it's a no-op outside requests."""
+    if count_query not in connection.execute_wrappers:
+        # First, as execute_wrapper() blocks pop the last wrapper when they end
+        connection.execute_wrappers.insert(0, count_query)
+
+
+class MetricsMiddleware:
+    """
+    Time every request and count the queries it runs; see the module
+    docstring. Serves sync and async stacks alike, so ASGI requests aren't
+    pushed through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_metrics_settings()['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened later (in any thread) get the counter when they connect
+        connection_created.connect(install_query_counter, dispatch_uid='metrics_query_counter')
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        counter = [0]
+        token = _query_count.set(counter)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self.record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    async def __acall__(self, request):
+        counter = [0]
+        token = _query_count.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self.record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    def record(self, request, response, duration, queries):
+        route, method = route_name(request), request.method
+        try:
+            body_size = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            body_size = 0
+        with registry.updating():
+            requests_total.inc(route, method, str(response.status_code))
+            request_duration.observe(duration, route, method, str(response.status_code))
+            request_queries.observe(queries, route, method)
+            if body_size:
+                upload_size.observe(body_size, route, method)
+
+
+def metrics_view(request):
+    token = get_metrics_settings()['AUTH_TOKEN']
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
@@ -0,0 +1,151 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+DEFAULT_COMPRESSION_SETTINGS = {
+    'MIN_SIZE': 512,
+    'CONTENT_TYPES': [
+        'application/json',
+        'text/html',
+        'text/plain',
+        'text/css',
+        'text/markdown',
+        'application/javascript',
+    ],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+
+def get_compression_settings():
+    """Return RESPONSE_COMPRESSION merged over the defaults."""
+    options = dict(DEFAULT_COMPRESSION_SETTINGS)
+    options.update(getattr(settings, 'RESPONSE_COMPRESSION', {}))
+    return options
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header into a {coding: qvalue} dict.
+    Codings explicitly refused with q=0 are kept so they can be honoured.
+    """
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def choose_encoding(header):
+    """Pick 'br' or 'gzip' for the given Accept-Encoding header, or None."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get('*', 0.0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = codings.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+# Strong ETags of encoded representations: '"<etag>-<coding>"'
+ENCODED_ETAG = re.compile(r'^(".*)-(?:br|gzip)"$')
+
+
+def encoded_etag(etag, encoding):
+    """The strong ETag of ``etag``'s representation in ``encoding``."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def decoded_etag(etag):
+    """The ETag ``etag`` was derived from by encoded_etag(), or ``etag`` itself."""
+    match = ENCODED_ETAG.match(etag)
+    return f'{match.group(1)}"' if match else etag
+
+
+def compress_body(content, encoding, options=None):
+    """Compress bytes with the given content coding using the configured level."""
+    options = options or get_compression_settings()
+    if encoding == 'br':
+        return brotli.compress(content, quality=options['BROTLI_QUALITY'])
+    return gzip.compress(content, compresslevel=options['GZIP_LEVEL'], mtime=0)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses with brotli or gzip, negotiated from Accept-Encoding.
+
+    Only buffered responses whose content type is in the allowlist and whose
+    body is at least MIN_SIZE bytes are compressed, so PDFs, images and
+    streaming responses pass through untouched.
+
+    Compressing weakens a strong ETag, unless the view set
+    ``response.etag_per_encoding``: then each coding gets a strong ETag of
+    its own (see encoded_etag()), which the view must recognise in
+    If-None-Match. Compression is deterministic, so that stays valid.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.options = get_compression_settings()
+        self.content_types = {
+            content_type.lower() for content_type in self.options['CONTENT_TYPES']
+        }
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compress_body(response.content, encoding, self.options)
+        # Return the compressed content only if it's actually shorter.
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 8.8.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            if getattr(response, 'etag_per_encoding', False):
+                response.headers['ETag'] = encoded_etag(etag, encoding)
+            else:
+                response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def should_compress(self, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in self.content_types:
+            return False
+        return len(response.content) >= self.options['MIN_SIZE']
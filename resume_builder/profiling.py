@@ -0,0 +1,270 @@
+"""
+Opt-in profiling of single requests for staff users.
+
+With REQUEST_PROFILER['ENABLED'] set, a request from a staff user that
+carries ``?__profile=1`` or an ``X-Profile: 1`` header is run under a
+profiler: pyinstrument's sampling profiler when it's installed, cProfile
+otherwise. The result is saved to a retention-capped directory and listed
+at /admin/profiles/. When disabled the middleware removes itself from the
+stack, and when enabled untriggered requests only pay a dict lookup.
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from rest_framework.exceptions import AuthenticationFailed
+
+try:
+    import pyinstrument
+except ImportError:  # pyinstrument is optional; cProfile is always available
+    pyinstrument = None
+
+from user.authentication import CachedJWTAuthentication
+
+DEFAULT_PROFILER_SETTINGS = {
+    'ENABLED': False,
+    'DIRECTORY': Path(settings.BASE_DIR) / 'profiles',
+    'MAX_PROFILES': 50,
+    'BACKEND': 'auto',
+}
+
+PROFILE_ID = re.compile(r'^\d{8}-\d{6}-\d{6}$')
+
+# Report files a profile may have, with the content type they're served as
+REPORT_FILES = {
+    'txt': 'text/plain; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'prof': 'application/octet-stream',
+}
+
+# cProfile can't nest, and one profiled request at a time keeps the numbers honest
+_profile_lock = threading.Lock()
+
+
+def get_profiler_settings():
+    """Return REQUEST_PROFILER merged over the defaults."""
+    options = dict(DEFAULT_PROFILER_SETTINGS)
+    options.update(getattr(settings, 'REQUEST_PROFILER', {}))
+    options['DIRECTORY'] = Path(options['DIRECTORY'])
+    return options
+
+
+def profile_requested(request):
+    return request.GET.get('__profile') == '1' or request.META.get('HTTP_X_PROFILE') == '1'
+
+
+def is_staff_request(request):
+    """
+    Staff check that also covers the API, whose JWT users are only resolved
+    inside DRF views; session users come from AuthenticationMiddleware.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = CachedJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        user = authenticated[0] if authenticated else None
+    return bool(user and user.is_active and user.is_staff)
+
+
+class CProfileBackend:
+    name = 'cprofile'
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+
+    def save(self, stem):
+        self.profiler.dump_stats(f'{stem}.prof')
+        report = io.StringIO()
+        pstats.Stats(self.profiler, stream=report).sort_stats('cumulative').print_stats(80)
+        Path(f'{stem}.txt').write_text(report.getvalue())
+
+
+class PyinstrumentBackend:
+    name = 'pyinstrument'
+
+    def __init__(self):
+        self.profiler = pyinstrument.Profiler()
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+
+    def save(self, stem):
+        Path(f'{stem}.txt').write_text(self.profiler.output_text(unicode=True, color=False))
+        Path(f'{stem}.html').write_text(self.profiler.output_html())
+
+
+def get_backend(name):
+    if name == 'pyinstrument' or (name == 'auto' and pyinstrument is not None):
+        return PyinstrumentBackend()
+    return CProfileBackend()
+
+
+def list_profiles(directory):
+    """Saved profiles' metadata, newest first."""
+    profiles = []
+    for path in sorted(directory.glob('*.json'), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def enforce_retention(directory, max_profiles):
+    """Delete the oldest profiles beyond ``max_profiles``."""
+    for path in sorted(directory.glob('*.json'), reverse=True)[max_profiles:]:
+        for report in directory.glob(f'{path.stem}.*'):
+            report.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    Profile staff requests that ask for it; see the module docstring. Sync
+    and async capable. Under ASGI the profiler samples the event loop's
+    thread, so other requests served meanwhile show up in the profile too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.options = get_profiler_settings()
+        if not self.options['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not profile_requested(request) or not is_staff_request(request):
+            return self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile-Skipped'] = 'another request is being profiled'
+            return response
+        try:
+            backend, started = self.start()
+            try:
+                # Streaming bodies are produced after this returns and aren't covered
+                response = self.get_response(request)
+            finally:
+                backend.stop()
+            return self.save(request, response, backend, time.perf_counter() - started)
+        finally:
+            _profile_lock.release()
+
+    async def __acall__(self, request):
+        if not profile_requested(request) or not await sync_to_async(is_staff_request)(request):
+            return await self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            response = await self.get_response(request)
+            response['X-Profile-Skipped'] = 'another request is being profiled'
+            return response
+        try:
+            backend, started = self.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                backend.stop()
+            return await sync_to_async(self.save)(request, response, backend, time.perf_counter() - started)
+        finally:
+            _profile_lock.release()
+
+    def start(self):
+        backend = get_backend(self.options['BACKEND'])
+        started = time.perf_counter()
+        backend.start()
+        return backend, started
+
+    def save(self, request, response, backend, duration):
+        directory = self.options['DIRECTORY']
+        directory.mkdir(parents=True, exist_ok=True)
+        # Sortable by time, which retention relies on
+        profile_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        backend.save(directory / profile_id)
+        (directory / f'{profile_id}.json').write_text(json.dumps({
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'backend': backend.name,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'reports': sorted(path.suffix[1:] for path in directory.glob(f'{profile_id}.*')
+                              if path.suffix[1:] in REPORT_FILES),
+        }))
+        enforce_retention(directory, self.options['MAX_PROFILES'])
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+def get_profile(profile_id):
+    if not PROFILE_ID.match(profile_id):
+        raise Http404
+    directory = get_profiler_settings()['DIRECTORY']
+    try:
+        return directory, json.loads((directory / f'{profile_id}.json').read_text())
+    except (OSError, ValueError):
+        raise Http404
+
+
+@staff_member_required
+def profile_list_view(request):
+    return render(request, 'admin/profiles/list.html', {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(get_profiler_settings()['DIRECTORY']),
+        'options': get_profiler_settings(),
+    })
+
+
+@staff_member_required
+def profile_detail_view(request, profile_id):
+    directory, profile = get_profile(profile_id)
+    report_path = directory / f'{profile_id}.txt'
+    return render(request, 'admin/profiles/detail.html', {
+        **admin.site.each_context(request),
+        'title': f"{profile['method']} {profile['path']}",
+        'profile': profile,
+        'report': report_path.read_text() if report_path.exists() else '',
+    })
+
+
+@staff_member_required
+def profile_report_view(request, profile_id, extension):
+    directory, profile = get_profile(profile_id)
+    if extension not in profile['reports']:
+        raise Http404
+    return FileResponse(
+        open(directory / f'{profile_id}.{extension}', 'rb'),
+        content_type=REPORT_FILES[extension],
+        as_attachment=extension == 'prof',
+        filename=f'{profile_id}.{extension}',
+    )
@@ -47,7 +47,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'resume_builder.metrics.MetricsMiddleware',
+    'resume_builder.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'resume_builder.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,9 +58,11 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'resume_builder.profiling.ProfilingMiddleware',
 ]
 
-ROOT_URLCONF = 'resume_builder.urls'
+# asgi.py points this at resume_builder.asgi_urls to serve native async views.
+ROOT_URLCONF = os.environ.get('DJANGO_ROOT_URLCONF', 'resume_builder.urls')
 
 TEMPLATES = [
     {
@@ -87,6 +92,29 @@ DATABASES = {
     }
 }
 
+# Read replicas (resume_builder.db_router): GET requests read from a random replica,
+# writes and clients that wrote in the last STICKY_SECONDS use the primary. Add
+# replica aliases to DATABASES and list them in REPLICAS. For local testing,
+# DATABASE_REPLICAS="replica1.sqlite3,replica2.sqlite3" adds SQLite replicas, which
+# `python manage.py sync_sqlite_replicas` refreshes from the primary.
+REPLICA_ALIASES = []
+for index, path in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / path.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_ALIASES.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['resume_builder.db_router.ReplicaRouter']
+
+DATABASE_REPLICATION = {
+    'PRIMARY': 'default',
+    'REPLICAS': REPLICA_ALIASES,
+    'STICKY_SECONDS': 5,
+    'CACHE_ALIAS': 'default',  # share it between workers so pins do too
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -108,8 +136,16 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user.authentication.CachedJWTAuthentication',
     ),
+    # Token-bucket limits for credential endpoints (user.throttling), checked
+    # before any password is hashed. 'N/period' = burst of N, refilled at N per period.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_username': '10/min',
+        'register_ip': '20/hour',
+        'register_username': '5/hour',
+    },
 }
 
 SIMPLE_JWT = {
@@ -118,6 +154,122 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Maximum concurrent WeasyPrint renders per process (resume.pdf).
+PDF_RENDER_WORKERS = 2
+
+# Rendered PDFs are cached by content fingerprint (resume.pdf.resume_fingerprint),
+# so edits never serve stale bytes. Use a shared backend to share across workers.
+PDF_CACHE_ALIAS = 'default'
+PDF_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Concurrent requests for the same uncached PDF share one render (resume.singleflight).
+# Threads coalesce in-process. With LOCK_DIR set, worker processes also take turns through
+# lock files there and pick up each other's result from the PDF cache, so PDF_CACHE_ALIAS
+# must then be shared by all workers (e.g. Redis or Memcached); with a local-memory cache
+# LOCK_DIR is ignored, as workers would only queue up to render the same PDF again. Keys
+# share LOCK_STRIPES lock files, so unrelated renders on one stripe also take turns.
+# Waiters render it themselves after TIMEOUT seconds, so a stuck render can't hang them.
+PDF_RENDER_COALESCING = {
+    'TIMEOUT': 30.0,
+    'LOCK_DIR': os.environ.get('PDF_RENDER_LOCK_DIR'),
+    'LOCK_STRIPES': 256,
+}
+
+# Rendered header/section HTML fragments shared by the preview and the PDF
+# (resume.pdf.render_fragments), keyed on each section's own version.
+RESUME_FRAGMENT_CACHE_ALIAS = 'default'
+RESUME_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# In-process cache of users resolved from JWTs (user.authentication.CachedJWTAuthentication).
+# Saves and deletes invalidate entries in the same process; TTL (seconds) bounds
+# how long other worker processes may keep serving a deactivated user.
+AUTH_USER_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'TTL': 60,
+}
+
+# Response compression for API payloads (resume_builder.middleware.CompressionMiddleware).
+# Brotli is used when the client accepts it and the package is installed, gzip otherwise.
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 512,  # bytes; smaller bodies are not worth the CPU
+    'CONTENT_TYPES': [
+        'application/json',
+        'text/html',
+        'text/plain',
+        'text/css',
+        'text/markdown',
+        'application/javascript',
+    ],
+    'GZIP_LEVEL': 6,  # 1-9
+    'BROTLI_QUALITY': 5,  # 0-11
+}
+
+
+# Opt-in profiling of single staff requests (resume_builder.profiling.ProfilingMiddleware).
+# Add ?__profile=1 or an X-Profile: 1 header; pyinstrument is used if installed, cProfile
+# otherwise. Only the newest MAX_PROFILES are kept; browse them at /admin/profiles/.
+REQUEST_PROFILER = {
+    'ENABLED': os.environ.get('REQUEST_PROFILER_ENABLED') == '1',
+    'DIRECTORY': BASE_DIR / 'profiles',
+    'MAX_PROFILES': 50,
+    'BACKEND': 'auto',  # 'auto', 'pyinstrument' or 'cprofile'
+}
+
+# Prometheus-format metrics at /metrics (resume_builder.metrics). With several worker
+# processes, point MULTIPROCESS_DIR at a directory they share so any worker reports
+# totals for all of them; exited workers' files are folded into an archive file there
+# when scraped. Set AUTH_TOKEN to require
+# "Authorization: Bearer <token>" from the scraper.
+METRICS = {
+    'ENABLED': True,
+    'MULTIPROCESS_DIR': os.environ.get('METRICS_MULTIPROCESS_DIR') or None,
+    'FLUSH_INTERVAL': 1.0,  # seconds between a worker's snapshot writes
+    'AUTH_TOKEN': os.environ.get('METRICS_AUTH_TOKEN') or None,
+}
+
+# Cold storage for inactive resumes (resume.archive): `python manage.py archive_inactive_resumes`
+# moves the sections of resumes not updated for INACTIVE_DAYS into one compressed row each.
+# CODEC 'auto' uses zstd when the zstandard package is installed, zlib otherwise.
+RESUME_ARCHIVE = {
+    'INACTIVE_DAYS': 365,
+    'CODEC': 'auto',
+    'ZLIB_LEVEL': 9,
+    'ZSTD_LEVEL': 19,
+}
+
+# POST /api/batch/ (resume_builder.batch): several API calls in one round trip.
+# Batches over MAX_REQUESTS, or with a sub-request body over MAX_BODY_BYTES, get a 400.
+BATCH_API = {
+    'MAX_REQUESTS': 25,
+    'MAX_BODY_BYTES': 64 * 1024,
+}
+
+# Public share links (resume.share): /share/<uuid>/ redirects to URLs versioned by the
+# resume's content, which are cached as immutable for VERSIONED_MAX_AGE seconds. Only
+# the redirects (and 404s for revoked links) are revalidated, after ENTRY_MAX_AGE.
+RESUME_SHARING = {
+    'ENTRY_MAX_AGE': 60,
+    'VERSIONED_MAX_AGE': 60 * 60 * 24 * 365,
+}
+
+# Admin changelists over large tables (resume_builder.admin_utils): rows are counted exactly
+# up to EXACT_COUNT_LIMIT; past it PostgreSQL's planner estimate is shown, and other
+# databases page through the first EXACT_COUNT_LIMIT rows.
+ADMIN_PAGINATION = {
+    'EXACT_COUNT_LIMIT': 10000,
+}
+
+# Editor autosave (resume.autosave): PATCH .../autosave/ deltas from one user are merged in
+# the cache and written as one save per WINDOW seconds (or on ?flush=1, or before that
+# user's next other request). The cache must be shared by all workers (e.g. Redis or
+# Memcached); with the default local-memory cache, or WINDOW 0, each delta is written at
+# once. TIMEOUT bounds how long an unflushed buffer is kept.
+RESUME_AUTOSAVE = {
+    'WINDOW': 2.0,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    'LOCK_TIMEOUT': 1.0,
+}
 
 
 # Internationalization
@@ -20,9 +20,25 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 
+from resume_builder import metrics, profiling
+from resume.share import (
+    share_entry_pdf_view, share_entry_view, share_html_view, share_pdf_view, share_stylesheet_view,
+)
+from resume_builder.batch import BatchView
+
 urlpatterns = [
+    path('admin/profiles/', profiling.profile_list_view, name='admin_profiles'),
+    path('admin/profiles/<str:profile_id>/', profiling.profile_detail_view, name='admin_profile_detail'),
+    path('admin/profiles/<str:profile_id>/<str:extension>/', profiling.profile_report_view, name='admin_profile_report'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics.metrics_view, name='metrics'),
+    path('api/batch/', BatchView.as_view(), name='api_batch'),
     path('api/', include('user.urls')),
     path('api/', include('resume.urls')),
+    path('share/assets/<slug:name>.<str:version>.css', share_stylesheet_view, name='share_stylesheet'),
+    path('share/<uuid:uuid>/', share_entry_view, name='share_resume'),
+    path('share/<uuid:uuid>/resume.pdf', share_entry_pdf_view, name='share_resume_pdf'),
+    path('share/<uuid:uuid>/<str:version>/', share_html_view, name='share_resume_version'),
+    path('share/<uuid:uuid>/<str:version>/resume.pdf', share_pdf_view, name='share_resume_version_pdf'),
     path('', TemplateView.as_view(template_name='dashboard.html'), name='dashboard'),  # Placeholder, can use a real dashboard template
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
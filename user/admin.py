@@ -1,5 +1,13 @@
 from django.contrib import admin
+
+from resume_builder.admin_utils import ScalableModelAdmin
 from .models import UserProfile
 
-admin.site.register(UserProfile)
 
+@admin.register(UserProfile)
+class UserProfileAdmin(ScalableModelAdmin):
+    list_display = ('__str__', 'city', 'country')
+    list_select_related = ('user',)
+    search_fields = ('id', 'user__id', 'user__username')
+    ordering = ('-id',)
+    raw_id_fields = ('user',)
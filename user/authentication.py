@@ -0,0 +1,146 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Thread-safe LRU of resolved users with a per-entry time to live.
+
+    Entries are keyed by user id and dropped on User save/delete (see
+    user.signals), so the TTL only bounds staleness for changes made in
+    other worker processes or through QuerySet.update().
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+            }
+
+
+def _build_user_cache():
+    options = getattr(settings, 'AUTH_USER_CACHE', {})
+    return UserCache(
+        max_entries=options.get('MAX_ENTRIES', 1024),
+        ttl=options.get('TTL', 60),
+    )
+
+
+user_cache = _build_user_cache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from an in-process
+    cache instead of querying the User table on every request.
+    """
+
+    cache = user_cache
+
+    def get_user(self, validated_token):
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = self.load_user(validated_token)
+        # Hand each request its own instance so per-request state such as
+        # cached relations never leaks between requests.
+        return copy.copy(user)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate() for native async views; only a
+        cache miss leaves the event loop to query the database.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = await sync_to_async(self.load_user)(validated_token)
+        return copy.copy(user), validated_token
+
+    def get_cached_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = self.cache.get(user_id)
+        if user is not None:
+            self.check_user(user, validated_token)
+        return user
+
+    def load_user(self, validated_token):
+        user = super().get_user(validated_token)
+        self.cache.set(validated_token[api_settings.USER_ID_CLAIM], user)
+        return user
+
+    def check_user(self, user, validated_token):
+        """Repeat JWTAuthentication's per-token checks against a cached user."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
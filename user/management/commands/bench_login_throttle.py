@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from resume_builder.benchmarking import percentile, throwaway_database
+from user.views import ThrottledTokenObtainPairView
+
+# Throttle buckets live in the default cache, which each phase empties; a
+# private one keeps that from wiping the configured cache
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-login-throttle',
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test auth/token/ during a credential-stuffing burst and report '
+        'legitimate login latency with and without throttling. Runs against a '
+        'throwaway SQLite database and a private local-memory cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per phase')
+        parser.add_argument('--legit-clients', type=int, default=2)
+        parser.add_argument('--attackers', type=int, default=8)
+        parser.add_argument('--attack-rate', type=float, default=25.0, help='Attempts per second per attacker')
+        parser.add_argument('--users', type=int, default=200, help='Legitimate accounts to rotate through')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        with throwaway_database(), override_settings(CACHES=BENCH_CACHES):
+            results = self.run_phases(options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for phase in results:
+            self.stdout.write(
+                f"{phase['phase']:<22} legit n={phase['legit_requests']:<5} "
+                f"p50={phase['legit_p50_ms']}ms p95={phase['legit_p95_ms']}ms "
+                f"attack n={phase['attack_requests']:<6} rejected(429)={phase['attack_rejected']}"
+            )
+
+    def run_phases(self, options):
+        password = 'bench-password-123'
+        encoded = make_password(password)
+        User.objects.bulk_create([
+            User(username=f'legit{index}', password=encoded) for index in range(options['users'])
+        ])
+        User.objects.create(username='victim', password=encoded)
+
+        original_throttles = ThrottledTokenObtainPairView.throttle_classes
+        results = [self.run_phase('baseline', options, password, attackers=0)]
+        try:
+            results.append(self.run_phase('attack_throttled', options, password, options['attackers']))
+            ThrottledTokenObtainPairView.throttle_classes = []
+            results.append(self.run_phase('attack_unthrottled', options, password, options['attackers']))
+        finally:
+            ThrottledTokenObtainPairView.throttle_classes = original_throttles
+        return results
+
+    def run_phase(self, name, options, password, attackers):
+        cache.clear()
+        url = reverse('token_obtain_pair')
+        deadline = time.monotonic() + options['duration']
+        lock = threading.Lock()
+        legit_latencies, attack_statuses, legit_errors = [], [], []
+        counter = iter(range(10**9))
+
+        def legit():
+            client = Client(HTTP_HOST='localhost')
+            while time.monotonic() < deadline:
+                with lock:
+                    index = next(counter)
+                started = time.perf_counter()
+                response = client.post(
+                    url, {'username': f"legit{index % options['users']}", 'password': password},
+                    content_type='application/json',
+                    REMOTE_ADDR=f'10.1.{index // 250 % 250}.{index % 250 + 1}',
+                )
+                elapsed = time.perf_counter() - started
+                with lock:
+                    legit_latencies.append(elapsed)
+                    if response.status_code != 200:
+                        legit_errors.append(response.status_code)
+            connections.close_all()
+
+        def attack():
+            client = Client(HTTP_HOST='localhost')
+            interval = 1.0 / options['attack_rate']
+            next_attempt = time.monotonic()
+            while time.monotonic() < deadline:
+                next_attempt += interval
+                response = client.post(
+                    url, {'username': 'victim', 'password': 'guess'},
+                    content_type='application/json', REMOTE_ADDR='192.0.2.66',
+                )
+                with lock:
+                    attack_statuses.append(response.status_code)
+                time.sleep(max(0.0, next_attempt - time.monotonic()))
+            connections.close_all()
+
+        threads = [threading.Thread(target=legit) for _ in range(options['legit_clients'])]
+        threads += [threading.Thread(target=attack) for _ in range(attackers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'phase': name,
+            'legit_requests': len(legit_latencies),
+            'legit_errors': len(legit_errors),
+            'legit_p50_ms': ms(percentile(legit_latencies, 50)),
+            'legit_p95_ms': ms(percentile(legit_latencies, 95)),
+            'attack_requests': len(attack_statuses),
+            'attack_rejected': attack_statuses.count(429),
+        }
@@ -3,11 +3,16 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
 from django.test import override_settings
+from unittest.mock import patch
 import tempfile
 import os
 from PIL import Image
+from rest_framework_simplejwt.tokens import RefreshToken
 from .models import UserProfile  # Import the UserProfile model
+from .authentication import UserCache, user_cache
+from .throttling import TokenBucketRateThrottle
 
 # Create your tests here.
 
@@ -277,3 +282,172 @@ class UserProfileViewTest(APITestCase):
         """Test that unauthenticated users cannot update profile"""
         response = self.client.put(self.url, self.profile_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.url = reverse('user')
+        self.user = User.objects.create_user(
+            username='cacheduser',
+            email='cached@example.com',
+            password='cachedpass123'
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_user_lookup_cached_between_requests(self):
+        """Test only the first request queries the user table"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['username'], 'cacheduser')
+        self.assertEqual(user_cache.stats()['hits'], 1)
+        self.assertEqual(user_cache.stats()['misses'], 1)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating a user invalidates the cached entry"""
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates_cache(self):
+        """Test changing the password drops the cached user"""
+        self.client.get(self.url)
+        self.user.set_password('newpass456')
+        self.user.save()
+        self.assertIsNone(user_cache.get(self.user.pk))
+
+    def test_cache_stats_staff_only(self):
+        """Test cache statistics are reported to staff users"""
+        stats_url = reverse('auth_cache_stats')
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_rate', response.data)
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their time to live"""
+        cache = UserCache(max_entries=2, ttl=0)
+        cache.set(1, self.user)
+        self.assertIsNone(cache.get(1))
+
+    def test_lru_bound(self):
+        """Test the least recently used entry is evicted past max_entries"""
+        cache = UserCache(max_entries=2, ttl=60)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c')
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), 'a')
+
+
+class AuthThrottleTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.token_url = reverse('token_obtain_pair')
+        self.register_url = reverse('user')
+        self.user = User.objects.create_user(
+            username='throttleduser',
+            email='throttled@example.com',
+            password='throttledpass123'
+        )
+        # Freeze the bucket clock so slow password hashing doesn't refill tokens mid-test
+        timer = patch.object(TokenBucketRateThrottle, 'timer', return_value=1000.0)
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_username_bucket_returns_429_with_retry_after(self):
+        """Test repeated attempts on one username are rejected with 429"""
+        for _ in range(10):
+            response = self.client.post(self.token_url, {
+                'username': 'throttleduser', 'password': 'wrongpassword'
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(self.token_url, {
+            'username': 'throttleduser', 'password': 'throttledpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_throttled_request_skips_password_check(self):
+        """Test rejected attempts never reach authentication (no hashing)"""
+        for _ in range(10):
+            self.client.post(self.token_url, {
+                'username': 'throttleduser', 'password': 'wrongpassword'
+            }, format='json')
+
+        with patch('rest_framework_simplejwt.serializers.authenticate') as authenticate:
+            response = self.client.post(self.token_url, {
+                'username': 'throttleduser', 'password': 'wrongpassword'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        authenticate.assert_not_called()
+
+    def test_ip_bucket_spans_usernames(self):
+        """Test one address spraying many usernames is limited per IP"""
+        statuses = [
+            self.client.post(self.token_url, {
+                'username': f'victim{index}', 'password': 'guess'
+            }, format='json', REMOTE_ADDR='10.0.0.1').status_code
+            for index in range(31)
+        ]
+        self.assertNotIn(status.HTTP_429_TOO_MANY_REQUESTS, statuses[:30])
+        self.assertEqual(statuses[30], status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # Other addresses are unaffected
+        response = self.client.post(self.token_url, {
+            'username': 'throttleduser', 'password': 'throttledpass123'
+        }, format='json', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_registration_throttled_per_username(self):
+        """Test registration attempts for one username are limited"""
+        data = {'username': 'newcomer', 'email': 'new@example.com', 'password': 'newpass123'}
+        statuses = [
+            self.client.post(self.register_url, data, format='json').status_code
+            for _ in range(6)
+        ]
+        self.assertEqual(statuses[0], status.HTTP_201_CREATED)
+        self.assertEqual(statuses[5], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_registration_get_not_throttled(self):
+        """Test retrieving the current user is never throttled"""
+        self.client.force_authenticate(user=self.user)
+        for _ in range(25):
+            response = self.client.get(self.register_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class UserProfileAdminTest(APITestCase):
+    """Test the user profile admin pages"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='testpass')
+        self.client.force_login(self.admin)
+        for i in range(5):
+            user = User.objects.create_user(username=f'user{i}', password='testpass')
+            UserProfile.objects.create(user=user, city='Pune', country='India')
+        self.url = reverse('admin:user_userprofile_changelist')
+
+    def test_changelist_queries(self):
+        """Test the changelist loads profiles with their users in one query"""
+        # session, admin user, bounded count, profiles joined to users
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['cl'].result_list), 5)
+        self.assertContains(response, "user4&#x27;s Profile")
+
+    def test_search_by_username(self):
+        """Test search matches usernames exactly"""
+        response = self.client.get(self.url, {'q': 'user3'})
+        self.assertEqual([profile.user.username for profile in response.context['cl'].result_list], ['user3'])
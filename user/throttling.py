@@ -0,0 +1,79 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketRateThrottle(SimpleRateThrottle):
+    """
+    Token bucket variant of SimpleRateThrottle.
+
+    A rate of 'N/period' gives a bucket of N tokens refilled continuously at
+    N per period, so short bursts are allowed while sustained guessing is
+    held to the configured rate. Bucket state lives in Django's cache.
+
+    The scope is '<view.throttle_scope>_<suffix>', e.g. 'login_ip', which
+    lets the login and registration views share these classes with
+    separate rates in DEFAULT_THROTTLE_RATES.
+    """
+    scope_suffix = None
+
+    def __init__(self):
+        # Rate is determined per view in allow_request, like ScopedRateThrottle.
+        pass
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, 'throttle_scope', None)
+        if not view_scope:
+            return True
+
+        self.scope = f'{view_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        refill_per_second = self.num_requests / self.duration
+        self.now = self.timer()
+        tokens, last = self.cache.get(self.key, (self.num_requests, self.now))
+        tokens = min(self.num_requests, tokens + (self.now - last) * refill_per_second)
+
+        if tokens >= 1:
+            self.cache.set(self.key, (tokens - 1, self.now), self.duration)
+            self.wait_seconds = None
+            return True
+
+        self.cache.set(self.key, (tokens, self.now), self.duration)
+        self.wait_seconds = (1 - tokens) / refill_per_second
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthIPRateThrottle(TokenBucketRateThrottle):
+    """Limit credential checks per client address."""
+    scope_suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class AuthUsernameRateThrottle(TokenBucketRateThrottle):
+    """Limit credential checks per targeted username, whatever the address."""
+    scope_suffix = 'username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not username or not isinstance(username, str):
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha1(username.strip().lower().encode()).hexdigest(),
+        }
@@ -1,11 +1,12 @@
 from django.urls import path
-from .views import RegisterView, UserProfileView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .views import RegisterView, UserProfileView, AuthCacheStatsView, ThrottledTokenObtainPairView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path('auth/user/', RegisterView.as_view(), name='user'),
     path('profile/', UserProfileView.as_view(), name='user_profile'),
     
-    path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/cache-stats/', AuthCacheStatsView.as_view(), name='auth_cache_stats'),
 ]
@@ -1,11 +1,17 @@
 from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .serializers import RegisterSerializer, UserProfileSerializer
 from .models import UserProfile
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework_simplejwt.views import TokenObtainPairView
+from .authentication import user_cache
+from .throttling import AuthIPRateThrottle, AuthUsernameRateThrottle
 
 class RegisterView(generics.CreateAPIView, generics.RetrieveAPIView):
     serializer_class = RegisterSerializer
+    throttle_scope = 'register'
 
     def get_permissions(self):
         """
@@ -16,12 +22,28 @@ class RegisterView(generics.CreateAPIView, generics.RetrieveAPIView):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        """
+        Throttle registration (POST) only; it hashes a password.
+        """
+        if self.request.method == 'POST':
+            return [AuthIPRateThrottle(), AuthUsernameRateThrottle()]
+        return []
+
     def get_object(self):
         """
         For GET request, return the authenticated user.
         """
         return self.request.user
 
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    TokenObtainPairView with per-IP and per-username token buckets, enforced
+    before the credentials are checked so rejected attempts cost no hashing.
+    """
+    throttle_classes = [AuthIPRateThrottle, AuthUsernameRateThrottle]
+    throttle_scope = 'login'
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
@@ -32,3 +54,13 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         Get the user's profile.
         """
         return UserProfile.objects.get(user=self.request.user)
+
+
+class AuthCacheStatsView(APIView):
+    """
+    Report the JWT user cache hit rate for the worker serving the request.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(user_cache.stats())